@@ -0,0 +1,330 @@
+"""Offline benchmark of the tracking pipeline on synthetic feeds."""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+from .config import Config
+from .data_loader import DataLoader
+from .email_service import EmailService
+from .flight_tracker import FlightTracker
+from .notifiers import NullNotifier
+from .replay import SNAPSHOT_FIELDS, ReplayFlight
+from .vectorized import NUMPY_AVAILABLE
+
+DEFAULT_FLIGHT_COUNTS = [10000, 50000, 100000]
+DEFAULT_COUNTRY_COUNTS = [1, 20, 200]
+
+# Share of synthetic flights heading to a tracked country
+TRACKED_SHARE = 0.3
+
+
+class StubFlightRadar24API:
+    """Stand-in for FlightRadar24API serving a fixed synthetic feed."""
+
+    def __init__(self, flights: List[ReplayFlight]):
+        self.flights = flights
+
+    def get_flights(self, bounds: Optional[str] = None, **kwargs) -> List[ReplayFlight]:
+        """Get the synthetic feed."""
+        return self.flights
+
+
+class StubSMTPConnection:
+    """Stand-in for SMTPConnectionManager that only serializes messages."""
+
+    def __init__(self):
+        self.sent_bytes = 0
+
+    def send_messages(self, messages: List[Any]) -> int:
+        """Serialize messages as they would be sent over the wire."""
+        for message in messages:
+            self.sent_bytes += len(message.as_bytes())
+        return len(messages)
+
+    def close(self) -> None:
+        """Nothing to close."""
+
+
+def generate_feed(
+    data_loader: DataLoader, country_codes: List[str], flight_count: int, seed: int
+) -> List[ReplayFlight]:
+    """Generate a reproducible synthetic feed with a share of tracked flights."""
+    rng = random.Random(seed)
+    all_airports = data_loader.get_airport_codes()
+    tracked_airports = [
+        airport_code
+        for country_code in country_codes
+        for airport_code in data_loader.get_country_airports(country_code)
+    ] or all_airports
+    aircraft_codes = ["A320", "A321", "A333", "A388", "B738", "B77W", "B789", "E190"]
+    airlines = ["BAW", "DLH", "ELY", "QTR", "RYR", "THY", "UAE", "UAL"]
+
+    flights = []
+    for index in range(flight_count):
+        airline = rng.choice(airlines)
+        tracked = rng.random() < TRACKED_SHARE
+        destinations = tracked_airports if tracked else all_airports
+        values = {
+            "id": f"{index:08x}",
+            "latitude": rng.uniform(-60, 75),
+            "longitude": rng.uniform(-180, 180),
+            "heading": rng.randrange(360),
+            "altitude": rng.randrange(0, 42000, 100),
+            "ground_speed": rng.randrange(0, 560),
+            "aircraft_code": rng.choice(aircraft_codes),
+            "origin_airport_iata": rng.choice(all_airports),
+            "destination_airport_iata": rng.choice(destinations),
+            "callsign": f"{airline}{rng.randrange(1, 9999)}",
+            "airline_icao": airline,
+            "on_ground": 0,
+        }
+        flights.append(
+            ReplayFlight(
+                SNAPSHOT_FIELDS, [values.get(field) for field in SNAPSHOT_FIELDS]
+            )
+        )
+    return flights
+
+
+def pick_countries(data_loader: DataLoader, country_count: int) -> List[str]:
+    """Pick the countries with the most airports, deterministically."""
+    country_codes = sorted(
+        data_loader.get_all_country_codes(),
+        key=lambda code: (-len(data_loader.get_country_airports(code)), code),
+    )
+    return country_codes[:country_count]
+
+
+class _StageRecorder:
+    """Runs pipeline stages, timing them or tracing their peak memory."""
+
+    def __init__(self, trace_memory: bool):
+        self.trace_memory = trace_memory
+        self.results: Dict[str, float] = {}
+
+    def run(self, name: str, stage: Callable[[], Any]) -> Any:
+        """Run a stage and record its duration or peak memory."""
+        gc.collect()
+        if self.trace_memory:
+            tracemalloc.start()
+            baseline = tracemalloc.get_traced_memory()[0]
+            result = stage()
+            self.results[name] = tracemalloc.get_traced_memory()[1] - baseline
+            tracemalloc.stop()
+        else:
+            start = time.perf_counter()
+            result = stage()
+            self.results[name] = time.perf_counter() - start
+        return result
+
+
+def _run_pipeline(
+    flights: List[ReplayFlight],
+    country_codes: List[str],
+    trace_memory: bool,
+) -> Dict[str, Any]:
+    """Run every pipeline stage once on a fresh set of objects."""
+    # Stages print progress meant for tracking runs, keep it out of the report
+    with contextlib.redirect_stdout(io.StringIO()):
+        return _run_stages(flights, country_codes, trace_memory)
+
+
+def _run_stages(
+    flights: List[ReplayFlight],
+    country_codes: List[str],
+    trace_memory: bool,
+) -> Dict[str, Any]:
+    """Run and measure the pipeline stages in order."""
+    recorder = _StageRecorder(trace_memory)
+    cache_directory = tempfile.mkdtemp(prefix="flight-benchmark-")
+    cache_path = os.path.join(cache_directory, "data.pickle")
+    original_cache_path = Config.DATA_CACHE
+    Config.DATA_CACHE = cache_path
+    try:
+        # The first load parses the CSVs and writes the cache, the second reads it
+        recorder.run("data_load_csv", lambda: DataLoader()._ensure_loaded())
+        data_loader = DataLoader()
+        recorder.run("data_load_cache", data_loader._ensure_loaded)
+    finally:
+        Config.DATA_CACHE = original_cache_path
+        if os.path.exists(cache_path):
+            os.remove(cache_path)
+        os.rmdir(cache_directory)
+
+    tracker = FlightTracker(
+        country_codes, data_loader, [NullNotifier()], StubFlightRadar24API(flights)
+    )
+    # Keep the benchmark free of persistent side effects
+    tracker.filter_rules = None
+    tracker.history = None
+    tracker.exporter = None
+    tracker.seen_store = None
+
+    try:
+        feed = recorder.run("feed_fetch", tracker._fetch_flights)
+
+        tracker.use_vectorized = False
+        matches = recorder.run("match_python", lambda: tracker._match_flights(feed))
+        if NUMPY_AVAILABLE:
+            # Called directly, the tracker only picks it for geofences and rules
+            matcher = tracker._get_vectorized_matcher()
+            recorder.run("match_vectorized", lambda: matcher.match(feed))
+
+        delta = recorder.run(
+            "flight_details", lambda: tracker.snapshot_differ.update(matches)
+        )
+        recorder.run("snapshot_diff", lambda: tracker.snapshot_differ.update(matches))
+        flight_details = tracker._order_by_country(delta.get_updated_details())
+
+        email_service = EmailService()
+        html = recorder.run(
+            "html",
+            lambda: email_service.html_generator.generate_email_html(
+                len(flight_details), flight_details
+            ),
+        )
+        message = recorder.run(
+            "mime",
+            lambda: email_service._create_email_message(
+                len(flight_details), flight_details
+            ),
+        )
+        email_service._smtp = StubSMTPConnection()
+        recorder.run("smtp_send", lambda: email_service._send_via_smtp(message))
+    finally:
+        tracker.close()
+
+    return {
+        "matched": len(flight_details),
+        "html_bytes": len(html.encode("utf-8")),
+        "stages": recorder.results,
+    }
+
+
+def run_scenario(
+    data_loader: DataLoader, flight_count: int, country_count: int, seed: int
+) -> Dict[str, Any]:
+    """Benchmark one feed size and tracked country count."""
+    country_codes = pick_countries(data_loader, country_count)
+    flights = generate_feed(data_loader, country_codes, flight_count, seed)
+
+    # Time and memory are measured in separate runs, tracing slows stages down
+    timing = _run_pipeline(flights, country_codes, trace_memory=False)
+    memory = _run_pipeline(flights, country_codes, trace_memory=True)
+    return {
+        "flights": flight_count,
+        "countries": country_count,
+        "matched": timing["matched"],
+        "html_bytes": timing["html_bytes"],
+        "stages": {
+            name: {
+                "seconds": round(seconds, 6),
+                "peak_bytes": memory["stages"].get(name),
+            }
+            for name, seconds in timing["stages"].items()
+        },
+    }
+
+
+def _get_git_commit() -> Optional[str]:
+    """Get the current git commit, if the code runs from a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _print_scenario(result: Dict[str, Any], baseline: Optional[Dict[str, Any]]) -> None:
+    """Print a scenario's stages, with the change against a baseline run."""
+    print(
+        f"\n{result['flights']} flights, {result['countries']} countries "
+        f"({result['matched']} matched)"
+    )
+    for name, stage in result["stages"].items():
+        line = (
+            f"  {name:<18} {stage['seconds'] * 1000:>10.1f} ms "
+            f"{(stage['peak_bytes'] or 0) / 1024 / 1024:>9.1f} MiB"
+        )
+        baseline_stage = (baseline or {}).get("stages", {}).get(name)
+        if baseline_stage and baseline_stage["seconds"]:
+            change = stage["seconds"] / baseline_stage["seconds"] - 1
+            line += f"  {change:+.0%} vs baseline"
+        print(line)
+
+
+def main(args: Optional[List[str]] = None) -> int:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark the tracking pipeline offline on synthetic feeds"
+    )
+    parser.add_argument(
+        "--flights",
+        type=int,
+        nargs="+",
+        default=DEFAULT_FLIGHT_COUNTS,
+        help="Feed sizes to benchmark",
+    )
+    parser.add_argument(
+        "--countries",
+        type=int,
+        nargs="+",
+        default=DEFAULT_COUNTRY_COUNTS,
+        help="Numbers of tracked countries to benchmark",
+    )
+    parser.add_argument("--seed", type=int, default=1, help="Synthetic feed seed")
+    parser.add_argument("--output", help="Write the results to a JSON file")
+    parser.add_argument("--compare", help="Compare against a previous results file")
+    parsed_args = parser.parse_args(args)
+
+    # Email content needs addresses, nothing is ever sent
+    Config.GMAIL_EMAIL = Config.GMAIL_EMAIL or "benchmark@example.com"
+    Config.RECIPIENT_EMAIL = Config.RECIPIENT_EMAIL or "benchmark@example.com"
+
+    baselines = {}
+    if parsed_args.compare:
+        with open(parsed_args.compare, "r", encoding="utf-8") as file:
+            for scenario in json.load(file)["scenarios"]:
+                baselines[(scenario["flights"], scenario["countries"])] = scenario
+
+    data_loader = DataLoader()
+    results = {
+        "created_at": datetime.now().isoformat(),
+        "git_commit": _get_git_commit(),
+        "python": platform.python_version(),
+        "numpy": NUMPY_AVAILABLE,
+        "scenarios": [],
+    }
+    for flight_count in parsed_args.flights:
+        for country_count in parsed_args.countries:
+            result = run_scenario(
+                data_loader, flight_count, country_count, parsed_args.seed
+            )
+            results["scenarios"].append(result)
+            _print_scenario(result, baselines.get((flight_count, country_count)))
+
+    if parsed_args.output:
+        with open(parsed_args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+        print(f"\nResults written to {parsed_args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,34 @@
 """Command-line interface for the flight tracker."""
 
 import argparse
+import os
 import sys
+import time
+from datetime import datetime
 from typing import List, Optional
 from .flight_tracker import FlightTracker
 from .data_loader import DataLoader
+from .config import Config
+from .scheduler import PollingScheduler
+from .state_store import SeenFlightStore
+from .digest import DigestBuffer
+from .filter_rules import load_filter_rules
+from .profiles import load_profiles
+from .history import FlightHistory
+from .replay import FeedRecorder, ReplayFlightRadar24API
+from .metrics import MetricsServer
+from .exporter import EXPORT_FORMATS, PYARROW_AVAILABLE, FlightExporter
+from .utils import format_flight_count, parse_duration
+from .vectorized import NUMPY_AVAILABLE
+from .notifiers import (
+    JsonLinesNotifier,
+    NOTIFIER_TYPES,
+    Notifier,
+    NullNotifier,
+    WebhookNotifier,
+    configured_notifiers,
+    create_notifiers,
+)
 
 
 class FlightTrackerCLI:
@@ -24,6 +48,13 @@ Examples:
   %(prog)s --countries US CA GB     # Track specific countries by code
   %(prog)s --list-countries         # List all available countries
   %(prog)s --show-config            # Show current configuration
+  %(prog)s --build-cache            # Compile the CSV data into the fast-load cache
+  %(prog)s --daemon --interval 60   # Keep running and poll every minute
+  %(prog)s --notify email jsonl     # Send email and write JSON lines to stdout
+  %(prog)s --history --countries IR --since 24h  # Flights archived in the last day
+  %(prog)s --daemon --record feeds  # Save every fetched feed snapshot
+  %(prog)s --replay feeds --replay-speed 10  # Re-run recorded snapshots offline
+  %(prog)s --daemon --profiles profiles.json  # Serve several profiles from one feed
             """,
         )
 
@@ -41,12 +72,189 @@ Examples:
             "--show-config", action="store_true", help="Show current configuration"
         )
 
+        parser.add_argument(
+            "--build-cache",
+            action="store_true",
+            help="Compile airports and countries CSV data into the data cache",
+        )
+
+        parser.add_argument(
+            "--history",
+            action="store_true",
+            help="Show archived flights instead of tracking",
+        )
+
+        parser.add_argument(
+            "--since",
+            default="24h",
+            help="History period, e.g. 90m, 24h or 7d (default: 24h)",
+        )
+
+        parser.add_argument(
+            "--no-history",
+            action="store_true",
+            help="Do not archive matched flights",
+        )
+
+        parser.add_argument(
+            "--export",
+            nargs="?",
+            const=Config.EXPORT_FORMAT,
+            choices=EXPORT_FORMATS,
+            help="Export matched flights to hourly files "
+            f"(default format: {Config.EXPORT_FORMAT})",
+        )
+
+        parser.add_argument(
+            "--export-dir",
+            help=f"Directory for exported files (default: {Config.EXPORT_DIR})",
+        )
+
+        parser.add_argument(
+            "--record",
+            metavar="DIR",
+            help="Save every fetched feed snapshot to a directory",
+        )
+
+        parser.add_argument(
+            "--replay",
+            metavar="DIR",
+            help="Run on snapshots recorded with --record instead of the live feed; "
+            "dedup state and history are left untouched and notifications are "
+            "discarded unless --notify is given",
+        )
+
+        parser.add_argument(
+            "--replay-speed",
+            type=float,
+            default=1.0,
+            help="Replay speed factor, 0 for no waiting between snapshots "
+            "(default: 1.0)",
+        )
+
+        parser.add_argument(
+            "--metrics-port",
+            type=int,
+            help="Serve Prometheus metrics on this local port",
+        )
+
+        parser.add_argument(
+            "--metrics-log",
+            metavar="PATH",
+            help="Append one JSON metrics line per cycle to a file, '-' for stdout "
+            "(default: off)",
+        )
+
         parser.add_argument(
             "--dry-run",
             action="store_true",
             help="Run without sending email notifications",
         )
 
+        parser.add_argument(
+            "--notify",
+            nargs="+",
+            choices=sorted(NOTIFIER_TYPES),
+            help="Notification sinks to use (default: from NOTIFIERS, or email)",
+        )
+
+        parser.add_argument(
+            "--webhook-url", help="URL the webhook notifier POSTs JSON to"
+        )
+
+        parser.add_argument(
+            "--jsonl-path",
+            help="File the jsonl notifier appends to, '-' for stdout",
+        )
+
+        parser.add_argument(
+            "--rules",
+            metavar="FILE",
+            help=f"Filter rule file (default: {Config.FILTER_RULES_FILE})",
+        )
+
+        parser.add_argument(
+            "--profiles",
+            metavar="FILE",
+            help="Track the profiles defined in a JSON file instead of one "
+            f"country list (default: {Config.PROFILES_FILE}, if present and "
+            "neither --countries nor --rules is given)",
+        )
+
+        parser.add_argument(
+            "--profile-workers",
+            type=int,
+            metavar="N",
+            help="Split profiles between N worker processes "
+            f"(default: {Config.PROFILE_WORKERS}, 0 for none)",
+        )
+
+        parser.add_argument(
+            "--zones",
+            action="store_true",
+            help="Only fetch flights in zones around the tracked countries' airports",
+        )
+
+        parser.add_argument(
+            "--geofence",
+            action="store_true",
+            help="Also track flights near tracked countries' airports, "
+            "whatever their destination",
+        )
+
+        parser.add_argument(
+            "--geofence-radius",
+            type=float,
+            help=f"Geofence radius in km (default: {Config.GEOFENCE_RADIUS_KM})",
+        )
+
+        parser.add_argument(
+            "--no-vectorized",
+            action="store_true",
+            help="Match flights in pure Python even if NumPy is installed",
+        )
+
+        parser.add_argument(
+            "--no-dedup",
+            action="store_true",
+            help=(
+                "Do not keep notification state between runs; new or changed "
+                "flights are reported even if an earlier run already did"
+            ),
+        )
+
+        parser.add_argument(
+            "--notify-changes",
+            action="store_true",
+            help="Also notify when a known flight changes destination",
+        )
+
+        parser.add_argument(
+            "--digest-window",
+            type=float,
+            help="Coalesce alerts into one notification per this many seconds",
+        )
+
+        parser.add_argument(
+            "--daemon",
+            action="store_true",
+            help="Keep running and track flights on a fixed interval",
+        )
+
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=Config.DAEMON_INTERVAL_SECONDS,
+            help="Seconds between tracking cycles in daemon mode (default: %(default)s)",
+        )
+
+        parser.add_argument(
+            "--jitter",
+            type=float,
+            default=Config.DAEMON_JITTER_SECONDS,
+            help="Maximum random delay added to each cycle in daemon mode (default: %(default)s)",
+        )
+
         return parser
 
     def _list_countries(self) -> None:
@@ -65,13 +273,15 @@ Examples:
 
     def _show_config(self) -> None:
         """Show current configuration."""
-        from .config import Config
-
         print("Flight Tracker Configuration:")
         print("-" * 50)
         print(f"Tracked Countries File: {Config.TRACKED_COUNTRIES_FILE}")
+        print(f"Filter Rules File: {Config.FILTER_RULES_FILE}")
+        print(f"Profiles File: {Config.PROFILES_FILE}")
+        print(f"Profile Workers: {Config.PROFILE_WORKERS or 'disabled'}")
         print(f"Airports CSV: {Config.AIRPORTS_CSV}")
         print(f"Countries CSV: {Config.COUNTRIES_CSV}")
+        print(f"Data Cache: {Config.DATA_CACHE}")
         print(f"Email CSS: {Config.EMAIL_CSS}")
         print()
         print("Email Configuration:")
@@ -85,6 +295,55 @@ Examples:
             f"Recipient Email: {'✓' if Config.RECIPIENT_EMAIL else '✗'} {Config.RECIPIENT_EMAIL or 'Not set'}"
         )
         print(f"SMTP Server: {Config.SMTP_SERVER}:{Config.SMTP_PORT}")
+        print()
+        print("Notification Configuration:")
+        print(f"Notifiers: {', '.join(Config.NOTIFIERS)}")
+        print(f"Webhook URL: {Config.WEBHOOK_URL or 'Not set'}")
+        print(f"JSON Lines Path: {Config.JSONL_PATH}")
+        print(
+            f"Digest Window: {Config.DIGEST_WINDOW_SECONDS}s "
+            f"(max {Config.DIGEST_MAX_FLIGHTS} flights)"
+        )
+        print(
+            f"Zone Bounds: {'enabled' if Config.USE_ZONE_BOUNDS else 'disabled'} "
+            f"({Config.ZONE_TILE_DEGREES}° tiles, {Config.ZONE_MARGIN_DEGREES}° margin)"
+        )
+        print(
+            f"Geofences: {'enabled' if Config.USE_GEOFENCES else 'disabled'} "
+            f"({Config.GEOFENCE_RADIUS_KM} km radius)"
+        )
+        if not NUMPY_AVAILABLE:
+            print("Vectorized Matching: unavailable (NumPy not installed)")
+        else:
+            print(
+                "Vectorized Matching: "
+                f"{'enabled' if Config.USE_VECTORIZED else 'disabled'}"
+            )
+        print(f"State Database: {Config.STATE_DB}")
+        if Config.METRICS_PORT:
+            print(
+                "Metrics Endpoint: "
+                f"http://{Config.METRICS_HOST}:{Config.METRICS_PORT}/metrics"
+            )
+        else:
+            print("Metrics Endpoint: disabled")
+        print(f"Metrics Log: {Config.METRICS_LOG or 'disabled'}")
+        print(
+            f"Export: {'enabled' if Config.USE_EXPORT else 'disabled'} "
+            f"({Config.EXPORT_FORMAT} to {Config.EXPORT_DIR}/, "
+            f"{Config.EXPORT_RETENTION_HOURS}h retention"
+            f"{'' if PYARROW_AVAILABLE else ', pyarrow not installed'})"
+        )
+        print(
+            f"History Database: {Config.HISTORY_DB} "
+            f"({'enabled' if Config.USE_HISTORY else 'disabled'}, "
+            f"{Config.HISTORY_RETENTION_SECONDS // 86400} days retention)"
+        )
+        print(f"Seen Flight TTL: {Config.SEEN_FLIGHT_TTL_SECONDS}s")
+        print()
+        print("Daemon Configuration:")
+        print(f"Interval: {Config.DAEMON_INTERVAL_SECONDS}s")
+        print(f"Jitter: {Config.DAEMON_JITTER_SECONDS}s")
 
     def _validate_countries(self, country_codes: List[str]) -> List[str]:
         """Validate and filter country codes."""
@@ -100,6 +359,99 @@ Examples:
 
         return valid_codes
 
+    def _show_history(self, country_codes: Optional[List[str]], since: str) -> int:
+        """Print a trend report and the flights archived since a duration ago."""
+        try:
+            period = parse_duration(since)
+        except ValueError:
+            print(f"Invalid duration '{since}', use e.g. 90m, 24h or 7d")
+            return 1
+
+        history = FlightHistory()
+        start = time.time() - period
+        hourly_counts = history.get_hourly_counts(country_codes, start)
+        flights = history.get_flights(country_codes, start)
+        history.close()
+
+        print(f"Flight history for the last {since}")
+        print("-" * 30)
+        if not flights:
+            print("No archived flights")
+            return 0
+
+        print("Flights per hour:")
+        for hour, country_code, flight_count in hourly_counts:
+            hour_label = datetime.fromtimestamp(hour).strftime("%Y-%m-%d %H:00")
+            country_name = self.data_loader.get_country_name(country_code)
+            print(
+                f"  {hour_label}  {country_name}: "
+                f"{flight_count} {format_flight_count(flight_count)}"
+            )
+
+        print(f"\n{len(flights)} {format_flight_count(len(flights))}:")
+        for flight in flights:
+            last_seen = datetime.fromtimestamp(flight["last_seen"])
+            print(
+                f"  - {last_seen:%Y-%m-%d %H:%M} {flight['call_sign']} "
+                f"(ID: {flight['flight_id']}): {flight['origin_airport']} → "
+                f"{flight['destination_airport']} [{flight['country']}]"
+            )
+        return 0
+
+    @staticmethod
+    def _discard_notifications(parsed_args: argparse.Namespace) -> bool:
+        """Check whether notifications go to the null sink."""
+        # Replays only notify when sinks are chosen explicitly
+        return parsed_args.dry_run or bool(
+            parsed_args.replay and not parsed_args.notify
+        )
+
+    def _create_notifiers(self, parsed_args: argparse.Namespace) -> List[Notifier]:
+        """Create the notification sinks selected on the command line."""
+        if self._discard_notifications(parsed_args):
+            return [NullNotifier()]
+
+        notifiers = []
+        for name in parsed_args.notify or Config.NOTIFIERS:
+            if name == WebhookNotifier.name and parsed_args.webhook_url:
+                notifiers.append(WebhookNotifier(parsed_args.webhook_url))
+            elif name == JsonLinesNotifier.name and parsed_args.jsonl_path:
+                notifiers.append(JsonLinesNotifier(parsed_args.jsonl_path))
+            else:
+                notifiers.extend(create_notifiers([name]))
+        return configured_notifiers(notifiers)
+
+    def _run_daemon(
+        self, tracker: FlightTracker, interval: float, jitter: float
+    ) -> int:
+        """Track flights repeatedly, reusing the same tracker between cycles."""
+        scheduler = PollingScheduler(interval, jitter)
+        scheduler.install_signal_handlers()
+
+        print(f"Daemon mode: tracking every {interval:g}s (jitter up to {jitter:g}s)")
+        cycles = scheduler.run(tracker.track_all_flights)
+        print(f"Daemon stopped after {cycles} tracking cycles")
+        return 0
+
+    def _run_replay(
+        self, tracker: FlightTracker, replay_api: ReplayFlightRadar24API
+    ) -> int:
+        """Track flights once per recorded snapshot, paced by the recording."""
+        print(
+            f"Replaying {len(replay_api)} snapshots from {replay_api.directory} "
+            f"at {replay_api.speed:g}x speed"
+        )
+        cycles = 0
+        while True:
+            tracker.track_all_flights()
+            cycles += 1
+            delay = replay_api.advance()
+            if delay is None:
+                break
+            time.sleep(delay)
+        print(f"Replay finished after {cycles} tracking cycles")
+        return 0
+
     def run(self, args: Optional[List[str]] = None) -> int:
         """Run the CLI with the given arguments."""
         parser = self._create_parser()
@@ -114,6 +466,13 @@ Examples:
                 self._show_config()
                 return 0
 
+            if parsed_args.build_cache:
+                if not self.data_loader.build_cache():
+                    print("Failed to build data cache")
+                    return 1
+                print(f"Data cache written to {Config.DATA_CACHE}")
+                return 0
+
             # Determine countries to track
             countries_to_track = None
             if parsed_args.countries:
@@ -122,16 +481,137 @@ Examples:
                     print("No valid countries specified")
                     return 1
 
+            if parsed_args.history:
+                return self._show_history(countries_to_track, parsed_args.since)
+
+            # Profiles bring their own countries and rules
+            single_list_options = [
+                option
+                for option, value in (
+                    ("--countries", parsed_args.countries),
+                    ("--rules", parsed_args.rules),
+                )
+                if value
+            ]
+            if parsed_args.profiles and single_list_options:
+                print(
+                    f"{' and '.join(single_list_options)} cannot be combined with "
+                    "--profiles - set countries and rules in the profile file instead"
+                )
+                return 1
+
+            replay_api = None
+            if parsed_args.replay:
+                replay_api = ReplayFlightRadar24API(
+                    parsed_args.replay, parsed_args.replay_speed
+                )
+
             # Create and run flight tracker
-            tracker = FlightTracker(countries_to_track)
+            tracker = FlightTracker(
+                countries_to_track,
+                self.data_loader,
+                self._create_notifiers(parsed_args),
+                replay_api,
+            )
+
+            if parsed_args.metrics_log is not None:
+                tracker.metrics_log = parsed_args.metrics_log
+
+            if parsed_args.record:
+                tracker.recorder = FeedRecorder(parsed_args.record)
 
             if parsed_args.dry_run:
-                print("DRY RUN MODE - No emails will be sent")
-                # Temporarily disable email service
-                tracker.email_service = None
+                print("DRY RUN MODE - No notifications will be sent")
+                # Keep de-duplication state in memory so real runs are unaffected
+                tracker.seen_store = SeenFlightStore(":memory:")
+                tracker.history = None
 
-            tracker.track_all_flights()
-            return 0
+            if replay_api is not None:
+                # Replayed flights must not mark real flights as notified or
+                # mix old observations into the history, only export them
+                # when asked, stamped with their recorded time
+                tracker.seen_store = SeenFlightStore(":memory:")
+                tracker.history = None
+                tracker.exporter = None
+
+            if parsed_args.digest_window:
+                tracker.digest = DigestBuffer(parsed_args.digest_window)
+
+            if parsed_args.no_history:
+                tracker.history = None
+
+            if parsed_args.export:
+                tracker.exporter = FlightExporter(
+                    parsed_args.export_dir, parsed_args.export
+                )
+
+            if parsed_args.rules:
+                tracker.filter_rules = load_filter_rules(
+                    self.data_loader, parsed_args.rules
+                )
+
+            if single_list_options:
+                # An explicit country list or rule file runs without profiles
+                profiles = None
+                if os.path.exists(Config.PROFILES_FILE):
+                    print(
+                        f"Ignoring {Config.PROFILES_FILE} in favour of "
+                        f"{' and '.join(single_list_options)}"
+                    )
+            else:
+                profiles = load_profiles(
+                    self.data_loader,
+                    parsed_args.profiles,
+                    self._discard_notifications(parsed_args),
+                )
+            if profiles is not None:
+                if parsed_args.digest_window:
+                    for profile in profiles.profiles:
+                        profile.digest = DigestBuffer(parsed_args.digest_window)
+                tracker.use_profiles(profiles, parsed_args.profile_workers)
+            elif parsed_args.profiles:
+                print(f"Profile file {parsed_args.profiles} not found")
+                tracker.close()
+                return 1
+
+            if parsed_args.zones:
+                tracker.use_zone_bounds = True
+
+            if parsed_args.no_vectorized:
+                tracker.use_vectorized = False
+
+            if parsed_args.geofence:
+                tracker.use_geofences = True
+                if parsed_args.geofence_radius:
+                    tracker.geofence_index.radius_km = parsed_args.geofence_radius
+
+            if parsed_args.no_dedup:
+                tracker.seen_store = None
+            elif parsed_args.notify_changes:
+                tracker.notify_on_status_change = True
+
+            # Started last: profile worker processes must be forked before
+            # any thread exists in this process
+            metrics_port = parsed_args.metrics_port or Config.METRICS_PORT
+            if metrics_port:
+                tracker.metrics_server = MetricsServer(
+                    tracker.metrics, metrics_port, Config.METRICS_HOST
+                )
+                tracker.metrics_server.start()
+
+            try:
+                if replay_api is not None:
+                    return self._run_replay(tracker, replay_api)
+
+                if parsed_args.daemon:
+                    return self._run_daemon(
+                        tracker, parsed_args.interval, parsed_args.jitter
+                    )
+
+                tracker.track_all_flights()
+                return 0
+            finally:
+                tracker.close()
 
         except KeyboardInterrupt:
             print("\nOperation cancelled by user")
@@ -145,3 +625,7 @@ def main():
     """Main CLI entry point."""
     cli = FlightTrackerCLI()
     sys.exit(cli.run())
+
+
+if __name__ == "__main__":
+    main()
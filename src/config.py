@@ -18,8 +18,11 @@ class Config:
 
     # File paths
     TRACKED_COUNTRIES_FILE = "tracked_countries.txt"
+    FILTER_RULES_FILE = "filter_rules.txt"
+    PROFILES_FILE = "profiles.json"
     AIRPORTS_CSV = os.path.join("data", "airports.csv")
     COUNTRIES_CSV = os.path.join("data", "countries.csv")
+    DATA_CACHE = os.path.join("data", "cache", "data.pickle")
     EMAIL_CSS = os.path.join("styles", "email.css")
 
     # Default countries to track if file not found
@@ -31,6 +34,79 @@ class Config:
     RECIPIENT_EMAIL = os.getenv("RECIPIENT_EMAIL")
     SMTP_SERVER = "smtp.gmail.com"
     SMTP_PORT = 587
+    SMTP_TIMEOUT = 30
+    # Reconnect instead of reusing a session idle for longer than this
+    SMTP_IDLE_TIMEOUT = 240
+
+    # Bounded feed requests: only fetch tiles around the tracked airports
+    USE_ZONE_BOUNDS = False
+    ZONE_TILE_DEGREES = 5
+    ZONE_MARGIN_DEGREES = 3
+
+    # Geofences: also match flights within a radius of tracked countries' airports
+    USE_GEOFENCES = False
+    GEOFENCE_RADIUS_KM = 80
+    GEOFENCE_CELL_DEGREES = 1.0
+
+    # Match feed snapshots with NumPy array operations when NumPy is installed
+    # and geofences or filter rules are active; plain destination lookups and
+    # more than 64 filter rules are faster or only possible in pure Python
+    USE_VECTORIZED = True
+
+    # Feed fetching
+    FEED_MAX_WORKERS = 4
+    FEED_REQUEST_TIMEOUT = 15
+    FEED_RETRIES = 2
+    FEED_RETRY_BACKOFF = 1.0
+
+    # Notification de-duplication
+    STATE_DB = "flight_state.sqlite3"
+    SEEN_FLIGHT_TTL_SECONDS = 12 * 60 * 60
+    NOTIFY_ON_STATUS_CHANGE = False
+
+    # History archive of every cycle's matched flights
+    USE_HISTORY = True
+    HISTORY_DB = "flight_history.sqlite3"
+    HISTORY_RETENTION_SECONDS = 90 * 24 * 60 * 60
+
+    # Hourly columnar export of matched flights: parquet (needs pyarrow) or ndjson
+    USE_EXPORT = False
+    EXPORT_DIR = "exports"
+    EXPORT_FORMAT = "parquet"
+    EXPORT_RETENTION_HOURS = 7 * 24
+    EXPORT_FLUSH_ROWS = 50000
+    EXPORT_FLUSH_SECONDS = 300
+
+    # Notification sinks: any of email, webhook, jsonl, null
+    NOTIFIERS = os.getenv("NOTIFIERS", "email").split(",")
+    WEBHOOK_URL = os.getenv("WEBHOOK_URL")
+    JSONL_PATH = os.getenv("JSONL_PATH", "-")
+    NOTIFIER_TIMEOUT = 30
+
+    # Digest mode: coalesce alerts into one notification per window (0 disables)
+    DIGEST_WINDOW_SECONDS = 0
+    DIGEST_MAX_FLIGHTS = 500
+
+    # Worker processes splitting tracking profiles between them (0 evaluates
+    # profiles in the tracker process)
+    PROFILE_WORKERS = int(os.getenv("PROFILE_WORKERS", "0"))
+
+    # Background notification dispatch
+    DISPATCH_QUEUE_SIZE = 100
+    DISPATCH_RETRIES = 3
+    DISPATCH_RETRY_BACKOFF = 5.0
+    DISPATCH_DRAIN_TIMEOUT = 120
+    DEAD_LETTER_FILE = "dead_letters.jsonl"
+
+    # Metrics: local Prometheus endpoint (0 disables) and per-cycle JSON log
+    # ("-" for stdout, empty to disable)
+    METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+    METRICS_HOST = "127.0.0.1"
+    METRICS_LOG = os.getenv("METRICS_LOG", "")
+
+    # Daemon mode
+    DAEMON_INTERVAL_SECONDS = 60
+    DAEMON_JITTER_SECONDS = 5
 
     @classmethod
     def has_email_config(cls) -> bool:
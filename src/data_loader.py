@@ -1,9 +1,27 @@
 """Data loading utilities for flight tracker."""
 import csv
 import os
-from typing import Dict, List, Set
+import pickle
+import sys
+import tempfile
+from typing import Any, Dict, List, Optional, Set, Tuple
 from .config import Config
 
+# Bump whenever the layout of the cached data changes
+CACHE_VERSION = 2
+
+
+class AirportRecord:
+    """Resolved airport information shared by every flight using the airport."""
+
+    __slots__ = ("code", "name", "country_code", "country_name")
+
+    def __init__(self, code: str, name: str, country_code: str, country_name: str):
+        self.code = code
+        self.name = name
+        self.country_code = country_code
+        self.country_name = country_name
+
 
 class DataLoader:
     """Handles loading and caching of CSV data and country information."""
@@ -14,7 +32,11 @@ class DataLoader:
         self._country_codes_to_names: Dict[str, str] = {}
         self._country_names_to_codes: Dict[str, str] = {}
         self._airport_names: Dict[str, str] = {}
+        self._airport_coordinates: Dict[str, Tuple[float, float]] = {}
+        self._airport_records: Dict[str, AirportRecord] = {}
         self._loaded = False
+        # Whether the data came from the compiled cache, None until loaded
+        self.cache_hit: Optional[bool] = None
     
     def _ensure_loaded(self) -> None:
         """Ensure all data is loaded. Lazy loading pattern."""
@@ -23,10 +45,108 @@ class DataLoader:
             self._loaded = True
     
     def _load_all_data(self) -> None:
-        """Load all CSV data files."""
+        """Load all data, preferring the compiled cache when it is current."""
+        self.cache_hit = self._load_from_cache()
+        if self.cache_hit:
+            return
+
         self._load_airports_data()
         self._load_countries_data()
         self._build_reverse_mappings()
+        self._write_cache()
+
+    def _get_source_signature(self) -> Optional[Dict[str, List[int]]]:
+        """Get modification time and size of the CSV sources."""
+        signature = {}
+        try:
+            for path in (Config.AIRPORTS_CSV, Config.COUNTRIES_CSV):
+                stat = os.stat(path)
+                signature[path] = [stat.st_mtime_ns, stat.st_size]
+        except OSError:
+            return None
+        return signature
+
+    def _load_from_cache(self) -> bool:
+        """Load data from the compiled cache if it matches the CSV sources."""
+        signature = self._get_source_signature()
+        if signature is None:
+            return False
+
+        try:
+            with open(Config.DATA_CACHE, "rb") as file:
+                cached = pickle.load(file)
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            print(f"Ignoring unreadable data cache: {e}")
+            return False
+
+        if (
+            not isinstance(cached, dict)
+            or cached.get("version") != CACHE_VERSION
+            or cached.get("sources") != signature
+        ):
+            return False
+
+        self._airport_countries = cached["airport_countries"]
+        self._country_airports = cached["country_airports"]
+        self._country_codes_to_names = cached["country_codes_to_names"]
+        self._airport_names = cached["airport_names"]
+        self._airport_coordinates = cached["airport_coordinates"]
+        self._build_reverse_mappings()
+        return True
+
+    def _write_cache(self) -> bool:
+        """Write the loaded data to the compiled cache."""
+        signature = self._get_source_signature()
+        if signature is None or not self._airport_countries:
+            return False
+
+        cached: Dict[str, Any] = {
+            "version": CACHE_VERSION,
+            "sources": signature,
+            "airport_countries": self._airport_countries,
+            "country_airports": self._country_airports,
+            "country_codes_to_names": self._country_codes_to_names,
+            "airport_names": self._airport_names,
+            "airport_coordinates": self._airport_coordinates,
+        }
+
+        # Write to a temporary file first so readers never see a partial cache.
+        # Its name is unique, since several processes may rebuild it at once
+        cache_dir = os.path.dirname(Config.DATA_CACHE) or "."
+        temp_path = None
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(
+                prefix=f"{os.path.basename(Config.DATA_CACHE)}.", dir=cache_dir
+            )
+            with os.fdopen(fd, "wb") as file:
+                pickle.dump(cached, file, protocol=pickle.HIGHEST_PROTOCOL)
+            # mkstemp creates the file readable by its owner only
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, Config.DATA_CACHE)
+            return True
+        except Exception as e:
+            print(f"Error writing data cache: {e}")
+            if temp_path is not None and os.path.exists(temp_path):
+                os.remove(temp_path)
+            return False
+
+    def build_cache(self) -> bool:
+        """Compile the CSV sources into the data cache, replacing any existing one."""
+        self._airport_countries = {}
+        self._country_airports = {}
+        self._country_codes_to_names = {}
+        self._airport_names = {}
+        self._airport_coordinates = {}
+        self._airport_records = {}
+
+        self._load_airports_data()
+        self._load_countries_data()
+        self._build_reverse_mappings()
+        self._loaded = True
+        return self._write_cache()
     
     def _load_airports_data(self) -> None:
         """Load airport data from CSV file."""
@@ -50,6 +170,15 @@ class DataLoader:
                         # Map airport code to name
                         if airport_name:
                             self._airport_names[airport_code] = airport_name
+
+                        # Map airport code to (latitude, longitude)
+                        try:
+                            self._airport_coordinates[airport_code] = (
+                                float(row.get("latitude")),
+                                float(row.get("longitude")),
+                            )
+                        except (TypeError, ValueError):
+                            pass
                             
         except Exception as e:
             print(f"Error loading airports data: {e}")
@@ -80,6 +209,22 @@ class DataLoader:
         self._ensure_loaded()
         return self._airport_countries.get(airport_code, "Unknown")
     
+    def get_airport_record(self, airport_code: str) -> AirportRecord:
+        """Get the resolved airport record for an airport, built once per code."""
+        record = self._airport_records.get(airport_code)
+        if record is None:
+            self._ensure_loaded()
+            code = sys.intern(str(airport_code))
+            country_code = self._airport_countries.get(code, "Unknown")
+            record = AirportRecord(
+                code,
+                sys.intern(self._airport_names.get(code, code)),
+                sys.intern(country_code),
+                sys.intern(self._country_codes_to_names.get(country_code, country_code)),
+            )
+            self._airport_records[airport_code] = record
+        return record
+
     def get_country_airports(self, country_code: str) -> List[str]:
         """Get list of airports for a country."""
         self._ensure_loaded()
@@ -100,6 +245,18 @@ class DataLoader:
         self._ensure_loaded()
         return self._airport_names.get(airport_code, airport_code)
     
+    def get_airport_coordinates(
+        self, airport_code: str
+    ) -> Optional[Tuple[float, float]]:
+        """Get (latitude, longitude) for an airport, if known."""
+        self._ensure_loaded()
+        return self._airport_coordinates.get(airport_code)
+
+    def get_airport_codes(self) -> List[str]:
+        """Get the codes of all known airports."""
+        self._ensure_loaded()
+        return list(self._airport_countries)
+
     def get_all_country_codes(self) -> Set[str]:
         """Get all available country codes."""
         self._ensure_loaded()
@@ -0,0 +1,57 @@
+"""Digest batching of flight alerts over a time window."""
+
+import time
+from typing import Dict, List, Optional, Tuple
+from .config import Config
+from .flight_detail import FlightDetail
+
+
+class DigestBuffer:
+    """Accumulates flights across cycles and releases them as one digest."""
+
+    def __init__(
+        self,
+        window_seconds: Optional[float] = None,
+        max_flights: Optional[int] = None,
+    ):
+        self.window_seconds = (
+            window_seconds
+            if window_seconds is not None
+            else Config.DIGEST_WINDOW_SECONDS
+        )
+        self.max_flights = max_flights or Config.DIGEST_MAX_FLIGHTS
+        # (flight id, tracked country) -> latest detail seen within the window
+        self._entries: Dict[Tuple[str, str], FlightDetail] = {}
+        self._window_started: Optional[float] = None
+
+    def __len__(self) -> int:
+        """Get the number of buffered flights."""
+        return len(self._entries)
+
+    def add(
+        self, flight_details: List[FlightDetail], now: Optional[float] = None
+    ) -> None:
+        """Add flights to the window, replacing earlier entries for the same flight."""
+        if not flight_details:
+            return
+        if self._window_started is None:
+            self._window_started = now if now is not None else time.monotonic()
+        for detail in flight_details:
+            self._entries[(str(detail.flight_id), detail.country)] = detail
+
+    def is_due(self, now: Optional[float] = None) -> bool:
+        """Check whether the window has elapsed or the size threshold is reached."""
+        if not self._entries:
+            return False
+        if len(self._entries) >= self.max_flights:
+            return True
+        if now is None:
+            now = time.monotonic()
+        return now - self._window_started >= self.window_seconds
+
+    def drain(self) -> List[FlightDetail]:
+        """Remove and return all buffered flights, starting a new window."""
+        flight_details = list(self._entries.values())
+        self._entries = {}
+        self._window_started = None
+        return flight_details
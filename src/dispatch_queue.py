@@ -0,0 +1,172 @@
+"""Background dispatch queue for work that must not block tracking cycles."""
+
+import json
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+from .config import Config
+
+# Sentinel telling the worker to exit once everything before it is handled
+_STOP = object()
+
+
+class PermanentDispatchError(Exception):
+    """Raised by a handler for failures that retrying cannot fix."""
+
+
+class DispatchQueue:
+    """Bounded in-process queue drained by a background worker with retries."""
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[Any], Any],
+        serialize: Optional[Callable[[Any], Any]] = None,
+        maxsize: Optional[int] = None,
+        retries: Optional[int] = None,
+        backoff: Optional[float] = None,
+        dead_letter_path: Optional[str] = None,
+    ):
+        self.name = name
+        self.handler = handler
+        self.serialize = serialize or repr
+        self.retries = retries if retries is not None else Config.DISPATCH_RETRIES
+        self.backoff = (
+            backoff if backoff is not None else Config.DISPATCH_RETRY_BACKOFF
+        )
+        self.dead_letter_path = dead_letter_path or Config.DEAD_LETTER_FILE
+        self._queue: queue.Queue = queue.Queue(
+            maxsize=maxsize or Config.DISPATCH_QUEUE_SIZE
+        )
+        self._worker: Optional[threading.Thread] = None
+        # Job the worker is handling, including its retries
+        self._current: Any = None
+        self._lock = threading.Lock()
+        self.delivered = 0
+        self.failed = 0
+
+    def _ensure_started(self) -> None:
+        """Start the background worker. Lazy loading pattern."""
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run, name=f"dispatch-{self.name}", daemon=True
+                )
+                self._worker.start()
+
+    def submit(self, job: Any) -> bool:
+        """
+        Queue a job without waiting for it to be handled.
+
+        Args:
+            job: Job passed to the handler
+
+        Returns:
+            bool: True if queued, False if the queue was full and the job
+            was written to the dead-letter file instead
+        """
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(job)
+            return True
+        except queue.Full:
+            print(f"Dispatch queue '{self.name}' is full - job moved to dead letters")
+            self._dead_letter(job, "queue full")
+            return False
+
+    def pending(self) -> int:
+        """Get the number of jobs waiting to be handled."""
+        return self._queue.qsize()
+
+    def _run(self) -> None:
+        """Worker loop handling jobs until the stop sentinel is reached."""
+        while True:
+            job = self._queue.get()
+            try:
+                if job is _STOP:
+                    return
+                self._current = job
+                self._handle(job)
+            finally:
+                self._current = None
+                self._queue.task_done()
+
+    def _handle(self, job: Any) -> None:
+        """
+        Handle a job, retrying with exponential backoff before giving up.
+
+        PermanentDispatchError is not retried.
+        """
+        for attempt in range(self.retries + 1):
+            try:
+                self.handler(job)
+                self.delivered += 1
+                return
+            except PermanentDispatchError as e:
+                # e.g. missing configuration, so dead-letter without backoff
+                error = e
+                break
+            except Exception as e:
+                error = e
+                if attempt < self.retries:
+                    delay = self.backoff * (2**attempt)
+                    print(
+                        f"Dispatch '{self.name}' failed ({e}), retrying in {delay:g}s"
+                    )
+                    time.sleep(delay)
+
+        self.failed += 1
+        print(f"Dispatch '{self.name}' failed permanently: {error}")
+        self._dead_letter(job, str(error))
+
+    def _dead_letter(self, job: Any, reason: str) -> None:
+        """Append an undeliverable job to the dead-letter file."""
+        record: Dict[str, Any] = {
+            "queue": self.name,
+            "failed_at": datetime.now().isoformat(),
+            "reason": reason,
+            "job": self.serialize(job),
+        }
+        try:
+            with self._lock:
+                with open(self.dead_letter_path, "a", encoding="utf-8") as file:
+                    file.write(json.dumps(record, default=str) + "\n")
+        except Exception as e:
+            print(f"Error writing dead letter to {self.dead_letter_path}: {e}")
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Wait for queued jobs to be handled, then stop the worker.
+
+        Jobs still queued when the timeout expires are written to the
+        dead-letter file so that nothing is silently lost, and so is the job
+        the worker is still stuck on. That job may yet be delivered by the
+        daemon worker before the process exits.
+        """
+        if self._worker is None:
+            return
+        if timeout is None:
+            timeout = Config.DISPATCH_DRAIN_TIMEOUT
+
+        # Blocks while the queue is full, which is bounded by the drain timeout
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            pass
+        self._worker.join(timeout)
+
+        if self._worker.is_alive():
+            print(f"Dispatch queue '{self.name}' did not drain in {timeout:g}s")
+            current = self._current
+            if current is not None:
+                self._dead_letter(current, "still in progress at shutdown")
+            while True:
+                try:
+                    job = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if job is not _STOP:
+                    self._dead_letter(job, "not delivered before shutdown")
+        self._worker = None
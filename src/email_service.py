@@ -1,36 +1,61 @@
 """Email service for sending flight notifications."""
 
-import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import List, Dict, Any
+from typing import List, Optional
 from .config import Config
 from .html_generator import HTMLGenerator
+from .flight_detail import FlightDetail
+from .smtp_connection import SMTPConnectionManager
+from .metrics import REGISTRY
 
 
 class EmailService:
     """Handles email notifications for flight alerts."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        timeout: Optional[float] = None,
+        recipients: Optional[List[str]] = None,
+        smtp: Optional[SMTPConnectionManager] = None,
+    ):
         self.html_generator = HTMLGenerator()
+        self.timeout = timeout
+        # Defaults to Config.RECIPIENT_EMAIL
+        self.recipients = recipients
+        self._smtp = smtp
+
+    def _get_recipients(self) -> str:
+        """Get the To header value."""
+        if self.recipients:
+            return ", ".join(self.recipients)
+        return Config.RECIPIENT_EMAIL
+
+    def get_missing_config(self) -> List[str]:
+        """Get the email environment variables this service still needs."""
+        return [
+            name
+            for name in Config.get_missing_email_vars()
+            if not (name == "RECIPIENT_EMAIL" and self.recipients)
+        ]
 
     def _validate_email_config(self) -> bool:
         """Validate email configuration and print helpful messages."""
-        if not Config.has_email_config():
-            missing_vars = Config.get_missing_email_vars()
+        missing_vars = self.get_missing_config()
+        if missing_vars:
             print("Gmail credentials missing - skipping email notification")
             print(f"Required environment variables: {', '.join(missing_vars)}")
             return False
         return True
 
     def _create_email_message(
-        self, total_flights: int, flight_details: List[Dict[str, Any]]
+        self, total_flights: int, flight_details: List[FlightDetail]
     ) -> MIMEMultipart:
         """Create the email message with HTML content."""
         message = MIMEMultipart("alternative")
         message["Subject"] = f"Flight Alert: {total_flights} flights detected"
         message["From"] = Config.GMAIL_EMAIL
-        message["To"] = Config.RECIPIENT_EMAIL
+        message["To"] = self._get_recipients()
 
         # Generate HTML content
         html_body = self.html_generator.generate_email_html(
@@ -41,26 +66,58 @@ class EmailService:
 
         return message
 
+    def _get_smtp(self) -> SMTPConnectionManager:
+        """Get the SMTP connection manager. Lazy loading pattern."""
+        if self._smtp is None:
+            self._smtp = SMTPConnectionManager(
+                username=Config.GMAIL_EMAIL,
+                password=Config.GMAIL_APP_PASSWORD,
+                timeout=self.timeout,
+            )
+        return self._smtp
+
     def _send_via_smtp(self, message: MIMEMultipart) -> None:
-        """Send email via Gmail SMTP."""
-        with smtplib.SMTP(Config.SMTP_SERVER, Config.SMTP_PORT) as server:
-            server.starttls()  # Enable encryption
-            server.login(Config.GMAIL_EMAIL, Config.GMAIL_APP_PASSWORD)
-            server.send_message(message)
+        """Send email via Gmail SMTP, reusing the session between sends."""
+        self._get_smtp().send_messages([message])
+
+    def close(self) -> None:
+        """Close the SMTP session kept open between sends."""
+        if self._smtp is not None:
+            self._smtp.close()
 
     def send_notification(
-        self, total_flights: int, flight_details: List[Dict[str, Any]]
+        self, total_flights: int, flight_details: List[FlightDetail]
     ) -> bool:
         """
         Send email notification for detected flights.
 
         Args:
             total_flights: Total number of flights detected
-            flight_details: List of flight detail dictionaries
+            flight_details: List of flight details
 
         Returns:
             bool: True if email was sent successfully, False otherwise
         """
+        try:
+            return self.deliver(total_flights, flight_details)
+        except Exception as e:
+            print(f"❌ Failed to send email: {e}")
+            return False
+
+    def deliver(
+        self, total_flights: int, flight_details: List[FlightDetail]
+    ) -> bool:
+        """
+        Send email notification for detected flights, raising on send failures.
+
+        Args:
+            total_flights: Total number of flights detected
+            flight_details: List of flight details
+
+        Returns:
+            bool: True if email was sent, False if there was nothing to send
+            or email is not configured
+        """
         if not self._validate_email_config():
             return False
 
@@ -68,12 +125,9 @@ class EmailService:
             print("No flights to notify about")
             return False
 
-        try:
+        with REGISTRY.time_stage("render"):
             message = self._create_email_message(total_flights, flight_details)
+        with REGISTRY.time_stage("send"):
             self._send_via_smtp(message)
-            print(f"✅ Email notification sent to {Config.RECIPIENT_EMAIL}")
-            return True
-
-        except Exception as e:
-            print(f"❌ Failed to send email: {e}")
-            return False
+        print(f"✅ Email notification sent to {self._get_recipients()}")
+        return True
@@ -0,0 +1,273 @@
+"""Hourly-rotated columnar export of matched flights for offline analysis."""
+
+import glob
+import gzip
+import json
+import os
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from .config import Config
+from .dispatch_queue import DispatchQueue
+from .flight_detail import FlightDetail
+
+# pyarrow is optional, exports fall back to gzip NDJSON without it
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = None
+    pq = None
+    PYARROW_AVAILABLE = False
+
+EXPORT_FORMATS = ("parquet", "ndjson")
+EXPORT_FILE_PREFIX = "flights-"
+EXPORT_COLUMNS = ("observed_at",) + FlightDetail.FIELDS
+
+
+class FlightExporter:
+    """Buffers matched flights and writes them to hourly files in the background."""
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        export_format: Optional[str] = None,
+        retention_hours: Optional[float] = None,
+        flush_rows: Optional[int] = None,
+        flush_seconds: Optional[float] = None,
+    ):
+        self.directory = directory or Config.EXPORT_DIR
+        export_format = export_format or Config.EXPORT_FORMAT
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(
+                f"Unknown export format '{export_format}', "
+                f"choose from: {', '.join(EXPORT_FORMATS)}"
+            )
+        if export_format == "parquet" and not PYARROW_AVAILABLE:
+            print("pyarrow not installed - exporting gzip NDJSON instead of Parquet")
+            export_format = "ndjson"
+        self.export_format = export_format
+        self.retention_hours = (
+            retention_hours
+            if retention_hours is not None
+            else Config.EXPORT_RETENTION_HOURS
+        )
+        self.flush_rows = flush_rows or Config.EXPORT_FLUSH_ROWS
+        self.flush_seconds = (
+            flush_seconds if flush_seconds is not None else Config.EXPORT_FLUSH_SECONDS
+        )
+
+        # Writer state, only touched by the queue worker until close()
+        self._columns: Dict[str, List[Any]] = {name: [] for name in EXPORT_COLUMNS}
+        self._buffered_rows = 0
+        self._buffered_since = 0.0
+        self._hour: Optional[str] = None
+        self._path: Optional[str] = None
+        self._queue = DispatchQueue("export", self._handle_batch, self._serialize_job)
+
+    @staticmethod
+    def _serialize_job(job: Tuple[float, List[FlightDetail]]) -> Dict[str, Any]:
+        """Convert a queued batch to JSON-compatible data for dead letters."""
+        observed_at, flight_details = job
+        return {
+            "observed_at": observed_at,
+            "flight_details": [detail.to_dict() for detail in flight_details],
+        }
+
+    def record(
+        self, flight_details: List[FlightDetail], now: Optional[float] = None
+    ) -> None:
+        """
+        Queue one cycle's matched flights for export.
+
+        Args:
+            flight_details: Every flight matched in this cycle
+            now: Observation timestamp, defaults to the system time
+        """
+        if not flight_details:
+            return
+        observed_at = now if now is not None else time.time()
+        self._queue.submit((observed_at, flight_details))
+
+    def _handle_batch(self, job: Tuple[float, List[FlightDetail]]) -> None:
+        """Buffer a batch and flush when due. Runs on the queue worker."""
+        observed_at, flight_details = job
+        hour = time.strftime("%Y%m%d-%H", time.gmtime(observed_at))
+        if hour != self._hour:
+            # Rotate: finish the previous hour's file before buffering the new
+            # one. If that fails the batch is retried with the rows still held
+            self._flush()
+            self._close_file()
+            self._hour = hour
+            self._remove_expired(observed_at)
+
+        if not self._buffered_rows:
+            self._buffered_since = time.monotonic()
+        columns = self._columns
+        for detail in flight_details:
+            columns["observed_at"].append(observed_at)
+            for field in FlightDetail.FIELDS:
+                value = getattr(detail, field)
+                columns[field].append(None if value is None else str(value))
+        self._buffered_rows += len(flight_details)
+
+        buffered_for = time.monotonic() - self._buffered_since
+        if self._buffered_rows >= self.flush_rows or buffered_for >= self.flush_seconds:
+            try:
+                self._flush()
+            except Exception as e:
+                # The batch is buffered already, so retrying it would duplicate
+                # its rows; the next flush writes them instead
+                print(f"Error writing flight export, keeping rows buffered: {e}")
+
+    def _get_hour_base(self) -> str:
+        """Get the current hour's file path without its extension."""
+        return os.path.join(self.directory, f"{EXPORT_FILE_PREFIX}{self._hour}")
+
+    def _get_path(self) -> str:
+        """
+        Get the file to write the buffered rows to, never overwriting one.
+
+        NDJSON rows are appended to one file per hour. Parquet files cannot
+        be appended to once closed, so every flush writes the hour's next
+        part file, and the parts are compacted when the hour is finished.
+        """
+        if self._path is None:
+            os.makedirs(self.directory, exist_ok=True)
+            extension = "parquet" if self.export_format == "parquet" else "ndjson.gz"
+            base = self._get_hour_base()
+            path = f"{base}.{extension}"
+            part = 1
+            while self.export_format == "parquet" and os.path.exists(path):
+                path = f"{base}.{part}.{extension}"
+                part += 1
+            if self.export_format == "parquet":
+                return path
+            self._path = path
+        return self._path
+
+    def _flush(self) -> None:
+        """
+        Write the buffered rows to the current hour's file.
+
+        Raises:
+            Exception: If writing fails, with the rows kept buffered
+        """
+        if not self._buffered_rows:
+            return
+        path = self._get_path()
+        if self.export_format == "parquet":
+            self._write_parquet(path, self._columns)
+        else:
+            self._write_ndjson(path, self._columns)
+        self._columns = {name: [] for name in EXPORT_COLUMNS}
+        self._buffered_rows = 0
+
+    @staticmethod
+    def _write_parquet(path: str, columns: Dict[str, List[Any]]) -> None:
+        """Write the columns to a new, complete Parquet file."""
+        observed_at = pa.array(
+            [int(timestamp * 1000) for timestamp in columns["observed_at"]],
+            type=pa.timestamp("ms", tz="UTC"),
+        )
+        arrays = [observed_at] + [
+            pa.array(columns[field], type=pa.string()) for field in FlightDetail.FIELDS
+        ]
+        table = pa.Table.from_arrays(arrays, names=list(EXPORT_COLUMNS))
+        # Readers globbing *.parquet never see a file without its footer
+        temp_path = f"{path}.tmp"
+        try:
+            pq.write_table(table, temp_path)
+            os.replace(temp_path, path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    @staticmethod
+    def _write_ndjson(path: str, columns: Dict[str, List[Any]]) -> None:
+        """Append the rows to the gzip NDJSON file as a new gzip member."""
+        timestamps = {
+            timestamp: datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+            for timestamp in set(columns["observed_at"])
+        }
+        lines = []
+        for row in zip(*(columns[name] for name in EXPORT_COLUMNS)):
+            record = dict(zip(EXPORT_COLUMNS, row))
+            record["observed_at"] = timestamps[record["observed_at"]]
+            lines.append(json.dumps(record))
+        with gzip.open(path, "at", encoding="utf-8", compresslevel=6) as file:
+            file.write("\n".join(lines) + "\n")
+
+    def _close_file(self) -> None:
+        """Finish the current hour's file, compacting its Parquet parts."""
+        self._path = None
+        if self.export_format == "parquet" and self._hour is not None:
+            try:
+                self._compact_parquet(self._get_hour_base())
+            except Exception as e:
+                # The parts are left in place and still hold every row
+                print(f"Error compacting flight export parts: {e}")
+
+    @staticmethod
+    def _compact_parquet(base: str) -> None:
+        """
+        Merge an hour's Parquet part files into its first file.
+
+        Parts are streamed into a temporary file one at a time, which then
+        replaces the first file before the other parts are removed.
+        """
+        parts = glob.glob(f"{glob.escape(base)}.*parquet")
+        part_numbers = {}
+        for path in parts:
+            suffix = path[len(base) + 1 : -len("parquet")].rstrip(".")
+            if suffix == "" or suffix.isdigit():
+                part_numbers[path] = int(suffix or 0)
+        if len(part_numbers) < 2:
+            return
+
+        path = f"{base}.parquet"
+        temp_path = f"{path}.tmp"
+        try:
+            writer = None
+            try:
+                for part in sorted(part_numbers, key=part_numbers.get):
+                    table = pq.read_table(part)
+                    if writer is None:
+                        writer = pq.ParquetWriter(temp_path, table.schema)
+                    writer.write_table(table)
+            finally:
+                if writer is not None:
+                    writer.close()
+            os.replace(temp_path, path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        for part in part_numbers:
+            if part != path:
+                os.remove(part)
+
+    def _remove_expired(self, now: float) -> None:
+        """Delete export files older than the retention period."""
+        if not self.retention_hours:
+            return
+        cutoff = now - self.retention_hours * 3600
+        pattern = os.path.join(self.directory, f"{EXPORT_FILE_PREFIX}*")
+        for path in glob.glob(pattern):
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError as e:
+                print(f"Error removing expired export {path}: {e}")
+
+    def close(self) -> None:
+        """Write everything still queued or buffered, then close the file."""
+        self._queue.close()
+        try:
+            self._flush()
+        except Exception as e:
+            print(f"Error flushing flight export: {e}")
+        self._close_file()
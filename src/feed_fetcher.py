@@ -0,0 +1,112 @@
+"""Concurrent fetching of flight feed zones."""
+
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional
+from .config import Config
+from .metrics import REGISTRY
+
+
+class FeedFetcher:
+    """Fetches feed zones concurrently with timeouts and retries."""
+
+    def __init__(
+        self,
+        fr_api: Any,
+        max_workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+        retries: Optional[int] = None,
+        backoff: Optional[float] = None,
+    ):
+        self.fr_api = fr_api
+        self.max_workers = max_workers or Config.FEED_MAX_WORKERS
+        self.timeout = timeout or Config.FEED_REQUEST_TIMEOUT
+        self.retries = retries if retries is not None else Config.FEED_RETRIES
+        self.backoff = backoff if backoff is not None else Config.FEED_RETRY_BACKOFF
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Get the worker pool, kept alive between cycles. Lazy loading pattern."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="feed-fetcher"
+            )
+        return self._executor
+
+    def _fetch_zone(self, bounds: Optional[str]) -> List[Any]:
+        """Fetch a single zone, retrying with exponential backoff."""
+        attempt = 0
+        while True:
+            try:
+                if bounds is None:
+                    return self.fr_api.get_flights()
+                return self.fr_api.get_flights(bounds=bounds)
+            except Exception as e:
+                if attempt >= self.retries:
+                    raise
+                delay = self.backoff * (2**attempt)
+                print(f"Retrying zone {bounds or 'worldwide'} in {delay:g}s: {e}")
+                time.sleep(delay)
+                attempt += 1
+
+    def fetch(self, zone_bounds: List[Optional[str]]) -> List[Any]:
+        """
+        Fetch all zones concurrently and merge the flights by id.
+
+        Args:
+            zone_bounds: FlightRadar24 bounds strings, None for the worldwide feed
+
+        Returns:
+            List of unique flights across all zones, empty if there are no zones
+
+        Raises:
+            RuntimeError: If no zone could be fetched
+        """
+        if not zone_bounds:
+            return []
+
+        executor = self._get_executor()
+        futures = {
+            executor.submit(self._fetch_zone, bounds): bounds for bounds in zone_bounds
+        }
+
+        # Each attempt may take up to the timeout, plus the backoff between
+        # attempts, and zones beyond the pool size wait for a free worker
+        zone_deadline = self.timeout * (self.retries + 1) + self.backoff * (
+            2**self.retries - 1
+        )
+        deadline = zone_deadline * math.ceil(len(zone_bounds) / self.max_workers)
+        _, not_done = wait(futures, timeout=deadline)
+
+        flights_by_id: Dict[Any, Any] = {}
+        failed = 0
+        for future in futures:
+            bounds = futures[future]
+            if future in not_done:
+                future.cancel()
+                print(f"Timed out fetching zone {bounds or 'worldwide'}")
+                failed += 1
+                continue
+            try:
+                for flight in future.result():
+                    flight_id = getattr(flight, "id", None)
+                    # Flights without an id cannot be told apart, skip them
+                    if flight_id:
+                        flights_by_id.setdefault(flight_id, flight)
+            except Exception as e:
+                print(f"Error fetching zone {bounds or 'worldwide'}: {e}")
+                failed += 1
+
+        if failed:
+            REGISTRY.increment("flight_tracker_feed_zone_failures_total", failed)
+        if failed == len(zone_bounds):
+            raise RuntimeError("Failed to fetch any flight feed zone")
+
+        return list(flights_by_id.values())
+
+    def close(self) -> None:
+        """Shut down the worker pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
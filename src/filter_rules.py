@@ -0,0 +1,285 @@
+"""Include/exclude filter rules compiled into per-field lookup tables."""
+
+from bisect import bisect_right
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from .config import Config
+from .data_loader import DataLoader
+
+RULE_ACTIONS = ("include", "exclude")
+RULE_FIELDS = ("origin", "destination", "airline", "aircraft", "altitude")
+
+# Rule evaluation outcomes
+RULE_NONE = 0
+RULE_INCLUDE = 1
+RULE_EXCLUDE = 2
+
+
+class FilterRule:
+    """One include or exclude rule, all of whose conditions must hold."""
+
+    __slots__ = ("action", "values", "altitude_band", "source")
+
+    def __init__(
+        self,
+        action: str,
+        values: Dict[str, Tuple[str, ...]],
+        altitude_band: Optional[Tuple[float, float]] = None,
+        source: str = "",
+    ):
+        self.action = action
+        # Field -> accepted values, any of which satisfies the condition
+        self.values = values
+        # Altitude band in feet, minimum inclusive and maximum exclusive
+        self.altitude_band = altitude_band
+        self.source = source
+
+    @classmethod
+    def parse(cls, line: str, data_loader: DataLoader) -> "FilterRule":
+        """
+        Parse a rule such as "exclude airline=RYR,EZY altitude=0-10000".
+
+        Origin and destination take country codes, airline takes callsign
+        ICAO prefixes, aircraft takes aircraft type codes and altitude takes
+        a "min-max" band in feet where either end may be left open.
+
+        Raises:
+            ValueError: If the rule is malformed
+        """
+        action, *conditions = line.split()
+        action = action.lower()
+        if action not in RULE_ACTIONS:
+            raise ValueError(f"unknown action '{action}'")
+        if not conditions:
+            raise ValueError("rule has no conditions")
+
+        values: Dict[str, Tuple[str, ...]] = {}
+        altitude_band = None
+        for condition in conditions:
+            field, separator, value = condition.partition("=")
+            field = field.lower()
+            if not separator or not value:
+                raise ValueError(f"expected field=value, got '{condition}'")
+            if field not in RULE_FIELDS:
+                raise ValueError(f"unknown field '{field}'")
+
+            if field == "altitude":
+                minimum, _, maximum = value.partition("-")
+                altitude_band = (
+                    float(minimum) if minimum else float("-inf"),
+                    float(maximum) if maximum else float("inf"),
+                )
+                continue
+
+            accepted = tuple(item.upper() for item in value.split(",") if item)
+            if field in ("origin", "destination"):
+                known_codes = data_loader.get_all_country_codes()
+                unknown = [code for code in accepted if code not in known_codes]
+                if unknown:
+                    raise ValueError(f"unknown country code(s): {', '.join(unknown)}")
+            values[field] = accepted
+
+        return cls(action, values, altitude_band, line)
+
+
+class FilterRules:
+    """
+    Rules compiled into one lookup table per field.
+
+    Every table maps a field value to the bitmask of rules it satisfies,
+    so a flight costs one lookup per constrained field no matter how many
+    rules there are.
+    """
+
+    def __init__(self, rules: List[FilterRule], data_loader: DataLoader):
+        self.rules = rules
+        self.data_loader = data_loader
+        self._all_rules = (1 << len(rules)) - 1
+        self._include_mask = 0
+        self._exclude_mask = 0
+        for position, rule in enumerate(rules):
+            if rule.action == "include":
+                self._include_mask |= 1 << position
+            else:
+                self._exclude_mask |= 1 << position
+
+        # Field -> (value getter, value -> rule mask, mask of rules ignoring it)
+        self._lookups: Dict[str, Tuple[Callable[[Any], Any], Dict[str, int], int]] = {}
+        getters = {
+            "origin": self._origin_country,
+            "destination": self._destination_country,
+            "airline": self._airline,
+            "aircraft": self._aircraft,
+        }
+        for field, getter in getters.items():
+            table: Dict[str, int] = {}
+            unconstrained = 0
+            for position, rule in enumerate(rules):
+                accepted = rule.values.get(field)
+                if accepted is None:
+                    unconstrained |= 1 << position
+                    continue
+                for value in accepted:
+                    table[value] = table.get(value, 0) | 1 << position
+            # Fields no rule constrains are never looked up
+            if table:
+                self._lookups[field] = (getter, table, unconstrained)
+
+        self._build_altitude_bands()
+
+    def _build_altitude_bands(self) -> None:
+        """Split altitudes into intervals with the mask of rules matching each."""
+        bands = [
+            (position, rule.altitude_band)
+            for position, rule in enumerate(self.rules)
+            if rule.altitude_band is not None
+        ]
+        self._altitude_bounds: List[float] = []
+        self._altitude_masks: List[int] = []
+        self._altitude_unconstrained = self._all_rules
+        if not bands:
+            return
+
+        for position, _ in bands:
+            self._altitude_unconstrained &= ~(1 << position)
+        self._altitude_bounds = sorted(
+            {bound for _, band in bands for bound in band}
+        )
+        # Interval i covers altitudes in [bounds[i - 1], bounds[i])
+        for interval in range(len(self._altitude_bounds) + 1):
+            low = (
+                self._altitude_bounds[interval - 1] if interval else float("-inf")
+            )
+            mask = self._altitude_unconstrained
+            for position, (minimum, maximum) in bands:
+                if minimum <= low < maximum:
+                    mask |= 1 << position
+            self._altitude_masks.append(mask)
+
+    def _origin_country(self, flight: Any) -> str:
+        """Get the country code of a flight's origin airport."""
+        airport_code = getattr(flight, "origin_airport_iata", None)
+        return self.data_loader.get_airport_record(airport_code).country_code
+
+    def _destination_country(self, flight: Any) -> str:
+        """Get the country code of a flight's destination airport."""
+        airport_code = getattr(flight, "destination_airport_iata", None)
+        return self.data_loader.get_airport_record(airport_code).country_code
+
+    @staticmethod
+    def _airline(flight: Any) -> str:
+        """Get the airline ICAO prefix of a flight's callsign."""
+        return str(getattr(flight, "callsign", "") or "")[:3].upper()
+
+    @staticmethod
+    def _aircraft(flight: Any) -> str:
+        """Get a flight's aircraft type code."""
+        return str(getattr(flight, "aircraft_code", "") or "").upper()
+
+    def get_masks(self) -> Tuple[int, int, int]:
+        """Get the masks of (all rules, include rules, exclude rules)."""
+        return self._all_rules, self._include_mask, self._exclude_mask
+
+    def get_field_tables(
+        self,
+    ) -> Dict[str, Tuple[Callable[[Any], Any], Dict[str, int], int]]:
+        """
+        Get the lookup table of every field a rule constrains, except altitude.
+
+        Returns:
+            Field -> (value getter, value -> rule mask, mask of rules ignoring
+            the field), e.g. to evaluate whole columns of flights at once
+        """
+        return dict(self._lookups)
+
+    def get_altitude_bands(self) -> Tuple[List[float], List[int], int]:
+        """
+        Get the altitude intervals and their rule masks.
+
+        Returns:
+            (sorted interval bounds, mask of interval i covering
+            [bounds[i - 1], bounds[i]), mask for flights without altitude)
+        """
+        return self._altitude_bounds, self._altitude_masks, self._altitude_unconstrained
+
+    def match(self, flight: Any) -> int:
+        """Get the bitmask of rules matching a flight, bit i for self.rules[i]."""
+        mask = self._all_rules
+        for getter, table, unconstrained in self._lookups.values():
+            mask &= table.get(getter(flight), 0) | unconstrained
+            if not mask:
+                return 0
+
+        if self._altitude_bounds:
+            try:
+                altitude = float(getattr(flight, "altitude", None))
+                interval = bisect_right(self._altitude_bounds, altitude)
+                mask &= self._altitude_masks[interval]
+            except (TypeError, ValueError):
+                mask &= self._altitude_unconstrained
+        return mask
+
+    def evaluate(self, flight: Any) -> int:
+        """
+        Evaluate all rules against a flight in one pass.
+
+        Returns:
+            int: RULE_EXCLUDE if an exclude rule matches, else RULE_INCLUDE
+            if an include rule matches, else RULE_NONE
+        """
+        mask = self.match(flight)
+        if mask & self._exclude_mask:
+            return RULE_EXCLUDE
+        if mask & self._include_mask:
+            return RULE_INCLUDE
+        return RULE_NONE
+
+    def group_country(self, flight: Any) -> Optional[str]:
+        """Get the country an included flight is reported under."""
+        for country_code in (
+            self._destination_country(flight),
+            self._origin_country(flight),
+        ):
+            if country_code != "Unknown":
+                return country_code
+        return None
+
+
+def load_filter_rules(
+    data_loader: DataLoader, filename: Optional[str] = None
+) -> Optional[FilterRules]:
+    """
+    Load and compile the rule file, one rule per line.
+
+    Blank lines and lines starting with "#" are ignored, as are malformed
+    rules, which are reported.
+
+    Returns:
+        FilterRules, or None if the file is missing or has no rules
+    """
+    if filename is None:
+        filename = Config.FILTER_RULES_FILE
+
+    rules = []
+    try:
+        with open(filename, "r", encoding="utf-8") as file:
+            for line_number, line in enumerate(file, 1):
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                try:
+                    rules.append(FilterRule.parse(line, data_loader))
+                except ValueError as e:
+                    print(
+                        f"Warning: Skipping rule on line {line_number} "
+                        f"of {filename}: {e}"
+                    )
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"Error loading filter rules from {filename}: {e}")
+        return None
+
+    if not rules:
+        return None
+    print(f"Loaded {len(rules)} filter rules from {filename}")
+    return FilterRules(rules, data_loader)
@@ -0,0 +1,109 @@
+"""Compact flight records used throughout the tracking pipeline."""
+
+from typing import Any, Dict
+from .data_loader import AirportRecord, DataLoader
+
+
+class FlightDetail:
+    """Data class for flight details."""
+
+    # Slots keep thousands of records per cycle small and avoid a per-record dict
+    __slots__ = (
+        "call_sign",
+        "flight_id",
+        "origin_airport",
+        "destination_airport",
+        "country",
+        "country_name",
+    )
+
+    # Fields exposed when converting to a dictionary
+    FIELDS = (
+        "call_sign",
+        "flight_id",
+        "origin",
+        "destination",
+        "origin_country",
+        "destination_country",
+        "origin_country_name",
+        "destination_country_name",
+        "origin_airport_name",
+        "destination_airport_name",
+        "country",
+        "country_name",
+    )
+
+    def __init__(
+        self,
+        flight,
+        data_loader: DataLoader,
+        country_code: str = "",
+        country_name: str = "",
+    ):
+        self.call_sign = getattr(flight, "callsign", "Unknown")
+        self.flight_id = getattr(flight, "id", "Unknown")
+
+        # Resolve airport and country information, shared between flights
+        self.origin_airport: AirportRecord = data_loader.get_airport_record(
+            getattr(flight, "origin_airport_iata", "Unknown")
+        )
+        self.destination_airport: AirportRecord = data_loader.get_airport_record(
+            getattr(flight, "destination_airport_iata", "Unknown")
+        )
+
+        # Tracked country this flight was matched for
+        self.country = country_code
+        self.country_name = country_name
+
+    @property
+    def origin(self) -> str:
+        """Origin airport IATA code."""
+        return self.origin_airport.code
+
+    @property
+    def destination(self) -> str:
+        """Destination airport IATA code."""
+        return self.destination_airport.code
+
+    @property
+    def origin_country(self) -> str:
+        """Origin country code."""
+        return self.origin_airport.country_code
+
+    @property
+    def destination_country(self) -> str:
+        """Destination country code."""
+        return self.destination_airport.country_code
+
+    @property
+    def origin_country_name(self) -> str:
+        """Origin country name."""
+        return self.origin_airport.country_name
+
+    @property
+    def destination_country_name(self) -> str:
+        """Destination country name."""
+        return self.destination_airport.country_name
+
+    @property
+    def origin_airport_name(self) -> str:
+        """Origin airport name."""
+        return self.origin_airport.name
+
+    @property
+    def destination_airport_name(self) -> str:
+        """Destination airport name."""
+        return self.destination_airport.name
+
+    def for_country(self, country_code: str, country_name: str) -> "FlightDetail":
+        """Get a copy of this flight matched for another tracked country."""
+        detail = FlightDetail.__new__(FlightDetail)
+        for field in FlightDetail.__slots__:
+            setattr(detail, field, getattr(self, field))
+        detail.country = country_code
+        detail.country_name = country_name
+        return detail
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a dictionary, e.g. for serialization."""
+        return {field: getattr(self, field) for field in FlightDetail.FIELDS}
@@ -1,56 +1,81 @@
 """Core flight tracking functionality."""
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set
 from FlightRadar24 import FlightRadar24API
 from .data_loader import DataLoader, CountryLoader
-from .email_service import EmailService
-
-
-class FlightDetail:
-    """Data class for flight details."""
-
-    def __init__(self, flight, data_loader: DataLoader):
-        self.call_sign = getattr(flight, "callsign", "Unknown")
-        self.flight_id = getattr(flight, "id", "Unknown")
-        self.origin = getattr(flight, "origin_airport_iata", "Unknown")
-        self.destination = getattr(flight, "destination_airport_iata", "Unknown")
-
-        # Resolve airport and country information
-        self.origin_country = data_loader.get_airport_country(self.origin)
-        self.destination_country = data_loader.get_airport_country(self.destination)
-        self.origin_country_name = data_loader.get_country_name(self.origin_country)
-        self.destination_country_name = data_loader.get_country_name(
-            self.destination_country
-        )
-        self.origin_airport_name = data_loader.get_airport_name(self.origin)
-        self.destination_airport_name = data_loader.get_airport_name(self.destination)
-
-    def to_dict(self, country_code: str, country_name: str) -> Dict[str, Any]:
-        """Convert to dictionary for email generation."""
-        return {
-            "call_sign": self.call_sign,
-            "flight_id": self.flight_id,
-            "origin": self.origin,
-            "destination": self.destination,
-            "origin_country": self.origin_country,
-            "destination_country": self.destination_country,
-            "origin_country_name": self.origin_country_name,
-            "destination_country_name": self.destination_country_name,
-            "origin_airport_name": self.origin_airport_name,
-            "destination_airport_name": self.destination_airport_name,
-            "country": country_code,
-            "country_name": country_name,
-        }
+from .config import Config
+from .state_store import SeenFlightStore
+from .snapshot_diff import FeedDelta, SnapshotDiffer
+from .zones import ZonePlanner
+from .feed_fetcher import FeedFetcher
+from .flight_detail import FlightDetail
+from .notifiers import (
+    Notifier,
+    NotificationDispatcher,
+    configured_notifiers,
+    create_notifiers,
+)
+from .digest import DigestBuffer
+from .geofence import GeofenceIndex
+from .history import FlightHistory
+from .replay import FeedRecorder
+from .metrics import REGISTRY, MetricsServer, write_json_log
+from .exporter import FlightExporter
+from .filter_rules import RULE_EXCLUDE, RULE_INCLUDE, load_filter_rules
+from .profiles import Profile, ProfileSet
+from .profile_pool import ProfilePool
+from .vectorized import NUMPY_AVAILABLE, VectorizedMatcher, VectorizedRules
 
 
 class FlightTracker:
     """Main flight tracking class."""
 
-    def __init__(self, countries_to_track: Optional[List[str]] = None):
-        self.fr_api = FlightRadar24API()
-        self.data_loader = DataLoader()
+    def __init__(
+        self,
+        countries_to_track: Optional[List[str]] = None,
+        data_loader: Optional[DataLoader] = None,
+        notifiers: Optional[List[Notifier]] = None,
+        fr_api: Optional[Any] = None,
+    ):
+        # The client's own timeout frees fetch workers from hung requests
+        self.fr_api = fr_api or FlightRadar24API(timeout=Config.FEED_REQUEST_TIMEOUT)
+        self.feed_fetcher = FeedFetcher(self.fr_api)
+        self.recorder: Optional[FeedRecorder] = None
+        # Original fetch time of a replayed snapshot, None for live feeds
+        self._fetched_at: Optional[float] = None
+        self.data_loader = data_loader or DataLoader()
         self.country_loader = CountryLoader(self.data_loader)
-        self.email_service = EmailService()
+        self.notification_dispatcher = NotificationDispatcher(
+            notifiers
+            if notifiers is not None
+            else configured_notifiers(create_notifiers())
+        )
+        self.digest: Optional[DigestBuffer] = (
+            DigestBuffer() if Config.DIGEST_WINDOW_SECONDS > 0 else None
+        )
+        self.seen_store: Optional[SeenFlightStore] = SeenFlightStore()
+        self.notify_on_status_change = Config.NOTIFY_ON_STATUS_CHANGE
+        self.snapshot_differ = SnapshotDiffer(self._build_flight_details)
+        self.history: Optional[FlightHistory] = (
+            FlightHistory() if Config.USE_HISTORY else None
+        )
+        self.exporter: Optional[FlightExporter] = (
+            FlightExporter() if Config.USE_EXPORT else None
+        )
+        self.use_zone_bounds = Config.USE_ZONE_BOUNDS
+        self.zone_planner = ZonePlanner(self.data_loader)
+        self._zone_bounds: Optional[List[str]] = None
+        self.use_geofences = Config.USE_GEOFENCES
+        self.geofence_index = GeofenceIndex(self.data_loader)
+        self._geofences_built = False
+        self.use_vectorized = Config.USE_VECTORIZED and NUMPY_AVAILABLE
+        self._vectorized_matcher: Optional[VectorizedMatcher] = None
+        self.filter_rules = load_filter_rules(self.data_loader)
+        self.profiles: Optional[ProfileSet] = None
+        self.profile_pool: Optional[ProfilePool] = None
+        self.metrics = REGISTRY
+        self.metrics_log = Config.METRICS_LOG
+        self.metrics_server: Optional[MetricsServer] = None
 
         # Load countries to track
         if countries_to_track is None:
@@ -58,20 +83,122 @@ class FlightTracker:
         else:
             self.countries_to_track = countries_to_track
 
-    def _get_flights_to_country(self, country_code: str) -> List[Any]:
-        """Get flights to a specific country."""
-        flights = self.fr_api.get_flights()
-        country_flights = []
+        # Destination airport IATA code -> tracked country codes
+        self._destination_index: Dict[str, Set[str]] = {}
+        self._rebuild_destination_index()
+
+    def _rebuild_destination_index(self) -> None:
+        """Rebuild the destination airport index for the tracked countries."""
+        index: Dict[str, Set[str]] = {}
+        for country_code in self.countries_to_track:
+            for airport_code in self.data_loader.get_country_airports(country_code):
+                index.setdefault(airport_code, set()).add(country_code)
+        self._destination_index = index
+        # Zones, geofences and the matcher depend on the tracked countries,
+        # rebuild them lazily
+        self._zone_bounds = None
+        self._geofences_built = False
+        self._vectorized_matcher = None
+
+    def use_profiles(self, profiles: ProfileSet, workers: Optional[int] = None) -> None:
+        """
+        Track several profiles in one pass instead of a single country list.
+
+        The feed is matched once against every profile's countries and
+        include rules, then split between the profiles, each of which is
+        de-duplicated and notified on its own.
+
+        Args:
+            profiles: Compiled tracking profiles
+            workers: Processes to split the profiles between, defaults to
+                Config.PROFILE_WORKERS; 0 splits them in this process
+        """
+        if workers is None:
+            workers = Config.PROFILE_WORKERS
+        if self.profiles is None and self.filter_rules is not None:
+            print(
+                "Warning: filter rules are ignored with tracking profiles - "
+                "move them into each profile's \"rules\""
+            )
+        if self.profile_pool is not None:
+            self.profile_pool.close()
+        self.profile_pool = ProfilePool(profiles, workers) if workers > 0 else None
+        self.profiles = profiles
+        self.countries_to_track = profiles.get_countries()
+        self.filter_rules = profiles.include_rules
+        self.snapshot_differ.reset()
+        self._rebuild_destination_index()
+
+    def _get_zone_bounds(self) -> List[str]:
+        """Get the feed bounds covering the tracked countries."""
+        if self._zone_bounds is None:
+            self._zone_bounds = self.zone_planner.plan(self.countries_to_track)
+        return self._zone_bounds
+
+    def _get_geofence_index(self) -> GeofenceIndex:
+        """Get the geofence index for the tracked countries."""
+        if not self._geofences_built:
+            self.geofence_index.build(self.countries_to_track)
+            self._geofences_built = True
+        return self.geofence_index
+
+    def _can_vectorize(self) -> bool:
+        """Check whether the NumPy matcher pays off for the current settings."""
+        if not self.use_vectorized:
+            return False
+        if self.filter_rules is not None:
+            return len(self.filter_rules.rules) <= VectorizedRules.MAX_RULES
+        # Converting the feed to arrays costs more than plain destination
+        # lookups save, only the geofence distance checks win it back
+        return self.use_geofences
+
+    def _get_vectorized_matcher(self) -> VectorizedMatcher:
+        """Get the array-based matcher for the tracked countries and rules."""
+        matcher = self._vectorized_matcher
+        if (
+            matcher is None
+            or matcher.has_geofences != self.use_geofences
+            or matcher.filter_rules is not self.filter_rules
+        ):
+            airport_codes = self.data_loader.get_airport_codes()
+            matcher = VectorizedMatcher(
+                airport_codes,
+                self.countries_to_track,
+                self._destination_index,
+                self._get_geofence_index() if self.use_geofences else None,
+                (
+                    VectorizedRules(self.filter_rules, airport_codes, self.data_loader)
+                    if self.filter_rules is not None
+                    else None
+                ),
+            )
+            self._vectorized_matcher = matcher
+        return matcher
 
-        # Get airports for this country
+    def _fetch_flights(self) -> List[Any]:
+        """Fetch a single snapshot of the flight feed for this tracking cycle."""
+        if not self.use_zone_bounds:
+            flights = self.feed_fetcher.fetch([None])
+        else:
+            # Fetch only the zones around the tracked airports
+            zone_bounds = self._get_zone_bounds()
+            flights = self.feed_fetcher.fetch(zone_bounds)
+            print(f"Fetched {len(flights)} flights from {len(zone_bounds)} zones")
+
+        self._fetched_at = getattr(self.fr_api, "fetched_at", None)
+        if self.recorder is not None:
+            self.recorder.record(flights, self._fetched_at)
+        return flights
+
+    def _print_country_airports(self, country_code: str) -> None:
+        """Print the airports tracked for a country."""
         country_airports = self.data_loader.get_country_airports(country_code)
+        country_name = self.data_loader.get_country_name(country_code)
 
         if not country_airports:
-            country_name = self.data_loader.get_country_name(country_code)
             print(f"No airports found for {country_name} ({country_code}) in CSV data")
-            return []
+            return
 
-        country_name = self.data_loader.get_country_name(country_code)
         airport_display = country_airports[:5]
         if len(country_airports) > 5:
             airport_display.append("...")
@@ -79,40 +206,86 @@ class FlightTracker:
             f"Tracking {len(country_airports)} airports for {country_name} ({country_code}): {airport_display}"
         )
 
-        # Filter flights to this country
-        for flight in flights:
-            destination = getattr(flight, "destination_airport_iata", None)
-            if destination and destination in country_airports:
-                country_flights.append(flight)
-
-        return country_flights
-
-    def _create_flight_details(
-        self, flights: List[Any], country_code: str
-    ) -> List[Dict[str, Any]]:
-        """Create detailed flight information for email."""
-        flight_details = []
-        country_name = self.data_loader.get_country_name(country_code)
-
-        for flight in flights:
-            detail = FlightDetail(flight, self.data_loader)
-            flight_details.append(detail.to_dict(country_code, country_name))
+    def _match_flights(self, flights: List[Any]) -> Dict[str, List[Any]]:
+        """Assign each flight in the snapshot to every tracked country it matches."""
+        if self._can_vectorize():
+            return self._get_vectorized_matcher().match(flights)
+
+        matches: Dict[str, List[Any]] = {code: [] for code in self.countries_to_track}
+        destination_index = self._destination_index
+        filter_rules = self.filter_rules
+
+        # Locate every flight position against the geofences in one batch
+        fenced_countries = None
+        if self.use_geofences:
+            fenced_countries = self._get_geofence_index().locate(
+                (getattr(flight, "latitude", None), getattr(flight, "longitude", None))
+                for flight in flights
+            )
 
-        return flight_details
+        for position, flight in enumerate(flights):
+            destination = getattr(flight, "destination_airport_iata", None)
+            countries = destination_index.get(destination, ()) if destination else ()
+            if fenced_countries is not None and fenced_countries[position]:
+                countries = fenced_countries[position].union(countries)
+
+            if filter_rules is not None:
+                verdict = filter_rules.evaluate(flight)
+                if verdict == RULE_EXCLUDE:
+                    continue
+                if verdict == RULE_INCLUDE and not countries:
+                    # Report flights only included by a rule under their own country
+                    group_country = filter_rules.group_country(flight)
+                    countries = (group_country,) if group_country else ()
+
+            for country_code in countries:
+                matches.setdefault(country_code, []).append(flight)
+
+        return matches
+
+    def _build_flight_details(
+        self, flight: Any, country_codes: List[str]
+    ) -> List[FlightDetail]:
+        """Create detailed flight information for email, one per matched country."""
+        first_code = country_codes[0]
+        detail = FlightDetail(
+            flight,
+            self.data_loader,
+            first_code,
+            self.data_loader.get_country_name(first_code),
+        )
+        details = [detail]
+        for country_code in country_codes[1:]:
+            details.append(
+                detail.for_country(
+                    country_code, self.data_loader.get_country_name(country_code)
+                )
+            )
+        return details
+
+    def _order_by_country(self, flight_details: List[FlightDetail]) -> List[FlightDetail]:
+        """Order flight details by the order of the tracked countries."""
+        country_order = {code: i for i, code in enumerate(self.countries_to_track)}
+        # Countries only matched through filter rules come last
+        untracked = len(country_order)
+        return sorted(
+            flight_details,
+            key=lambda detail: country_order.get(detail.country, untracked),
+        )
 
     def _print_flight_summary(self, country_code: str, flight_count: int) -> None:
         """Print flight summary for a country."""
         country_name = self.data_loader.get_country_name(country_code)
         print(f"→  {country_name}: {flight_count} flights")
 
-    def _print_flight_details(self, flight_details: List[Dict[str, Any]]) -> List[str]:
+    def _print_flight_details(self, flight_details: List[FlightDetail]) -> List[str]:
         """Print and return flight details for console output."""
         flight_report = []
 
         for detail in flight_details:
             flight_info = (
-                f"  - Flight {detail['call_sign']} (ID: {detail['flight_id']}): "
-                f"{detail['origin_airport_name']} → {detail['destination_airport_name']}"
+                f"  - Flight {detail.call_sign} (ID: {detail.flight_id}): "
+                f"{detail.origin_airport_name} → {detail.destination_airport_name}"
             )
             flight_report.append(flight_info)
 
@@ -130,35 +303,264 @@ class FlightTracker:
         print(f"Tracking countries: {', '.join(tracked_country_names)}")
         print("-" * 30)
 
-        flight_report = []
-        all_flight_details = []
         total_flights = 0
+        stage_durations: Dict[str, float] = {}
+        time_stage = self.metrics.time_stage
 
-        # Process each country
         for country_code in self.countries_to_track:
-            flights = self._get_flights_to_country(country_code)
-            flight_count = len(flights)
-            total_flights += flight_count
+            self._print_country_airports(country_code)
 
+        # Fetch the feed once and fan it out to all tracked countries
+        with time_stage("fetch", stage_durations):
+            flights = self._fetch_flights()
+        with time_stage("match", stage_durations):
+            matches = self._match_flights(flights)
+
+        # Tracked countries come first, then countries only matched by rules
+        for country_code in matches:
+            flight_count = len(matches[country_code])
+            total_flights += flight_count
             self._print_flight_summary(country_code, flight_count)
 
-            if flight_count > 0:
-                country_name = self.data_loader.get_country_name(country_code)
-                flight_report.append(f"{country_name}: {flight_count} flights")
+        # Only build details for flights that changed since the last cycle
+        with time_stage("enrich", stage_durations):
+            delta = self.snapshot_differ.update(matches)
+        print(
+            f"Since last cycle: {len(delta.added)} added, {len(delta.changed)} changed, "
+            f"{len(delta.removed)} removed, {delta.unchanged_count} unchanged"
+        )
+        # Archive and export the whole snapshot in the background
+        if self.history is not None or self.exporter is not None:
+            with time_stage("archive", stage_durations):
+                current_details = self.snapshot_differ.get_current_details()
+                if self.history is not None:
+                    self.history.record(current_details, self._fetched_at)
+                if self.exporter is not None:
+                    self.exporter.record(current_details, self._fetched_at)
+
+        # Unchanged flights skip de-duplication, but are still in the feed
+        if self.seen_store is not None and delta.unchanged_ids:
+            with time_stage("dedup", stage_durations):
+                self.seen_store.touch(delta.unchanged_ids)
+
+        updated_details = self._order_by_country(delta.get_updated_details())
+        for line in self._print_flight_details(updated_details):
+            print(line)
+
+        if self.profiles is not None:
+            new_flight_count = self._notify_profiles(
+                matches, updated_details, stage_durations
+            )
+        else:
+            with time_stage("dedup", stage_durations):
+                new_flight_details = self._select_new_flights(
+                    total_flights, updated_details
+                )
+            with time_stage("dispatch", stage_durations):
+                self._notify(new_flight_details)
+            new_flight_count = len(new_flight_details)
+
+        self._record_cycle_metrics(
+            len(flights), matches, delta, new_flight_count, stage_durations
+        )
 
-                # Create detailed flight information
-                flight_details = self._create_flight_details(flights, country_code)
-                all_flight_details.extend(flight_details)
+    def _notify_profiles(
+        self,
+        matches: Dict[str, List[Any]],
+        updated_details: List[FlightDetail],
+        stage_durations: Dict[str, float],
+    ) -> int:
+        """
+        Split the updated flights between the profiles and notify each one.
+
+        Returns:
+            int: Number of flights selected for notification across profiles
+        """
+        time_stage = self.metrics.time_stage
+        with time_stage("assign", stage_durations):
+            flights_by_id = {
+                str(getattr(flight, "id", "")): flight
+                for country_flights in matches.values()
+                for flight in country_flights
+            }
+            if self.profile_pool is not None:
+                assigned = self.profile_pool.assign(updated_details, flights_by_id)
+            else:
+                assigned = self.profiles.assign(updated_details, flights_by_id)
+
+        new_flight_count = 0
+        for profile, profile_details in zip(self.profiles.profiles, assigned):
+            # Profiles without new flights or a pending digest cost nothing
+            if not profile_details and not (profile.digest and len(profile.digest)):
+                continue
+            with time_stage("dedup", stage_durations):
+                if profile_details and self.seen_store is not None:
+                    profile_details = self.seen_store.filter_new(
+                        profile_details,
+                        self.notify_on_status_change,
+                        namespace=profile.name,
+                    )
+            print(f"Profile {profile.name}: {len(profile_details)} new flights")
+            new_flight_count += len(profile_details)
+            with time_stage("dispatch", stage_durations):
+                self._notify(profile_details, profile)
+        return new_flight_count
+
+    def _record_cycle_metrics(
+        self,
+        feed_size: int,
+        matches: Dict[str, List[Any]],
+        delta: FeedDelta,
+        new_flight_count: int,
+        stage_durations: Dict[str, float],
+    ) -> None:
+        """Update the metrics registry and write the cycle's JSON log line."""
+        metrics = self.metrics
+        metrics.increment("flight_tracker_cycles_total")
+        metrics.set("flight_tracker_feed_flights", feed_size)
+        # Tracked countries without matches report 0, other countries that
+        # dropped out of the matches lose their series
+        matched_counts: Dict[str, float] = dict.fromkeys(self.countries_to_track, 0)
+        for country_code, country_flights in matches.items():
+            matched_counts[country_code] = len(country_flights)
+        metrics.replace("flight_tracker_matched_flights", "country", matched_counts)
+        updated_count = len(delta.added) + len(delta.changed)
+        metrics.set("flight_tracker_updated_flights", updated_count)
+        metrics.set("flight_tracker_new_flights", new_flight_count)
+
+        # Unchanged flights reuse the details built in an earlier cycle
+        current_count = updated_count + delta.unchanged_count
+        detail_hit_ratio = (
+            delta.unchanged_count / current_count if current_count else 0.0
+        )
+        metrics.set("flight_tracker_detail_cache_hit_ratio", detail_hit_ratio)
+        data_cache_hit = self.data_loader.cache_hit
+        if data_cache_hit is not None:
+            metrics.set("flight_tracker_data_cache_hit", int(data_cache_hit))
+
+        sink_stats = self._get_sink_stats()
+        for stats in sink_stats:
+            sink = stats["sink"]
+            metrics.set(
+                "flight_tracker_notifications_delivered_total",
+                stats["delivered"],
+                sink=sink,
+            )
+            metrics.set(
+                "flight_tracker_notifications_failed_total", stats["failed"], sink=sink
+            )
+            metrics.set(
+                "flight_tracker_notifications_pending", stats["pending"], sink=sink
+            )
+
+        if self.metrics_log:
+            write_json_log(
+                {
+                    "event": "tracking_cycle",
+                    "feed_flights": feed_size,
+                    "matched_flights": sum(map(len, matches.values())),
+                    "updated_flights": updated_count,
+                    "removed_flights": len(delta.removed),
+                    "new_flights": new_flight_count,
+                    "detail_cache_hit_ratio": round(detail_hit_ratio, 4),
+                    "data_cache_hit": data_cache_hit,
+                    "stage_seconds": {
+                        stage: round(duration, 6)
+                        for stage, duration in stage_durations.items()
+                    },
+                    "sinks": sink_stats,
+                },
+                self.metrics_log,
+            )
+
+    def _select_new_flights(
+        self, total_flights: int, updated_details: List[FlightDetail]
+    ) -> List[FlightDetail]:
+        """Select the flights that have not been reported before."""
+        if total_flights == 0:
+            print("No flights detected")
+            return []
+
+        if not updated_details:
+            print("No new or changed flights since the last cycle")
+            return []
 
-                # Print flight details to console
-                detailed_reports = self._print_flight_details(flight_details)
-                flight_report.extend(detailed_reports)
+        if self.seen_store is None:
+            return updated_details
 
-        # Send email notification if flights were found
-        if total_flights > 0:
-            self.email_service.send_notification(total_flights, all_flight_details)
+        new_flight_details = self.seen_store.filter_new(
+            updated_details, self.notify_on_status_change
+        )
+        if not new_flight_details:
+            print("No new flights since the last notification")
         else:
-            print("No flights detected - no email sent")
+            print(f"{len(new_flight_details)} new of {total_flights} detected flights")
+        return new_flight_details
+
+    def _get_sink_stats(self) -> List[Dict[str, Any]]:
+        """Get delivery stats for every sink, per profile in profile mode."""
+        if self.profiles is None:
+            return self.notification_dispatcher.get_stats()
+        sink_stats = []
+        for profile in self.profiles.profiles:
+            for stats in profile.dispatcher.get_stats():
+                stats["sink"] = f"{profile.name}/{stats['sink']}"
+                sink_stats.append(stats)
+        return sink_stats
+
+    def _notify(
+        self, flight_details: List[FlightDetail], profile: Optional[Profile] = None
+    ) -> None:
+        """Send a notification now, or hold the flights for the next digest."""
+        digest = self.digest if profile is None else profile.digest
+        if digest is not None:
+            digest.add(flight_details)
+            if not digest.is_due():
+                if len(digest):
+                    print(f"{len(digest)} flights held for the next digest")
+                return
+            flight_details = self._order_by_country(digest.drain())
+
+        if not flight_details:
+            print("No notification sent")
+            return
+
+        # Queue the notification so slow sinks do not block tracking
+        dispatcher = (
+            self.notification_dispatcher if profile is None else profile.dispatcher
+        )
+        dispatcher.dispatch(len(flight_details), flight_details)
+
+    def close(self) -> None:
+        """Release resources held between tracking cycles."""
+        # Flush pending digests and deliver queued notifications
+        # before tearing down the sinks
+        pending = [(self.digest, self.notification_dispatcher)]
+        if self.profiles is not None:
+            pending.extend(
+                (profile.digest, profile.dispatcher)
+                for profile in self.profiles.profiles
+            )
+        for digest, dispatcher in pending:
+            if digest is not None and len(digest):
+                flight_details = self._order_by_country(digest.drain())
+                dispatcher.dispatch(len(flight_details), flight_details)
+        self.notification_dispatcher.close()
+        if self.profiles is not None:
+            self.profiles.close()
+        if self.profile_pool is not None:
+            self.profile_pool.close()
+        if self.metrics_server is not None:
+            self.metrics_server.close()
+        self.feed_fetcher.close()
+        if self.recorder is not None:
+            self.recorder.close()
+        if self.history is not None:
+            self.history.close()
+        if self.exporter is not None:
+            self.exporter.close()
+        if self.seen_store is not None:
+            self.seen_store.close()
 
     def get_tracked_countries(self) -> List[str]:
         """Get list of currently tracked country codes."""
@@ -176,6 +578,7 @@ class FlightTracker:
             # Validate country exists
             if country_code in self.data_loader.get_all_country_codes():
                 self.countries_to_track.append(country_code)
+                self._rebuild_destination_index()
                 return True
             else:
                 print(f"Country code '{country_code}' not found in available countries")
@@ -186,5 +589,6 @@ class FlightTracker:
         """Remove a country from tracking."""
         if country_code in self.countries_to_track:
             self.countries_to_track.remove(country_code)
+            self._rebuild_destination_index()
             return True
         return False
@@ -0,0 +1,115 @@
+"""Geofences around tracked countries for position-based matching."""
+
+import math
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+from .config import Config
+from .data_loader import DataLoader
+
+# Kilometres per degree of latitude
+KM_PER_DEGREE = 111.2
+
+# (latitude, longitude, longitude scale, country code) of one circular fence
+Fence = Tuple[float, float, float, str]
+
+_NO_COUNTRIES: FrozenSet[str] = frozenset()
+
+
+class GeofenceIndex:
+    """Spatial grid index of circular fences around tracked countries' airports."""
+
+    def __init__(
+        self,
+        data_loader: DataLoader,
+        radius_km: Optional[float] = None,
+        cell_degrees: Optional[float] = None,
+    ):
+        self.data_loader = data_loader
+        self.radius_km = radius_km or Config.GEOFENCE_RADIUS_KM
+        self.cell_degrees = cell_degrees or Config.GEOFENCE_CELL_DEGREES
+        self._column_count = math.ceil(360 / self.cell_degrees)
+        # Grid cell (row, column) -> fences overlapping the cell
+        self._cells: Dict[Tuple[int, int], List[Fence]] = {}
+        self._fence_count = 0
+
+    def _cell(self, latitude: float, longitude: float) -> Tuple[int, int]:
+        """Get the grid cell containing a position."""
+        return (
+            int((latitude + 90) // self.cell_degrees),
+            int((longitude + 180) // self.cell_degrees) % self._column_count,
+        )
+
+    def build(self, country_codes: List[str]) -> None:
+        """Build fences around every airport of the given countries."""
+        radius_degrees = self.radius_km / KM_PER_DEGREE
+        cells: Dict[Tuple[int, int], List[Fence]] = {}
+        fence_count = 0
+
+        for country_code in country_codes:
+            for airport_code in self.data_loader.get_country_airports(country_code):
+                coordinates = self.data_loader.get_airport_coordinates(airport_code)
+                if coordinates is None:
+                    continue
+                latitude, longitude = coordinates
+                # Longitude degrees shrink towards the poles
+                longitude_scale = max(math.cos(math.radians(latitude)), 0.01)
+                fence = (latitude, longitude, longitude_scale, country_code)
+                fence_count += 1
+
+                longitude_radius = min(radius_degrees / longitude_scale, 180.0)
+                south, west = self._cell(
+                    latitude - radius_degrees, longitude - longitude_radius
+                )
+                north, _ = self._cell(latitude + radius_degrees, longitude)
+                column_span = int(2 * longitude_radius // self.cell_degrees) + 1
+                for row in range(south, north + 1):
+                    for offset in range(column_span + 1):
+                        column = (west + offset) % self._column_count
+                        cells.setdefault((row, column), []).append(fence)
+
+        self._cells = cells
+        self._fence_count = fence_count
+        print(f"Built {fence_count} geofences over {len(cells)} grid cells")
+
+    @property
+    def column_count(self) -> int:
+        """Number of grid columns around the globe."""
+        return self._column_count
+
+    def get_cells(self) -> Dict[Tuple[int, int], List[Fence]]:
+        """Get the grid cells and the fences overlapping each of them."""
+        return self._cells
+
+    def countries_at(
+        self, latitude: Optional[float], longitude: Optional[float]
+    ) -> FrozenSet[str]:
+        """Get the tracked countries whose fences contain a position."""
+        if latitude is None or longitude is None:
+            return _NO_COUNTRIES
+        try:
+            fences = self._cells.get(self._cell(latitude, longitude))
+        except TypeError:
+            return _NO_COUNTRIES
+        if not fences:
+            return _NO_COUNTRIES
+
+        radius_squared = (self.radius_km / KM_PER_DEGREE) ** 2
+        countries = set()
+        for fence_latitude, fence_longitude, longitude_scale, country_code in fences:
+            if country_code in countries:
+                continue
+            delta_longitude = (longitude - fence_longitude + 180) % 360 - 180
+            delta_latitude = latitude - fence_latitude
+            distance_squared = (
+                delta_latitude * delta_latitude
+                + (delta_longitude * longitude_scale) ** 2
+            )
+            if distance_squared <= radius_squared:
+                countries.add(country_code)
+        return frozenset(countries)
+
+    def locate(
+        self, positions: Iterable[Tuple[Optional[float], Optional[float]]]
+    ) -> List[FrozenSet[str]]:
+        """Get the countries containing each of many positions in one pass."""
+        countries_at = self.countries_at
+        return [countries_at(latitude, longitude) for latitude, longitude in positions]
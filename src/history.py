@@ -0,0 +1,218 @@
+"""SQLite archive of matched flights for trend reports."""
+
+import sqlite3
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from .config import Config
+from .dispatch_queue import DispatchQueue
+from .flight_detail import FlightDetail
+
+# (observed_at, flight_id, country, call_sign, origin_airport,
+#  destination_airport, origin_country, destination_country)
+HistoryRow = Tuple[float, str, str, str, str, str, str, str]
+
+# Fields of the per-flight summaries returned by get_flights
+FLIGHT_SUMMARY_FIELDS = (
+    "flight_id",
+    "country",
+    "call_sign",
+    "origin_airport",
+    "destination_airport",
+    "first_seen",
+    "last_seen",
+    "observations",
+)
+
+
+class FlightHistory:
+    """Archive of every cycle's matched flights, written in the background."""
+
+    def __init__(
+        self, path: Optional[str] = None, retention_seconds: Optional[float] = None
+    ):
+        self.path = path or Config.HISTORY_DB
+        self.retention_seconds = (
+            retention_seconds
+            if retention_seconds is not None
+            else Config.HISTORY_RETENTION_SECONDS
+        )
+        # The writer connection is only used by the queue worker
+        self._writer: Optional[sqlite3.Connection] = None
+        self._last_pruned = 0.0
+        self._queue = DispatchQueue("history", self._write_rows, self._serialize_job)
+
+    def _connect(self, check_same_thread: bool = True) -> sqlite3.Connection:
+        """Open the database in WAL mode so queries do not block the writer."""
+        connection = sqlite3.connect(self.path, check_same_thread=check_same_thread)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS flight_history (
+                observed_at REAL NOT NULL,
+                flight_id TEXT NOT NULL,
+                country TEXT NOT NULL,
+                call_sign TEXT,
+                origin_airport TEXT,
+                destination_airport TEXT,
+                origin_country TEXT,
+                destination_country TEXT
+            )
+            """
+        )
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS idx_flight_history_observed_at "
+            "ON flight_history (observed_at)"
+        )
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS idx_flight_history_country "
+            "ON flight_history (country, observed_at)"
+        )
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS idx_flight_history_flight_id "
+            "ON flight_history (flight_id, observed_at)"
+        )
+        connection.commit()
+        return connection
+
+    @staticmethod
+    def _to_row(detail: FlightDetail, observed_at: float) -> HistoryRow:
+        """Convert a flight detail to an archive row."""
+        return (
+            observed_at,
+            str(detail.flight_id),
+            detail.country,
+            str(detail.call_sign),
+            str(detail.origin),
+            str(detail.destination),
+            detail.origin_country,
+            detail.destination_country,
+        )
+
+    @staticmethod
+    def _serialize_job(job: Tuple[float, List[FlightDetail]]) -> Dict[str, Any]:
+        """Convert a queued batch to JSON-compatible data for dead letters."""
+        observed_at, flight_details = job
+        return {
+            "observed_at": observed_at,
+            "flight_details": [detail.to_dict() for detail in flight_details],
+        }
+
+    def record(
+        self, flight_details: List[FlightDetail], now: Optional[float] = None
+    ) -> None:
+        """
+        Queue one cycle's matched flights for archiving.
+
+        Args:
+            flight_details: Every flight matched in this cycle
+            now: Observation timestamp, defaults to the system time
+        """
+        if not flight_details:
+            return
+        observed_at = now if now is not None else time.time()
+        # Rows are built on the worker to keep the tracking cycle fast
+        self._queue.submit((observed_at, flight_details))
+
+    def _write_rows(self, job: Tuple[float, List[FlightDetail]]) -> None:
+        """Write a batch in one transaction. Runs on the queue worker."""
+        observed_at, flight_details = job
+        rows = [self._to_row(detail, observed_at) for detail in flight_details]
+        if self._writer is None:
+            self._writer = self._connect(check_same_thread=False)
+        with self._writer:
+            self._writer.executemany(
+                "INSERT INTO flight_history VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            # Prune old rows at most once an hour
+            now = time.time()
+            if self.retention_seconds and now - self._last_pruned > 3600:
+                self._writer.execute(
+                    "DELETE FROM flight_history WHERE observed_at < ?",
+                    (now - self.retention_seconds,),
+                )
+                self._last_pruned = now
+
+    @staticmethod
+    def _where(
+        country_codes: Optional[List[str]], since: Optional[float]
+    ) -> Tuple[str, List[Any]]:
+        """Build the WHERE clause for the query filters."""
+        clauses, params = [], []
+        if country_codes:
+            clauses.append(f"country IN ({', '.join('?' * len(country_codes))})")
+            params.extend(country_codes)
+        if since is not None:
+            clauses.append("observed_at >= ?")
+            params.append(since)
+        return (f"WHERE {' AND '.join(clauses)}" if clauses else ""), params
+
+    def get_flights(
+        self,
+        country_codes: Optional[List[str]] = None,
+        since: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get archived flights, one entry per flight and country.
+
+        Args:
+            country_codes: Only flights matched for these countries
+            since: Only observations at or after this timestamp
+            limit: Maximum number of flights, most recently seen first
+
+        Returns:
+            List of flights with first_seen, last_seen and observations
+        """
+        where, params = self._where(country_codes, since)
+        query = f"""
+            SELECT flight_id, country, call_sign, origin_airport,
+                   destination_airport, MIN(observed_at), MAX(observed_at), COUNT(*)
+            FROM flight_history {where}
+            GROUP BY flight_id, country
+            ORDER BY MAX(observed_at) DESC
+        """
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        connection = self._connect()
+        try:
+            return [
+                dict(zip(FLIGHT_SUMMARY_FIELDS, row))
+                for row in connection.execute(query, params)
+            ]
+        finally:
+            connection.close()
+
+    def get_hourly_counts(
+        self, country_codes: Optional[List[str]] = None, since: Optional[float] = None
+    ) -> List[Tuple[float, str, int]]:
+        """
+        Get the number of distinct flights per country and hour.
+
+        Returns:
+            List of (hour start timestamp, country code, flight count), oldest first
+        """
+        where, params = self._where(country_codes, since)
+        connection = self._connect()
+        try:
+            return connection.execute(
+                f"""
+                SELECT CAST(observed_at / 3600 AS INTEGER) * 3600 AS hour, country,
+                       COUNT(DISTINCT flight_id)
+                FROM flight_history {where}
+                GROUP BY hour, country
+                ORDER BY hour, country
+                """,
+                params,
+            ).fetchall()
+        finally:
+            connection.close()
+
+    def close(self) -> None:
+        """Wait for queued batches to be written, then close the database."""
+        self._queue.close()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
@@ -1,9 +1,80 @@
 """HTML generation utilities for email notifications."""
 
-import os
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import Callable, Dict, Iterable, Iterator, List, TextIO, Tuple
 from .config import Config
+from .flight_detail import FlightDetail
+from .utils import format_flight_count
+
+# Template fragments with named fields, compiled once at import time below
+DOCUMENT_HEAD_TEMPLATE = """
+            <html>
+            <head>
+                <style>
+                    {css}
+                </style>
+            </head>
+            <body>
+                <h2>🛫 Flight Tracking Alert</h2>
+
+                <div class="flight-list">
+                """
+
+DOCUMENT_TAIL_TEMPLATE = """
+                </div>
+
+                <div class="timestamp">
+                    <strong>Timestamp:</strong> {timestamp}
+                </div>
+
+                <div class="footer">
+                    <p><em>This is an automated notification from your flight tracking system.</em></p>
+                    <p><small>Click on any flight link to view it on FlightRadar24</small></p>
+                </div>
+            </body>
+            </html>
+            """
+
+COUNTRY_HEAD_TEMPLATE = """
+                        <div class="country-container">
+                            <div class="country-header">{country_name}: {flight_count} {flight_word}</div>
+                            <div class="country-flights">
+                                """
+
+COUNTRY_TAIL = """
+                            </div>
+                        </div>"""
+
+FLIGHT_TEMPLATE = """
+                <div class="flight-item">
+                    Flight <a href='https://www.flightradar24.com/{call_sign}/{flight_id}' target='_blank' class='flight-link'>{call_sign} (ID: {flight_id})</a>:<br>
+                    &nbsp;&nbsp;&nbsp;&nbsp;{origin_airport_name} ({origin_country_name})<br>
+                    &nbsp;&nbsp;&nbsp;&nbsp;↓<br>
+                    &nbsp;&nbsp;&nbsp;&nbsp;{destination_airport_name} ({destination_country_name})
+                </div>"""
+
+
+def _compile_template(template: str, fields: Tuple[str, ...]) -> Callable[..., str]:
+    """Turn a template with named fields into a positional str.format callable."""
+    for index, field in enumerate(fields):
+        template = template.replace("{" + field + "}", "{" + str(index) + "}")
+    return template.format
+
+
+_render_country_head = _compile_template(
+    COUNTRY_HEAD_TEMPLATE, ("country_name", "flight_count", "flight_word")
+)
+_render_flight = _compile_template(
+    FLIGHT_TEMPLATE,
+    (
+        "call_sign",
+        "flight_id",
+        "origin_airport_name",
+        "origin_country_name",
+        "destination_airport_name",
+        "destination_country_name",
+    ),
+)
 
 
 class HTMLGenerator:
@@ -11,6 +82,7 @@ class HTMLGenerator:
 
     def __init__(self):
         self._css_cache = None
+        self._document_head = None
 
     def _load_css(self) -> str:
         """Load CSS content from file with caching."""
@@ -23,117 +95,77 @@ class HTMLGenerator:
                 self._css_cache = ""
         return self._css_cache
 
-    def _create_flight_html(self, flight_detail: Dict[str, Any]) -> str:
-        """Create HTML for a single flight."""
-        flight_url = f"https://www.flightradar24.com/{flight_detail['call_sign']}/{flight_detail['flight_id']}"
-
-        return f"""
-                <div class="flight-item">
-                    Flight <a href='{flight_url}' target='_blank' class='flight-link'>{flight_detail['call_sign']} (ID: {flight_detail['flight_id']})</a>:<br>
-                    &nbsp;&nbsp;&nbsp;&nbsp;{flight_detail['origin_airport_name']} ({flight_detail['origin_country_name']})<br>
-                    &nbsp;&nbsp;&nbsp;&nbsp;↓<br>
-                    &nbsp;&nbsp;&nbsp;&nbsp;{flight_detail['destination_airport_name']} ({flight_detail['destination_country_name']})
-                </div>"""
+    def _get_document_head(self) -> str:
+        """Get the document head with the CSS inlined, rendered once."""
+        if self._document_head is None:
+            self._document_head = DOCUMENT_HEAD_TEMPLATE.format(css=self._load_css())
+        return self._document_head
 
-    def _create_country_container(
-        self, country_name: str, flight_count: int, flights_html: List[str]
-    ) -> str:
-        """Create HTML container for a country's flights."""
-        flight_word = "flight" if flight_count == 1 else "flights"
-
-        return f"""
-                        <div class="country-container">
-                            <div class="country-header">{country_name}: {flight_count} {flight_word}</div>
-                            <div class="country-flights">
-                                {''.join(flights_html)}
-                            </div>
-                        </div>"""
+    def _create_flight_html(self, flight_detail: FlightDetail) -> str:
+        """Create HTML for a single flight."""
+        origin = flight_detail.origin_airport
+        destination = flight_detail.destination_airport
+        return _render_flight(
+            flight_detail.call_sign,
+            flight_detail.flight_id,
+            origin.name,
+            origin.country_name,
+            destination.name,
+            destination.country_name,
+        )
 
     def _group_flights_by_country(
-        self, flight_details: List[Dict[str, Any]]
-    ) -> List[str]:
-        """Group flights by country and create HTML containers."""
-        containers = []
-        current_country = None
-        country_flights = []
-
+        self, flight_details: Iterable[FlightDetail]
+    ) -> Dict[str, List[FlightDetail]]:
+        """Group flights by tracked country in one pass, keeping first-seen order."""
+        groups: Dict[str, List[FlightDetail]] = {}
         for detail in flight_details:
-            # Check if we've moved to a new country
-            if current_country != detail["country"]:
-                # Process previous country if we have flights
-                if current_country is not None and country_flights:
-                    country_name = detail.get("country_name", "Unknown")
-                    # Get the country name from the previous detail
-                    prev_detail = next(
-                        (d for d in flight_details if d["country"] == current_country),
-                        None,
-                    )
-                    if prev_detail:
-                        country_name = prev_detail["country_name"]
-
-                    container = self._create_country_container(
-                        country_name, len(country_flights), country_flights
-                    )
-                    containers.append(container)
-
-                # Start new country
-                current_country = detail["country"]
-                country_flights = []
-
-            # Add flight to current country
-            flight_html = self._create_flight_html(detail)
-            country_flights.append(flight_html)
-
-        # Handle the last country
-        if current_country is not None and country_flights:
-            # Find the country name from the last detail
-            last_detail = next(
-                (
-                    d
-                    for d in reversed(flight_details)
-                    if d["country"] == current_country
-                ),
-                None,
+            group = groups.get(detail.country)
+            if group is None:
+                group = groups[detail.country] = []
+            group.append(detail)
+        return groups
+
+    def iter_email_html(
+        self, total_flights: int, flight_details: Iterable[FlightDetail]
+    ) -> Iterator[str]:
+        """
+        Render the HTML email body as a stream of fragments.
+
+        Args:
+            total_flights: Total number of flights detected
+            flight_details: Flight details to render, grouped by country
+
+        Yields:
+            str: Consecutive fragments of the HTML document
+        """
+        yield self._get_document_head()
+
+        for country_flights in self._group_flights_by_country(flight_details).values():
+            flight_count = len(country_flights)
+            yield _render_country_head(
+                country_flights[0].country_name,
+                flight_count,
+                format_flight_count(flight_count),
             )
-            country_name = last_detail["country_name"] if last_detail else "Unknown"
+            yield from map(self._create_flight_html, country_flights)
+            yield COUNTRY_TAIL
 
-            container = self._create_country_container(
-                country_name, len(country_flights), country_flights
-            )
-            containers.append(container)
-
-        return containers
+        timestamp = datetime.now().strftime("%A, %B %d, %Y at %I:%M %p")
+        yield DOCUMENT_TAIL_TEMPLATE.format(timestamp=timestamp)
+
+    def write_email_html(
+        self,
+        stream: TextIO,
+        total_flights: int,
+        flight_details: Iterable[FlightDetail],
+    ) -> None:
+        """Render the HTML email body into a text stream such as a file."""
+        for fragment in self.iter_email_html(total_flights, flight_details):
+            stream.write(fragment)
 
     def generate_email_html(
-        self, total_flights: int, flight_details: List[Dict[str, Any]]
+        self, total_flights: int, flight_details: Iterable[FlightDetail]
     ) -> str:
         """Generate complete HTML email body."""
-        css_content = self._load_css()
-        flight_containers = self._group_flights_by_country(flight_details)
-        timestamp = datetime.now().strftime("%A, %B %d, %Y at %I:%M %p")
-
-        return f"""
-            <html>
-            <head>
-                <style>
-                    {css_content}
-                </style>
-            </head>
-            <body>
-                <h2>🛫 Flight Tracking Alert</h2>
-                
-                <div class="flight-list">
-                {''.join(flight_containers)}
-                </div>
-                
-                <div class="timestamp">
-                    <strong>Timestamp:</strong> {timestamp}
-                </div>
-                
-                <div class="footer">
-                    <p><em>This is an automated notification from your flight tracking system.</em></p>
-                    <p><small>Click on any flight link to view it on FlightRadar24</small></p>
-                </div>
-            </body>
-            </html>
-            """
+        return "".join(self.iter_email_html(total_flights, flight_details))
@@ -11,7 +11,10 @@ def main():
     # tracker = FlightTracker(["US", "CA", "GB"])  # Custom override
 
     tracker = FlightTracker()  # Will load from tracked_countries.txt
-    tracker.track_all_flights()
+    try:
+        tracker.track_all_flights()
+    finally:
+        tracker.close()
 
 
 if __name__ == "__main__":
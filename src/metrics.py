@@ -0,0 +1,237 @@
+"""Pipeline metrics with a Prometheus text endpoint and per-cycle JSON logs."""
+
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Metric name -> (Prometheus type, help text)
+METRICS: Dict[str, Tuple[str, str]] = {
+    "flight_tracker_stage_seconds": (
+        "summary",
+        "Time spent in each tracking pipeline stage",
+    ),
+    "flight_tracker_last_stage_seconds": (
+        "gauge",
+        "Duration of each stage in its most recent run",
+    ),
+    "flight_tracker_cycles_total": ("counter", "Tracking cycles completed"),
+    "flight_tracker_feed_flights": ("gauge", "Flights in the latest feed snapshot"),
+    "flight_tracker_feed_zone_failures_total": (
+        "counter",
+        "Feed zones that could not be fetched",
+    ),
+    "flight_tracker_matched_flights": (
+        "gauge",
+        "Flights matched per country in the latest cycle",
+    ),
+    "flight_tracker_updated_flights": (
+        "gauge",
+        "Flights added or changed since the previous cycle",
+    ),
+    "flight_tracker_new_flights": ("gauge", "Flights selected for notification"),
+    "flight_tracker_detail_cache_hit_ratio": (
+        "gauge",
+        "Share of matched flights whose details were reused from the last cycle",
+    ),
+    "flight_tracker_data_cache_hit": (
+        "gauge",
+        "Whether airport and country data was loaded from the compiled cache",
+    ),
+    "flight_tracker_notifications_delivered_total": (
+        "counter",
+        "Notifications delivered per sink",
+    ),
+    "flight_tracker_notifications_failed_total": (
+        "counter",
+        "Notifications that failed permanently per sink",
+    ),
+    "flight_tracker_notifications_pending": (
+        "gauge",
+        "Notifications waiting in each sink's queue",
+    ),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _format_labels(labels: Labels) -> str:
+    """Format labels in the Prometheus text format."""
+    if not labels:
+        return ""
+    pairs = []
+    for name, value in labels:
+        escaped = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{name}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+class MetricsRegistry:
+    """Thread-safe store of counters, gauges and stage timings."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Sample name -> labels -> value
+        self._samples: Dict[str, Dict[Labels, float]] = {}
+
+    @staticmethod
+    def _labels(labels: Dict[str, Any]) -> Labels:
+        """Get a hashable, ordered form of labels."""
+        return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+    def increment(self, name: str, value: float = 1, **labels: Any) -> None:
+        """Add to a counter."""
+        key = self._labels(labels)
+        with self._lock:
+            samples = self._samples.setdefault(name, {})
+            samples[key] = samples.get(key, 0) + value
+
+    def set(self, name: str, value: float, **labels: Any) -> None:
+        """Set a gauge, or a counter tracked elsewhere, to a value."""
+        with self._lock:
+            self._samples.setdefault(name, {})[self._labels(labels)] = value
+
+    def replace(self, name: str, label: str, values: Dict[Any, float]) -> None:
+        """
+        Set a gauge for every value of one label, removing its other series.
+
+        Series of label values that no longer occur would otherwise report
+        their last value forever. The swap is atomic, so a scrape never sees
+        the gauge half updated.
+        """
+        series = {self._labels({label: key}): value for key, value in values.items()}
+        with self._lock:
+            self._samples[name] = series
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        """Add an observation to a summary."""
+        key = self._labels(labels)
+        with self._lock:
+            for suffix, amount in (("_sum", value), ("_count", 1)):
+                samples = self._samples.setdefault(name + suffix, {})
+                samples[key] = samples.get(key, 0) + amount
+
+    def get(self, name: str, **labels: Any) -> Optional[float]:
+        """Get the current value of a sample."""
+        with self._lock:
+            return self._samples.get(name, {}).get(self._labels(labels))
+
+    @contextmanager
+    def time_stage(
+        self, stage: str, durations: Optional[Dict[str, float]] = None
+    ) -> Iterator[None]:
+        """
+        Time a pipeline stage.
+
+        Args:
+            stage: Stage name used as the "stage" label
+            durations: Optional dict that also receives the duration,
+                e.g. to report a whole cycle at once
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            self.observe("flight_tracker_stage_seconds", duration, stage=stage)
+            self.set("flight_tracker_last_stage_seconds", duration, stage=stage)
+            if durations is not None:
+                durations[stage] = durations.get(stage, 0.0) + duration
+
+    def render_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        with self._lock:
+            samples = {name: dict(values) for name, values in self._samples.items()}
+
+        lines: List[str] = []
+        for name, (metric_type, help_text) in METRICS.items():
+            suffixes = ("_sum", "_count") if metric_type == "summary" else ("",)
+            if not any(name + suffix in samples for suffix in suffixes):
+                continue
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for suffix in suffixes:
+                for labels, value in sorted(samples.get(name + suffix, {}).items()):
+                    # repr keeps full precision, unlike the 6 digits of :g
+                    value_text = repr(float(value))
+                    lines.append(f"{name}{suffix}{_format_labels(labels)} {value_text}")
+        return "\n".join(lines) + "\n"
+
+
+# Default registry shared by the tracker and its components
+REGISTRY = MetricsRegistry()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """Serves the registry on /metrics."""
+
+    registry = REGISTRY
+
+    def do_GET(self) -> None:
+        """Respond with the current metrics."""
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.registry.render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Keep scrapes out of the tracking report."""
+
+
+class MetricsServer:
+    """Local HTTP endpoint exposing metrics to Prometheus."""
+
+    def __init__(
+        self,
+        registry: Optional[MetricsRegistry] = None,
+        port: int = 9108,
+        host: str = "127.0.0.1",
+    ):
+        handler = type(
+            "MetricsHandler", (_MetricsHandler,), {"registry": registry or REGISTRY}
+        )
+        self._server = ThreadingHTTPServer((host, port), handler)
+        self._server.daemon_threads = True
+        self.address = self._server.server_address
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Serve metrics from a background thread."""
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="metrics-server", daemon=True
+        )
+        self._thread.start()
+        host, port = self.address[:2]
+        print(f"Serving metrics on http://{host}:{port}/metrics")
+
+    def close(self) -> None:
+        """Stop serving metrics."""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+
+def write_json_log(record: Dict[str, Any], path: str) -> None:
+    """Write a record as one JSON line to a file, or to stdout for "-"."""
+    record = {"timestamp": datetime.now().isoformat(), **record}
+    line = json.dumps(record, default=str) + "\n"
+    try:
+        if path == "-":
+            sys.stdout.write(line)
+            sys.stdout.flush()
+        else:
+            with open(path, "a", encoding="utf-8") as file:
+                file.write(line)
+    except OSError as e:
+        print(f"Error writing metrics log to {path}: {e}")
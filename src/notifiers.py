@@ -0,0 +1,235 @@
+"""Pluggable notification sinks for detected flights."""
+
+import json
+import sys
+from abc import ABC, abstractmethod
+import time
+import urllib.request
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from .config import Config
+from .dispatch_queue import DispatchQueue, PermanentDispatchError
+from .email_service import EmailService
+from .flight_detail import FlightDetail
+
+
+def serialize_notification(
+    total_flights: int, flight_details: List[FlightDetail]
+) -> Dict[str, Any]:
+    """Convert a notification to JSON-compatible data."""
+    return {
+        "total_flights": total_flights,
+        "flight_details": [detail.to_dict() for detail in flight_details],
+    }
+
+
+class Notifier(ABC):
+    """Base class for notification sinks."""
+
+    name = "notifier"
+
+    def __init__(self, timeout: Optional[float] = None):
+        self.timeout = timeout or Config.NOTIFIER_TIMEOUT
+
+    @abstractmethod
+    def notify(self, total_flights: int, flight_details: List[FlightDetail]) -> None:
+        """Deliver a notification, raising on failure so it can be retried."""
+
+    def is_configured(self) -> bool:
+        """Check whether the sink can deliver at all, printing what is missing."""
+        return True
+
+    def close(self) -> None:
+        """Release resources held by the sink."""
+
+
+class EmailNotifier(Notifier):
+    """Sends the HTML email notification."""
+
+    name = "email"
+
+    def __init__(
+        self,
+        email_service: Optional[EmailService] = None,
+        timeout: Optional[float] = None,
+    ):
+        super().__init__(timeout)
+        self.email_service = email_service or EmailService(timeout=self.timeout)
+
+    def is_configured(self) -> bool:
+        """Check that the Gmail credentials and recipients are set."""
+        missing_vars = self.email_service.get_missing_config()
+        if missing_vars:
+            print("Gmail credentials missing - email notifications disabled")
+            print(f"Required environment variables: {', '.join(missing_vars)}")
+            return False
+        return True
+
+    def notify(self, total_flights: int, flight_details: List[FlightDetail]) -> None:
+        """Send the HTML email, raising if email is not configured."""
+        sent = self.email_service.deliver(total_flights, flight_details)
+        # deliver only skips a notification with flights when credentials or
+        # recipients are missing, which retrying cannot fix
+        if not sent and total_flights:
+            raise PermanentDispatchError(
+                "Email is not configured - notification not sent"
+            )
+
+    def close(self) -> None:
+        """Close the SMTP session."""
+        self.email_service.close()
+
+
+class WebhookNotifier(Notifier):
+    """POSTs the notification as JSON to a webhook URL."""
+
+    name = "webhook"
+
+    def __init__(self, url: Optional[str] = None, timeout: Optional[float] = None):
+        super().__init__(timeout)
+        self.url = url or Config.WEBHOOK_URL
+        if not self.url:
+            raise ValueError("Webhook notifier requires a URL (WEBHOOK_URL)")
+
+    def notify(self, total_flights: int, flight_details: List[FlightDetail]) -> None:
+        """POST the notification to the webhook."""
+        payload = serialize_notification(total_flights, flight_details)
+        payload["generated_at"] = datetime.now().isoformat()
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps(payload).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        # urlopen raises HTTPError for error responses, so they are retried
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+        print(f"✅ Webhook notification posted to {self.url}")
+
+
+class JsonLinesNotifier(Notifier):
+    """Writes one JSON object per flight to a file, or to stdout for "-"."""
+
+    name = "jsonl"
+
+    def __init__(self, path: Optional[str] = None, timeout: Optional[float] = None):
+        super().__init__(timeout)
+        self.path = path or Config.JSONL_PATH
+
+    def notify(self, total_flights: int, flight_details: List[FlightDetail]) -> None:
+        """Append the flights as JSON lines."""
+        notified_at = datetime.now().isoformat()
+        lines = []
+        for detail in flight_details:
+            record = detail.to_dict()
+            record["notified_at"] = notified_at
+            lines.append(json.dumps(record, default=str) + "\n")
+
+        if self.path == "-":
+            sys.stdout.writelines(lines)
+            sys.stdout.flush()
+        else:
+            with open(self.path, "a", encoding="utf-8") as file:
+                file.writelines(lines)
+
+
+class NullNotifier(Notifier):
+    """Discards notifications, e.g. for dry runs."""
+
+    name = "null"
+
+    def notify(self, total_flights: int, flight_details: List[FlightDetail]) -> None:
+        """Drop the notification."""
+        print(f"Notifications disabled - {total_flights} flights not sent")
+
+
+NOTIFIER_TYPES = {
+    notifier.name: notifier
+    for notifier in (EmailNotifier, WebhookNotifier, JsonLinesNotifier, NullNotifier)
+}
+
+
+def create_notifiers(names: Optional[List[str]] = None) -> List[Notifier]:
+    """Create notifiers by name, defaulting to Config.NOTIFIERS."""
+    notifiers = []
+    for name in names or Config.NOTIFIERS:
+        notifier_type = NOTIFIER_TYPES.get(name.strip().lower())
+        if notifier_type is None:
+            raise ValueError(
+                f"Unknown notifier '{name}', choose from: {', '.join(NOTIFIER_TYPES)}"
+            )
+        notifiers.append(notifier_type())
+    return notifiers
+
+
+def configured_notifiers(notifiers: List[Notifier]) -> List[Notifier]:
+    """
+    Drop the sinks that can never deliver, e.g. email without credentials.
+
+    Falls back to the null sink when no sink is left, so skipped
+    notifications are still reported.
+    """
+    configured = [notifier for notifier in notifiers if notifier.is_configured()]
+    return configured or [NullNotifier()]
+
+
+class NotificationDispatcher:
+    """Fans notifications out to several sinks, each on its own worker."""
+
+    def __init__(self, notifiers: List[Notifier]):
+        self.notifiers = notifiers
+        # A slow or failing sink only backs up its own queue
+        self._queues = [
+            DispatchQueue(
+                notifier.name,
+                self._make_handler(notifier),
+                self._serialize_job,
+            )
+            for notifier in notifiers
+        ]
+
+    @staticmethod
+    def _make_handler(notifier: Notifier) -> Callable[[Any], None]:
+        """Create the queue handler delivering jobs to a notifier."""
+
+        def handle(job: Tuple[int, List[FlightDetail]]) -> None:
+            total_flights, flight_details = job
+            notifier.notify(total_flights, flight_details)
+
+        return handle
+
+    @staticmethod
+    def _serialize_job(job: Tuple[int, List[FlightDetail]]) -> Dict[str, Any]:
+        """Convert a queued job to JSON-compatible data for dead letters."""
+        total_flights, flight_details = job
+        return serialize_notification(total_flights, flight_details)
+
+    def get_names(self) -> List[str]:
+        """Get the names of the configured sinks."""
+        return [notifier.name for notifier in self.notifiers]
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        """Get delivery counts and queue depth for every sink."""
+        return [
+            {
+                "sink": dispatch_queue.name,
+                "delivered": dispatch_queue.delivered,
+                "failed": dispatch_queue.failed,
+                "pending": dispatch_queue.pending(),
+            }
+            for dispatch_queue in self._queues
+        ]
+
+    def dispatch(self, total_flights: int, flight_details: List[FlightDetail]) -> None:
+        """Queue a notification on every sink without waiting for delivery."""
+        for dispatch_queue in self._queues:
+            dispatch_queue.submit((total_flights, flight_details))
+
+    def close(self) -> None:
+        """Drain all sink queues, then release the sinks."""
+        # Queues drain in parallel, so they share a single deadline
+        deadline = time.monotonic() + Config.DISPATCH_DRAIN_TIMEOUT
+        for dispatch_queue in self._queues:
+            dispatch_queue.close(max(0.0, deadline - time.monotonic()))
+        for notifier in self.notifiers:
+            notifier.close()
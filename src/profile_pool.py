@@ -0,0 +1,269 @@
+"""Process-pool evaluation of tracking profiles over a shared-memory snapshot."""
+
+import multiprocessing
+import sys
+from array import array
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Dict, List, Optional, Tuple
+from .data_loader import DataLoader
+from .filter_rules import FilterRule
+from .flight_detail import FlightDetail
+from .profiles import Profile, ProfileSet
+
+# int32 columns of the shared snapshot, one row per flight detail, followed
+# by a float64 column of altitudes in feet with NaN where unknown
+INT_COLUMNS = (
+    "country",
+    "flight_row",
+    "origin_airport_iata",
+    "destination_airport_iata",
+    "callsign",
+    "aircraft_code",
+)
+# (countries, filter rule lines) of one profile, as sent to the workers
+ProfileSpec = Tuple[List[str], List[str]]
+# (shared memory name, row count, string vocabulary, shard)
+ShardJob = Tuple[str, int, List[Optional[str]], int]
+
+
+def _float_offset(row_count: int) -> int:
+    """Get the byte offset of the float column, aligned to 8 bytes."""
+    offset = 4 * len(INT_COLUMNS) * row_count
+    return (offset + 7) & ~7
+
+
+class _RowFlight:
+    """Flight attributes of a snapshot row, as read by filter rules."""
+
+    __slots__ = (
+        "origin_airport_iata",
+        "destination_airport_iata",
+        "callsign",
+        "aircraft_code",
+        "altitude",
+    )
+
+
+# Worker state, set once per process by _init_worker
+_worker_specs: List[ProfileSpec] = []
+_worker_countries: List[str] = []
+_worker_shard_count = 1
+_worker_shards: Dict[int, Tuple[List[int], ProfileSet, bool]] = {}
+_worker_data_loader: Optional[DataLoader] = None
+
+
+def _init_worker(
+    specs: List[ProfileSpec], country_codes: List[str], shard_count: int
+) -> None:
+    """Receive the profile definitions, compiled lazily per shard."""
+    global _worker_specs, _worker_countries, _worker_shard_count
+    global _worker_data_loader
+    _worker_specs = specs
+    _worker_countries = country_codes
+    _worker_shard_count = shard_count
+    _worker_shards.clear()
+    _worker_data_loader = DataLoader()
+
+
+def _get_shard(shard: int) -> Tuple[List[int], ProfileSet, bool]:
+    """Compile the profiles of a shard into a ProfileSet without notifiers."""
+    compiled = _worker_shards.get(shard)
+    if compiled is None:
+        data_loader = _worker_data_loader
+        indices = list(range(shard, len(_worker_specs), _worker_shard_count))
+        profiles = []
+        for index in indices:
+            countries, rule_lines = _worker_specs[index]
+            rules = [FilterRule.parse(line, data_loader) for line in rule_lines]
+            profiles.append(Profile(str(index), countries, rules, []))
+        has_rules = any(profile.rules for profile in profiles)
+        compiled = (indices, ProfileSet(profiles, data_loader), has_rules)
+        _worker_shards[shard] = compiled
+    return compiled
+
+
+def _read_snapshot(
+    name: str, row_count: int
+) -> Tuple[Dict[str, List[int]], List[float]]:
+    """Read the columns of a shared snapshot."""
+    shared_memory = SharedMemory(name)
+    try:
+        int_columns = {}
+        for position, column in enumerate(INT_COLUMNS):
+            start = 4 * position * row_count
+            view = shared_memory.buf[start : start + 4 * row_count].cast("i")
+            int_columns[column] = view.tolist()
+            view.release()
+        start = _float_offset(row_count)
+        view = shared_memory.buf[start : start + 8 * row_count].cast("d")
+        altitudes = view.tolist()
+        view.release()
+    finally:
+        shared_memory.close()
+    return int_columns, altitudes
+
+
+def _assign_shard(job: ShardJob) -> List[Tuple[int, bytes]]:
+    """
+    Assign the shared snapshot's rows to one shard of profiles.
+
+    Returns:
+        (profile index, int32 row indices) for every profile with matches
+    """
+    name, row_count, vocabulary, shard = job
+    indices, profile_set, has_rules = _get_shard(shard)
+    int_columns, altitudes = _read_snapshot(name, row_count)
+
+    country_codes = _worker_countries
+    countries = [
+        country_codes[country] if country >= 0 else None
+        for country in int_columns["country"]
+    ]
+    flight_rows = int_columns["flight_row"]
+    # Rules need the flight attributes, once per flight
+    flights = {}
+    if has_rules:
+        for row, flight_row in enumerate(flight_rows):
+            if flight_row != row:
+                continue
+            flight = _RowFlight()
+            for column in INT_COLUMNS[2:]:
+                setattr(flight, column, vocabulary[int_columns[column][row]])
+            altitude = altitudes[row]
+            flight.altitude = None if altitude != altitude else altitude
+            flights[row] = flight
+
+    results = []
+    assigned_rows = profile_set.assign_rows(flight_rows, countries, flights)
+    for index, rows in zip(indices, assigned_rows):
+        if rows:
+            results.append((index, array("i", rows).tobytes()))
+    return results
+
+
+class ProfilePool:
+    """
+    Splits profile assignment across worker processes.
+
+    Each cycle's updated flights are written once to a shared-memory block
+    of int32 and float64 columns, with strings replaced by ids into a small
+    vocabulary. Every worker evaluates a shard of the profiles against it
+    and returns only row indices, so no flight is pickled either way.
+
+    Workers start on creation, with the platform's default start method
+    unless one is given. Forked workers must be created before this process
+    starts any thread.
+    """
+
+    def __init__(
+        self, profiles: ProfileSet, workers: int, start_method: Optional[str] = None
+    ):
+        self.profiles = profiles
+        self.workers = max(1, workers)
+        # Countries are sent as positions in the list the workers receive
+        country_codes = profiles.get_countries()
+        self._country_ids = {
+            country_code: position
+            for position, country_code in enumerate(country_codes)
+        }
+        specs = [
+            (profile.countries, [rule.source for rule in profile.rules])
+            for profile in profiles.profiles
+        ]
+        self._shard_count = min(self.workers, len(profiles)) or 1
+        if sys.platform != "win32":
+            # Workers must share the tracker of the blocks created here,
+            # or each would report them as leaked when it exits
+            resource_tracker.ensure_running()
+        context = multiprocessing.get_context(start_method)
+        self._pool = context.Pool(
+            self.workers, _init_worker, (specs, country_codes, self._shard_count)
+        )
+
+    def _write_snapshot(
+        self, flight_details: List[FlightDetail], flights_by_id: Dict[str, Any]
+    ) -> Tuple[SharedMemory, List[Optional[str]]]:
+        """Write the flights' rule and country columns to shared memory."""
+        row_count = len(flight_details)
+        flight_ids = [str(detail.flight_id) for detail in flight_details]
+        first_rows: Dict[str, int] = {}
+        country_ids = self._country_ids
+        int_columns = {
+            "country": array(
+                "i", [country_ids.get(detail.country, -1) for detail in flight_details]
+            ),
+            "flight_row": array(
+                "i",
+                [
+                    first_rows.setdefault(flight_id, row)
+                    for row, flight_id in enumerate(flight_ids)
+                ],
+            ),
+        }
+
+        # Strings become ids into one vocabulary shared by all string columns
+        flights = [flights_by_id.get(flight_id) for flight_id in flight_ids]
+        vocabulary_ids: Dict[Optional[str], int] = {None: 0}
+        for column in INT_COLUMNS[2:]:
+            values = [getattr(flight, column, None) for flight in flights]
+            if column == "callsign":
+                # Rules only look at the airline prefix
+                values = [str(value)[:3] if value else None for value in values]
+            int_columns[column] = array(
+                "i",
+                [
+                    vocabulary_ids.setdefault(
+                        value if value is None else str(value), len(vocabulary_ids)
+                    )
+                    for value in values
+                ],
+            )
+        vocabulary = list(vocabulary_ids)
+
+        altitudes = array("d")
+        for flight in flights:
+            try:
+                altitudes.append(float(getattr(flight, "altitude", None)))
+            except (TypeError, ValueError):
+                altitudes.append(float("nan"))
+
+        float_offset = _float_offset(row_count)
+        shared_memory = SharedMemory(create=True, size=float_offset + 8 * row_count)
+        for position, column in enumerate(INT_COLUMNS):
+            start = 4 * position * row_count
+            column_bytes = int_columns[column].tobytes()
+            shared_memory.buf[start : start + len(column_bytes)] = column_bytes
+        altitude_bytes = altitudes.tobytes()
+        shared_memory.buf[float_offset : float_offset + len(altitude_bytes)] = (
+            altitude_bytes
+        )
+        return shared_memory, vocabulary
+
+    def assign(
+        self, flight_details: List[FlightDetail], flights_by_id: Dict[str, Any]
+    ) -> List[List[FlightDetail]]:
+        """Split matched flight details between the profiles, like ProfileSet.assign."""
+        assigned: List[List[FlightDetail]] = [[] for _ in self.profiles.profiles]
+        if not flight_details:
+            return assigned
+
+        shared_memory, vocabulary = self._write_snapshot(flight_details, flights_by_id)
+        try:
+            jobs = [
+                (shared_memory.name, len(flight_details), vocabulary, shard)
+                for shard in range(self._shard_count)
+            ]
+            for results in self._pool.imap_unordered(_assign_shard, jobs):
+                for index, row_bytes in results:
+                    rows = array("i", row_bytes)
+                    assigned[index] = [flight_details[row] for row in rows]
+        finally:
+            shared_memory.close()
+            shared_memory.unlink()
+        return assigned
+
+    def close(self) -> None:
+        """Stop the worker processes."""
+        self._pool.close()
+        self._pool.join()
@@ -0,0 +1,282 @@
+"""Tracking profiles: several country lists, filters and recipients on one feed."""
+
+import json
+from typing import Any, Dict, List, Optional
+from .config import Config
+from .data_loader import DataLoader
+from .digest import DigestBuffer
+from .email_service import EmailService
+from .filter_rules import FilterRule, FilterRules
+from .flight_detail import FlightDetail
+from .notifiers import (
+    EmailNotifier,
+    JsonLinesNotifier,
+    NOTIFIER_TYPES,
+    Notifier,
+    NotificationDispatcher,
+    NullNotifier,
+    WebhookNotifier,
+    configured_notifiers,
+)
+from .smtp_connection import SMTPConnectionManager
+
+
+class Profile:
+    """One set of tracked countries, filter rules and notification sinks."""
+
+    def __init__(
+        self,
+        name: str,
+        countries: List[str],
+        rules: List[FilterRule],
+        notifiers: List[Notifier],
+    ):
+        self.name = name
+        self.countries = countries
+        self.rules = rules
+        self.dispatcher = NotificationDispatcher(notifiers)
+        self.digest: Optional[DigestBuffer] = (
+            DigestBuffer() if Config.DIGEST_WINDOW_SECONDS > 0 else None
+        )
+
+
+class ProfileSet:
+    """
+    Profiles compiled for a single pass over each feed snapshot.
+
+    Countries map to the profiles tracking them and every profile's rules
+    share one rule table, so assigning a flight costs one rule lookup plus
+    one step per profile it goes to, however many profiles there are.
+    """
+
+    def __init__(self, profiles: List[Profile], data_loader: DataLoader):
+        self.profiles = profiles
+        # Country code -> indices of the profiles tracking it
+        self._country_profiles: Dict[str, List[int]] = {}
+        for index, profile in enumerate(profiles):
+            for country_code in profile.countries:
+                self._country_profiles.setdefault(country_code, []).append(index)
+
+        # Bit i of a rule mask is rules[i], which belongs to _rule_profiles[i]
+        rules: List[FilterRule] = []
+        self._rule_profiles: List[int] = []
+        for index, profile in enumerate(profiles):
+            rules.extend(profile.rules)
+            self._rule_profiles.extend([index] * len(profile.rules))
+        self._rules = FilterRules(rules, data_loader) if rules else None
+        self._include_mask = sum(
+            1 << position
+            for position, rule in enumerate(rules)
+            if rule.action == "include"
+        )
+
+        # Exclusions only apply to their own profile, so the shared matching
+        # pass only needs the include rules to let extra flights through
+        include_rules = [rule for rule in rules if rule.action == "include"]
+        self.include_rules: Optional[FilterRules] = (
+            FilterRules(include_rules, data_loader) if include_rules else None
+        )
+
+    def __len__(self) -> int:
+        return len(self.profiles)
+
+    def get_countries(self) -> List[str]:
+        """Get every profile's countries, in order and without duplicates."""
+        return list(self._country_profiles)
+
+    def assign(
+        self, flight_details: List[FlightDetail], flights_by_id: Dict[str, Any]
+    ) -> List[List[FlightDetail]]:
+        """
+        Split matched flight details between the profiles.
+
+        A flight goes to every profile tracking one of its countries or with
+        an include rule matching it, unless one of that profile's exclude
+        rules matches it.
+
+        Args:
+            flight_details: Details of the flights matched in this cycle
+            flights_by_id: Matched flights by flight id, for rule evaluation
+
+        Returns:
+            One list of flight details per profile, in profile order
+        """
+        assigned_rows = self.assign_rows(
+            [str(detail.flight_id) for detail in flight_details],
+            [detail.country for detail in flight_details],
+            flights_by_id,
+        )
+        return [[flight_details[row] for row in rows] for rows in assigned_rows]
+
+    def assign_rows(
+        self,
+        flight_keys: List[Any],
+        countries: List[Optional[str]],
+        flights: Dict[Any, Any],
+    ) -> List[List[int]]:
+        """
+        Split matched flights between the profiles, given as columns.
+
+        Args:
+            flight_keys: Flight of each row, rows of one flight share a key
+            countries: Country each row was matched for
+            flights: Flight attributes by key, for rule evaluation
+
+        Returns:
+            One list of row indices per profile, in profile order
+        """
+        assigned: List[List[int]] = [[] for _ in self.profiles]
+        country_profiles = self._country_profiles
+        rule_profiles = self._rule_profiles
+
+        # A flight matching several countries has one row per country
+        flight_groups: Dict[Any, List[int]] = {}
+        for row, flight_key in enumerate(flight_keys):
+            flight_groups.setdefault(flight_key, []).append(row)
+
+        for flight_key, rows in flight_groups.items():
+            included = excluded = ()
+            flight = flights.get(flight_key)
+            if self._rules is not None and flight is not None:
+                mask = self._rules.match(flight)
+                included, excluded = set(), set()
+                while mask:
+                    bit = mask & -mask
+                    profile_index = rule_profiles[bit.bit_length() - 1]
+                    if bit & self._include_mask:
+                        included.add(profile_index)
+                    else:
+                        excluded.add(profile_index)
+                    mask ^= bit
+
+            served = set()
+            for row in rows:
+                for profile_index in country_profiles.get(countries[row], ()):
+                    if profile_index not in excluded:
+                        assigned[profile_index].append(row)
+                        served.add(profile_index)
+            # Profiles only including the flight by rule get it once
+            for profile_index in included:
+                if profile_index not in excluded and profile_index not in served:
+                    assigned[profile_index].append(rows[0])
+
+        return assigned
+
+    def close(self) -> None:
+        """Drain and release every profile's notification sinks."""
+        for profile in self.profiles:
+            profile.dispatcher.close()
+
+
+def _parse_countries(
+    data_loader: DataLoader, profile_name: str, countries: List[str]
+) -> List[str]:
+    """Convert country codes or names to codes."""
+    known_codes = data_loader.get_all_country_codes()
+    country_codes = []
+    for country in countries:
+        country_code = (
+            country.upper()
+            if country.upper() in known_codes
+            else data_loader.get_country_code(country)
+        )
+        if not country_code:
+            raise ValueError(f"Profile '{profile_name}': unknown country '{country}'")
+        if country_code not in country_codes:
+            country_codes.append(country_code)
+    return country_codes
+
+
+def _create_profile_notifiers(
+    entry: Dict[str, Any], profile_name: str, smtp: SMTPConnectionManager
+) -> List[Notifier]:
+    """Create a profile's notification sinks."""
+    notifiers: List[Notifier] = []
+    for name in entry.get("notifiers", ["email"]):
+        name = name.strip().lower()
+        if name == EmailNotifier.name:
+            recipients = entry.get("recipients") or []
+            if not recipients:
+                raise ValueError(f"Profile '{profile_name}': email needs recipients")
+            notifiers.append(
+                EmailNotifier(EmailService(recipients=recipients, smtp=smtp))
+            )
+        elif name == WebhookNotifier.name:
+            notifiers.append(WebhookNotifier(entry.get("webhook_url")))
+        elif name == JsonLinesNotifier.name:
+            notifiers.append(JsonLinesNotifier(entry.get("jsonl_path")))
+        elif name in NOTIFIER_TYPES:
+            notifiers.append(NOTIFIER_TYPES[name]())
+        else:
+            raise ValueError(
+                f"Profile '{profile_name}': unknown notifier '{name}', "
+                f"choose from: {', '.join(NOTIFIER_TYPES)}"
+            )
+    return configured_notifiers(notifiers)
+
+
+def load_profiles(
+    data_loader: DataLoader, filename: Optional[str] = None, dry_run: bool = False
+) -> Optional[ProfileSet]:
+    """
+    Load tracking profiles from a JSON file.
+
+    The file holds {"profiles": [...]}, each profile with a "name", a list
+    of "countries" (codes or names) and optionally "rules" in the filter
+    rule syntax, "recipients", "notifiers" (default ["email"]),
+    "webhook_url" and "jsonl_path". Email profiles share one SMTP session.
+
+    Args:
+        data_loader: Airport and country data
+        filename: Profile file, defaults to Config.PROFILES_FILE
+        dry_run: Discard notifications instead of sending them
+
+    Returns:
+        ProfileSet, or None if the file is missing
+
+    Raises:
+        ValueError: If a profile is invalid
+    """
+    if filename is None:
+        filename = Config.PROFILES_FILE
+
+    try:
+        with open(filename, "r", encoding="utf-8") as file:
+            entries = json.load(file).get("profiles", [])
+    except FileNotFoundError:
+        return None
+    except (AttributeError, json.JSONDecodeError) as e:
+        raise ValueError(f"Invalid profile file {filename}: {e}")
+    if not entries:
+        raise ValueError(f"No profiles defined in {filename}")
+
+    smtp = SMTPConnectionManager(
+        username=Config.GMAIL_EMAIL, password=Config.GMAIL_APP_PASSWORD
+    )
+    profiles = []
+    names = set()
+    for position, entry in enumerate(entries, 1):
+        name = str(entry.get("name") or f"profile-{position}")
+        if name in names:
+            raise ValueError(f"Duplicate profile name '{name}'")
+        names.add(name)
+
+        countries = _parse_countries(data_loader, name, entry.get("countries", []))
+        rules = []
+        for line in entry.get("rules", []):
+            try:
+                rules.append(FilterRule.parse(line, data_loader))
+            except ValueError as e:
+                raise ValueError(f"Profile '{name}': invalid rule '{line}': {e}")
+        if not countries and not any(rule.action == "include" for rule in rules):
+            raise ValueError(f"Profile '{name}' has no countries or include rules")
+
+        notifiers = (
+            [NullNotifier()]
+            if dry_run
+            else _create_profile_notifiers(entry, name, smtp)
+        )
+        profiles.append(Profile(name, countries, rules, notifiers))
+
+    print(f"Loaded {len(profiles)} tracking profiles from {filename}")
+    return ProfileSet(profiles, data_loader)
@@ -0,0 +1,187 @@
+"""Recording of flight feed snapshots and offline replay through a stand-in API."""
+
+import glob
+import gzip
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from .dispatch_queue import DispatchQueue
+
+SNAPSHOT_PREFIX = "snapshot-"
+SNAPSHOT_EXTENSION = ".json.gz"
+
+# Flight attributes kept in recorded snapshots
+SNAPSHOT_FIELDS = (
+    "id",
+    "icao_24bit",
+    "latitude",
+    "longitude",
+    "heading",
+    "altitude",
+    "ground_speed",
+    "squawk",
+    "aircraft_code",
+    "registration",
+    "time",
+    "origin_airport_iata",
+    "destination_airport_iata",
+    "number",
+    "airline_iata",
+    "on_ground",
+    "vertical_speed",
+    "callsign",
+    "airline_icao",
+)
+
+
+class FeedRecorder:
+    """Saves every fetched feed snapshot as a compressed file in the background."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._queue = DispatchQueue("record", self._write_snapshot, self._serialize_job)
+        self.recorded = 0
+
+    @staticmethod
+    def _serialize_job(job: Tuple[float, List[Any]]) -> Dict[str, Any]:
+        """Describe a snapshot that could not be saved, without its flights."""
+        fetched_at, flights = job
+        return {"fetched_at": fetched_at, "flight_count": len(flights)}
+
+    def record(self, flights: List[Any], fetched_at: Optional[float] = None) -> None:
+        """Queue a fetched snapshot for saving."""
+        if fetched_at is None:
+            fetched_at = time.time()
+        self._queue.submit((fetched_at, flights))
+
+    def _write_snapshot(self, job: Tuple[float, List[Any]]) -> None:
+        """Write a snapshot as field names plus one value array per flight."""
+        fetched_at, flights = job
+        snapshot = {
+            "fetched_at": fetched_at,
+            "fields": SNAPSHOT_FIELDS,
+            "flights": [
+                [getattr(flight, field, None) for field in SNAPSHOT_FIELDS]
+                for flight in flights
+            ],
+        }
+        os.makedirs(self.directory, exist_ok=True)
+        filename = f"{SNAPSHOT_PREFIX}{int(fetched_at * 1000)}{SNAPSHOT_EXTENSION}"
+        path = os.path.join(self.directory, filename)
+        # Write to a temporary file first so replays never see partial snapshots
+        temp_path = f"{path}.tmp"
+        with gzip.open(temp_path, "wt", encoding="utf-8", compresslevel=6) as file:
+            json.dump(snapshot, file, separators=(",", ":"), default=str)
+        os.replace(temp_path, path)
+        self.recorded += 1
+
+    def close(self) -> None:
+        """Wait for queued snapshots to be saved."""
+        self._queue.close()
+
+
+class ReplayFlight:
+    """A flight restored from a recorded snapshot."""
+
+    __slots__ = SNAPSHOT_FIELDS
+
+    def __init__(self, fields: List[str], values: List[Any]):
+        for field in SNAPSHOT_FIELDS:
+            setattr(self, field, None)
+        for field, value in zip(fields, values):
+            if field in SNAPSHOT_FIELDS:
+                setattr(self, field, value)
+
+
+class ReplayFlightRadar24API:
+    """Stand-in for FlightRadar24API serving recorded snapshots in order."""
+
+    def __init__(self, directory: str, speed: float = 1.0):
+        self.directory = directory
+        # 0 replays snapshots back to back without waiting
+        self.speed = max(0.0, speed)
+        pattern = os.path.join(directory, f"{SNAPSHOT_PREFIX}*{SNAPSHOT_EXTENSION}")
+        self._paths = sorted(glob.glob(pattern))
+        if not self._paths:
+            raise ValueError(f"No recorded snapshots found in {directory}")
+        self._position = 0
+        self._fetched_at, self._flights = self._load(self._paths[0])
+
+    @staticmethod
+    def _load(path: str) -> Tuple[float, List[ReplayFlight]]:
+        """Load a recorded snapshot."""
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            snapshot = json.load(file)
+        fields = snapshot["fields"]
+        flights = [ReplayFlight(fields, values) for values in snapshot["flights"]]
+        return snapshot["fetched_at"], flights
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    @property
+    def position(self) -> int:
+        """Index of the snapshot currently served."""
+        return self._position
+
+    @property
+    def fetched_at(self) -> float:
+        """Time the snapshot currently served was originally fetched."""
+        return self._fetched_at
+
+    def advance(self) -> Optional[float]:
+        """
+        Move on to the next recorded snapshot.
+
+        Returns:
+            Seconds to wait before fetching it, scaled by the replay speed,
+            or None when the recording is exhausted
+        """
+        if self._position + 1 >= len(self._paths):
+            return None
+        self._position += 1
+        previous_fetched_at = self._fetched_at
+        self._fetched_at, self._flights = self._load(self._paths[self._position])
+        if not self.speed:
+            return 0.0
+        return max(0.0, self._fetched_at - previous_fetched_at) / self.speed
+
+    @staticmethod
+    def _in_bounds(flight: ReplayFlight, bounds: Tuple[float, ...]) -> bool:
+        """Check whether a flight lies within "north,south,west,east" bounds."""
+        north, south, west, east = bounds
+        try:
+            return (
+                south <= flight.latitude <= north and west <= flight.longitude <= east
+            )
+        except TypeError:
+            return False
+
+    def get_flights(
+        self,
+        airline: Optional[str] = None,
+        bounds: Optional[str] = None,
+        registration: Optional[str] = None,
+        aircraft_type: Optional[str] = None,
+        *,
+        details: bool = False,
+    ) -> List[ReplayFlight]:
+        """Get the flights of the current snapshot, filtered like the live API."""
+        flights = self._flights
+        if bounds:
+            parsed_bounds = tuple(float(value) for value in bounds.split(","))
+            flights = [
+                flight for flight in flights if self._in_bounds(flight, parsed_bounds)
+            ]
+        if airline:
+            flights = [flight for flight in flights if flight.airline_icao == airline]
+        if registration:
+            flights = [
+                flight for flight in flights if flight.registration == registration
+            ]
+        if aircraft_type:
+            flights = [
+                flight for flight in flights if flight.aircraft_code == aircraft_type
+            ]
+        return flights
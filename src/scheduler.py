@@ -0,0 +1,90 @@
+"""Polling scheduler for running the flight tracker as a daemon."""
+
+import random
+import signal
+import threading
+import time
+from typing import Callable, Optional, Tuple
+
+
+class PollingScheduler:
+    """Runs a task on a fixed interval until it is asked to stop."""
+
+    def __init__(self, interval: float, jitter: float = 0.0):
+        if interval <= 0:
+            raise ValueError("Polling interval must be positive")
+        self.interval = interval
+        self.jitter = max(0.0, jitter)
+        self._stop_event = threading.Event()
+
+    def install_signal_handlers(self) -> None:
+        """Stop the scheduler cleanly on SIGTERM and SIGINT."""
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, self._handle_signal)
+
+    def _handle_signal(self, signum, frame) -> None:
+        """Signal handler requesting a clean shutdown."""
+        print(f"Received signal {signum}, shutting down")
+        self.stop()
+
+    def stop(self) -> None:
+        """Request the scheduler to stop after the current cycle."""
+        self._stop_event.set()
+
+    def is_stopped(self) -> bool:
+        """Check whether a stop has been requested."""
+        return self._stop_event.is_set()
+
+    def _next_delay(self, start: float, tick: int) -> Tuple[float, int]:
+        """
+        Compute the delay until the next scheduled tick.
+
+        Ticks are anchored to the start time rather than to the end of the
+        previous cycle, so slow cycles do not accumulate drift. Ticks missed
+        because a cycle overran the interval are skipped, not queued up.
+
+        Returns:
+            tuple: (delay in seconds, index of the next tick)
+        """
+        now = time.monotonic()
+        next_tick = start + tick * self.interval
+        if now > next_tick:
+            missed = int((now - next_tick) // self.interval) + 1
+            print(f"Tracking cycle overran the interval, skipping {missed} tick(s)")
+            tick += missed
+            next_tick = start + tick * self.interval
+
+        delay = next_tick - now
+        if self.jitter:
+            delay += random.uniform(0, self.jitter)
+        return delay, tick
+
+    def run(self, task: Callable[[], None], max_cycles: Optional[int] = None) -> int:
+        """
+        Run the task every interval until stopped.
+
+        Args:
+            task: Callable executed once per cycle
+            max_cycles: Optional number of cycles after which to stop
+
+        Returns:
+            int: Number of cycles that were run
+        """
+        start = time.monotonic()
+        tick = 0
+        cycles = 0
+
+        while not self._stop_event.is_set():
+            try:
+                task()
+            except Exception as e:
+                print(f"Error during tracking cycle: {e}")
+            cycles += 1
+
+            if max_cycles is not None and cycles >= max_cycles:
+                break
+
+            delay, tick = self._next_delay(start, tick + 1)
+            self._stop_event.wait(delay)
+
+        return cycles
@@ -0,0 +1,108 @@
+"""Reusable SMTP sessions for sending notifications."""
+
+import smtplib
+import threading
+import time
+from email.message import Message
+from typing import List, Optional
+from .config import Config
+
+
+class SMTPConnectionManager:
+    """Keeps an authenticated SMTP session open between sends."""
+
+    def __init__(
+        self,
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        use_tls: bool = True,
+        idle_timeout: Optional[float] = None,
+        timeout: Optional[float] = None,
+    ):
+        self.host = host or Config.SMTP_SERVER
+        self.port = port or Config.SMTP_PORT
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.idle_timeout = (
+            idle_timeout if idle_timeout is not None else Config.SMTP_IDLE_TIMEOUT
+        )
+        self.timeout = timeout or Config.SMTP_TIMEOUT
+        self._server: Optional[smtplib.SMTP] = None
+        self._last_used = 0.0
+        # Several email services may share one session from different threads
+        self._lock = threading.RLock()
+
+    def _connect(self) -> smtplib.SMTP:
+        """Open a new session, upgrade it to TLS and log in."""
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.use_tls:
+                server.starttls()  # Enable encryption
+            if self.username:
+                server.login(self.username, self.password)
+        except Exception:
+            server.close()
+            raise
+        return server
+
+    def _get_connection(self) -> smtplib.SMTP:
+        """Get the open session, reconnecting if it has been idle for too long."""
+        idle_for = time.monotonic() - self._last_used
+        if self._server is not None and idle_for > self.idle_timeout:
+            # Servers drop idle sessions, so start over instead of failing a send
+            self.close()
+        if self._server is None:
+            self._server = self._connect()
+        return self._server
+
+    def send_messages(self, messages: List[Message]) -> int:
+        """
+        Send messages over the shared session.
+
+        The session is reconnected and the remaining messages retried once
+        if the server dropped the connection.
+
+        Args:
+            messages: Messages to send, in order
+
+        Returns:
+            int: Number of messages sent
+        """
+        sent = 0
+        with self._lock:
+            for attempt in range(2):
+                try:
+                    server = self._get_connection()
+                    for message in messages[sent:]:
+                        server.send_message(message)
+                        sent += 1
+                        self._last_used = time.monotonic()
+                    return sent
+                except (smtplib.SMTPServerDisconnected, ConnectionError) as e:
+                    self._discard()
+                    if attempt:
+                        raise
+                    print(f"SMTP session lost ({e}), reconnecting")
+        return sent
+
+    def _discard(self) -> None:
+        """Drop a broken session without talking to the server."""
+        if self._server is not None:
+            try:
+                self._server.close()
+            except Exception:
+                pass
+            self._server = None
+
+    def close(self) -> None:
+        """Close the session politely."""
+        with self._lock:
+            if self._server is not None:
+                try:
+                    self._server.quit()
+                except Exception:
+                    pass
+                self._discard()
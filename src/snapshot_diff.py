@@ -0,0 +1,119 @@
+"""Incremental diffing of consecutive flight feed snapshots."""
+
+from typing import Any, Callable, Dict, List, Tuple
+from .flight_detail import FlightDetail
+
+
+class FeedDelta:
+    """Flights added, removed and changed between two consecutive snapshots."""
+
+    def __init__(self):
+        self.added: List[FlightDetail] = []
+        self.changed: List[FlightDetail] = []
+        self.removed: List[FlightDetail] = []
+        # Ids of flights whose details were carried over unchanged
+        self.unchanged_ids: List[str] = []
+
+    @property
+    def unchanged_count(self) -> int:
+        """Number of flights that did not change since the previous snapshot."""
+        return len(self.unchanged_ids)
+
+    def is_empty(self) -> bool:
+        """Check whether nothing changed since the previous snapshot."""
+        return not (self.added or self.changed or self.removed)
+
+    def get_updated_details(self) -> List[FlightDetail]:
+        """Get details of flights that were added or changed."""
+        return self.added + self.changed
+
+
+class _SnapshotEntry:
+    """A flight from the previous snapshot with its already built details."""
+
+    __slots__ = ("fingerprint", "details")
+
+    def __init__(self, fingerprint: Tuple, details: List[FlightDetail]):
+        self.fingerprint = fingerprint
+        self.details = details
+
+
+class SnapshotDiffer:
+    """Computes the delta between consecutive matched snapshots."""
+
+    def __init__(
+        self, build_details: Callable[[Any, List[str]], List[FlightDetail]]
+    ):
+        # Details are only built for new or changed flights; unchanged
+        # flights carry their details over from the previous cycle
+        self._build_details = build_details
+        self._previous: Dict[str, _SnapshotEntry] = {}
+
+    @staticmethod
+    def _fingerprint(flight: Any, country_codes: List[str]) -> Tuple:
+        """Get the fields of a flight whose change is reported as a change."""
+        return (
+            getattr(flight, "callsign", None),
+            getattr(flight, "origin_airport_iata", None),
+            getattr(flight, "destination_airport_iata", None),
+            tuple(country_codes),
+        )
+
+    def update(self, matches: Dict[str, List[Any]]) -> FeedDelta:
+        """
+        Diff the matched flights of this cycle against the previous cycle.
+
+        Args:
+            matches: Mapping of tracked country code to the flights it matched
+
+        Returns:
+            FeedDelta: Details of added, changed and removed flights
+        """
+        # Regroup by flight id, since a flight can match several countries
+        flights: Dict[str, Any] = {}
+        flight_countries: Dict[str, List[str]] = {}
+        for country_code, country_flights in matches.items():
+            for flight in country_flights:
+                flight_id = str(getattr(flight, "id", ""))
+                if flight_id not in flights:
+                    flights[flight_id] = flight
+                    flight_countries[flight_id] = []
+                flight_countries[flight_id].append(country_code)
+
+        delta = FeedDelta()
+        current: Dict[str, _SnapshotEntry] = {}
+        previous = self._previous
+
+        for flight_id, flight in flights.items():
+            country_codes = flight_countries[flight_id]
+            fingerprint = self._fingerprint(flight, country_codes)
+            entry = previous.get(flight_id)
+
+            if entry is not None and entry.fingerprint == fingerprint:
+                delta.unchanged_ids.append(flight_id)
+                current[flight_id] = entry
+                continue
+
+            details = self._build_details(flight, country_codes)
+            current[flight_id] = _SnapshotEntry(fingerprint, details)
+            if entry is None:
+                delta.added.extend(details)
+            else:
+                delta.changed.extend(details)
+
+        for flight_id, entry in previous.items():
+            if flight_id not in current:
+                delta.removed.extend(entry.details)
+
+        self._previous = current
+        return delta
+
+    def get_current_details(self) -> List[FlightDetail]:
+        """Get details of every flight in the latest snapshot."""
+        return [
+            detail for entry in self._previous.values() for detail in entry.details
+        ]
+
+    def reset(self) -> None:
+        """Forget the previous snapshot so the next update reports everything."""
+        self._previous = {}
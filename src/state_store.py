@@ -0,0 +1,197 @@
+"""Persistent state for de-duplicating flight notifications."""
+
+import sqlite3
+import time
+from typing import List, Dict, Optional, Set, Tuple
+from .config import Config
+from .flight_detail import FlightDetail
+
+
+class SeenFlightStore:
+    """SQLite-backed record of flights that have already been notified."""
+
+    def __init__(
+        self, path: Optional[str] = None, ttl_seconds: Optional[float] = None
+    ):
+        self.path = path or Config.STATE_DB
+        self.ttl_seconds = (
+            ttl_seconds if ttl_seconds is not None else Config.SEEN_FLIGHT_TTL_SECONDS
+        )
+        self._connection: Optional[sqlite3.Connection] = None
+        # In-memory mirror of the table: flight_id -> (status, last_seen)
+        self._seen: Dict[str, Tuple[str, float]] = {}
+        # Bare flight id -> stored keys of it, one per namespace that has it
+        self._keys_by_flight: Dict[str, Set[str]] = {}
+        self._last_evicted = 0.0
+
+    @staticmethod
+    def _flight_id(key: str) -> str:
+        """Get the bare flight id of a stored, possibly namespaced key."""
+        return key.rpartition("/")[2]
+
+    def _index_keys(self) -> None:
+        """Rebuild the flight id index of the stored keys."""
+        keys_by_flight: Dict[str, Set[str]] = {}
+        for key in self._seen:
+            keys_by_flight.setdefault(self._flight_id(key), set()).add(key)
+        self._keys_by_flight = keys_by_flight
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database and load the stored flights. Lazy loading pattern."""
+        if self._connection is None:
+            connection = sqlite3.connect(self.path)
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS seen_flights (
+                    flight_id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    last_seen REAL NOT NULL
+                )
+                """
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_seen_flights_last_seen "
+                "ON seen_flights (last_seen)"
+            )
+            connection.commit()
+
+            self._seen = {
+                flight_id: (status, last_seen)
+                for flight_id, status, last_seen in connection.execute(
+                    "SELECT flight_id, status, last_seen FROM seen_flights"
+                )
+            }
+            self._index_keys()
+            self._connection = connection
+        return self._connection
+
+    @staticmethod
+    def _status_key(flight_detail: FlightDetail) -> str:
+        """Get the part of a flight that counts as a status change."""
+        return str(flight_detail.destination or "")
+
+    def _evict_expired(self, connection: sqlite3.Connection, now: float) -> None:
+        """Forget flights that have not been seen within the TTL."""
+        # Eviction scans every stored flight, so run it at most once a minute;
+        # lookups check the TTL themselves in between
+        if now - self._last_evicted < 60:
+            return
+        self._last_evicted = now
+        cutoff = now - self.ttl_seconds
+        connection.execute("DELETE FROM seen_flights WHERE last_seen < ?", (cutoff,))
+        self._seen = {
+            flight_id: entry
+            for flight_id, entry in self._seen.items()
+            if entry[1] >= cutoff
+        }
+        self._index_keys()
+
+    def filter_new(
+        self,
+        flight_details: List[FlightDetail],
+        notify_on_status_change: bool = False,
+        now: Optional[float] = None,
+        namespace: str = "",
+    ) -> List[FlightDetail]:
+        """
+        Record the current flights and return the ones worth notifying about.
+
+        Args:
+            flight_details: List of flight details for this cycle
+            notify_on_status_change: Also return known flights whose status changed
+            now: Current timestamp, defaults to the system time
+            namespace: Keeps flights apart from other namespaces, e.g. so
+                each tracking profile is notified about a flight once
+
+        Returns:
+            List of flight details that have not been notified before
+        """
+        if now is None:
+            now = time.time()
+
+        try:
+            connection = self._connect()
+            self._evict_expired(connection, now)
+
+            cutoff = now - self.ttl_seconds
+            new_details = []
+            updates: Dict[str, Tuple[str, float]] = {}
+            for detail in flight_details:
+                flight_id = str(detail.flight_id)
+                if namespace:
+                    flight_id = f"{namespace}/{flight_id}"
+                status = self._status_key(detail)
+                previous = self._seen.get(flight_id)
+
+                if previous is None or previous[1] < cutoff:
+                    new_details.append(detail)
+                elif notify_on_status_change and previous[0] != status:
+                    new_details.append(detail)
+
+                updates[flight_id] = (status, now)
+
+            connection.executemany(
+                "INSERT OR REPLACE INTO seen_flights (flight_id, status, last_seen) "
+                "VALUES (?, ?, ?)",
+                [
+                    (flight_id, status, last_seen)
+                    for flight_id, (status, last_seen) in updates.items()
+                ],
+            )
+            connection.commit()
+            self._seen.update(updates)
+            keys_by_flight = self._keys_by_flight
+            for key in updates:
+                keys_by_flight.setdefault(self._flight_id(key), set()).add(key)
+            return new_details
+
+        except sqlite3.Error as e:
+            print(f"Error updating flight state store: {e}")
+            return flight_details
+
+    def touch(self, flight_ids: List[str], now: Optional[float] = None) -> None:
+        """
+        Mark known flights as still seen, without checking them for news.
+
+        Flights that stay in the feed unchanged never reach filter_new, so
+        they are kept from expiring here while they are still tracked. Only
+        the namespaces that stored a flight are refreshed, so the cost does
+        not grow with the number of namespaces, and a flight is only written
+        again once a small part of the TTL has passed, not every cycle.
+
+        Args:
+            flight_ids: Ids of flights in the current snapshot
+            now: Current timestamp, defaults to the system time
+        """
+        if now is None:
+            now = time.time()
+
+        try:
+            connection = self._connect()
+            seen = self._seen
+            keys_by_flight = self._keys_by_flight
+            # Far below the TTL, so a flight still in the feed never expires
+            refreshed_after = now - self.ttl_seconds / 24
+            updates = []
+            for flight_id in flight_ids:
+                for key in keys_by_flight.get(str(flight_id), ()):
+                    entry = seen[key]
+                    if entry[1] > refreshed_after:
+                        continue
+                    seen[key] = (entry[0], now)
+                    updates.append((now, key))
+            if updates:
+                connection.executemany(
+                    "UPDATE seen_flights SET last_seen = ? WHERE flight_id = ?",
+                    updates,
+                )
+                connection.commit()
+
+        except sqlite3.Error as e:
+            print(f"Error updating flight state store: {e}")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
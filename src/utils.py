@@ -39,3 +39,17 @@ def group_by_key(
 def safe_get_attr(obj: Any, attr: str, default: Any = "Unknown") -> Any:
     """Safely get an attribute from an object with a default value."""
     return getattr(obj, attr, default)
+
+
+def parse_duration(value: str) -> float:
+    """
+    Parse a duration such as "90s", "15m", "24h" or "7d" into seconds.
+
+    Raises:
+        ValueError: If the duration is malformed
+    """
+    units = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+    value = value.strip().lower()
+    if value and value[-1] in units:
+        return float(value[:-1]) * units[value[-1]]
+    return float(value)
@@ -0,0 +1,323 @@
+"""Optional NumPy-vectorized matching of flight feed snapshots."""
+
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+from .data_loader import DataLoader
+from .filter_rules import FilterRules
+from .geofence import KM_PER_DEGREE, GeofenceIndex
+
+# NumPy is optional, matching falls back to pure Python without it
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+
+def _to_float(value: Any) -> float:
+    """Convert a feed value to float, using NaN for missing values."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+class FeedColumns:
+    """Columnar arrays of one feed snapshot, converted lazily once per cycle."""
+
+    def __init__(self, flights: Sequence[Any], airport_ids: Dict[str, int]):
+        self.flights = flights
+        self.size = len(flights)
+        self.airport_ids = airport_ids
+        self._columns: Dict[str, "np.ndarray"] = {}
+
+    def airport_column(self, attribute: str) -> "np.ndarray":
+        """Get an airport attribute of every flight as ids, -1 for unknown airports."""
+        column = self._columns.get(attribute)
+        if column is None:
+            airport_ids = self.airport_ids
+            column = np.fromiter(
+                (
+                    airport_ids.get(getattr(flight, attribute, None), -1)
+                    for flight in self.flights
+                ),
+                dtype=np.int32,
+                count=self.size,
+            )
+            self._columns[attribute] = column
+        return column
+
+    def float_column(self, attribute: str) -> "np.ndarray":
+        """Get a numeric attribute of every flight, NaN where it is missing."""
+        column = self._columns.get(attribute)
+        if column is None:
+            column = np.fromiter(
+                (
+                    _to_float(getattr(flight, attribute, None))
+                    for flight in self.flights
+                ),
+                dtype=np.float64,
+                count=self.size,
+            )
+            self._columns[attribute] = column
+        return column
+
+
+class VectorizedRules:
+    """
+    Filter rules evaluated over a whole feed snapshot at once.
+
+    Rule masks are held in uint64 arrays, so at most MAX_RULES rules can be
+    evaluated this way. Origin and destination masks are looked up by airport
+    id and altitude masks by interval, so only the airline and aircraft
+    columns cost a dict lookup per flight.
+    """
+
+    MAX_RULES = 64
+
+    def __init__(
+        self,
+        filter_rules: FilterRules,
+        airport_codes: List[str],
+        data_loader: DataLoader,
+    ):
+        if len(filter_rules.rules) > self.MAX_RULES:
+            raise ValueError(f"At most {self.MAX_RULES} rules can be vectorized")
+        self.filter_rules = filter_rules
+        all_rules, include_mask, exclude_mask = filter_rules.get_masks()
+        self._all_rules = np.uint64(all_rules)
+        self._include_mask = np.uint64(include_mask)
+        self._exclude_mask = np.uint64(exclude_mask)
+
+        # (airport attribute, rule mask by airport id with a last slot for -1)
+        self._airport_lookups: List[Tuple[str, "np.ndarray"]] = []
+        # (value getter, value -> rule mask, mask for other values)
+        self._value_lookups: List[Tuple[Any, Dict[str, int], int]] = []
+        for field, (getter, table, unconstrained) in (
+            filter_rules.get_field_tables().items()
+        ):
+            if field in ("origin", "destination"):
+                masks = np.full(len(airport_codes) + 1, unconstrained, dtype=np.uint64)
+                for airport_id, airport_code in enumerate(airport_codes):
+                    country_code = data_loader.get_airport_country(airport_code)
+                    masks[airport_id] = table.get(country_code, 0) | unconstrained
+                self._airport_lookups.append((f"{field}_airport_iata", masks))
+            else:
+                matching = {
+                    value: mask | unconstrained for value, mask in table.items()
+                }
+                self._value_lookups.append((getter, matching, unconstrained))
+
+        bounds, masks, unconstrained = filter_rules.get_altitude_bands()
+        self._altitude_bounds = np.array(bounds, dtype=np.float64)
+        self._altitude_masks = np.array(masks, dtype=np.uint64)
+        self._altitude_unconstrained = np.uint64(unconstrained)
+
+    def evaluate(self, columns: FeedColumns) -> Tuple["np.ndarray", "np.ndarray"]:
+        """
+        Evaluate all rules against every flight, like FilterRules.evaluate.
+
+        Returns:
+            Boolean arrays of (excluded flights, included flights)
+        """
+        masks = np.full(columns.size, self._all_rules, dtype=np.uint64)
+        for attribute, airport_masks in self._airport_lookups:
+            masks &= airport_masks[columns.airport_column(attribute)]
+        for getter, matching, unconstrained in self._value_lookups:
+            masks &= np.fromiter(
+                (
+                    matching.get(getter(flight), unconstrained)
+                    for flight in columns.flights
+                ),
+                dtype=np.uint64,
+                count=columns.size,
+            )
+
+        if len(self._altitude_bounds):
+            altitudes = columns.float_column("altitude")
+            known = ~np.isnan(altitudes)
+            intervals = np.searchsorted(
+                self._altitude_bounds, altitudes[known], side="right"
+            )
+            masks[known] &= self._altitude_masks[intervals]
+            masks[~known] &= self._altitude_unconstrained
+
+        excluded = (masks & self._exclude_mask) != 0
+        included = ~excluded & ((masks & self._include_mask) != 0)
+        return excluded, included
+
+
+class VectorizedMatcher:
+    """Matches a whole feed snapshot against the tracked countries with array masks."""
+
+    def __init__(
+        self,
+        airport_codes: List[str],
+        country_codes: List[str],
+        destination_index: Dict[str, Set[str]],
+        geofence_index: Optional[GeofenceIndex] = None,
+        rules: Optional[VectorizedRules] = None,
+    ):
+        self.country_codes = list(dict.fromkeys(country_codes))
+        country_positions = {code: i for i, code in enumerate(self.country_codes)}
+        self.airport_ids = {code: i for i, code in enumerate(airport_codes)}
+
+        # Destination airport id -> tracked country position, -1 if untracked.
+        # Every airport belongs to exactly one country, so one slot is enough.
+        self._destination_lookup = np.full(len(airport_codes), -1, dtype=np.int32)
+        for airport_code, countries in destination_index.items():
+            airport_id = self.airport_ids.get(airport_code)
+            if airport_id is not None and countries:
+                self._destination_lookup[airport_id] = country_positions[
+                    next(iter(countries))
+                ]
+
+        self.has_geofences = geofence_index is not None
+        if geofence_index is not None:
+            self._build_fence_arrays(geofence_index, country_positions)
+        self.rules = rules
+        self.filter_rules = rules.filter_rules if rules is not None else None
+
+    def _build_fence_arrays(
+        self, geofence_index: GeofenceIndex, country_positions: Dict[str, int]
+    ) -> None:
+        """Flatten the geofence grid into arrays indexed by cell id."""
+        self._cell_degrees = geofence_index.cell_degrees
+        self._column_count = geofence_index.column_count
+        self._radius_squared = (geofence_index.radius_km / KM_PER_DEGREE) ** 2
+        cells = geofence_index.get_cells()
+
+        # Rows may extend one cell past either pole
+        row_count = int(180 // self._cell_degrees) + 3
+        cell_count = row_count * self._column_count
+        self._cell_starts = np.zeros(cell_count, dtype=np.int64)
+        self._cell_sizes = np.zeros(cell_count, dtype=np.int64)
+
+        latitudes, longitudes, scales, countries = [], [], [], []
+        for (row, column), fences in sorted(cells.items()):
+            cell_id = (row + 1) * self._column_count + column
+            self._cell_starts[cell_id] = len(latitudes)
+            self._cell_sizes[cell_id] = len(fences)
+            for latitude, longitude, scale, country_code in fences:
+                latitudes.append(latitude)
+                longitudes.append(longitude)
+                scales.append(scale)
+                countries.append(country_positions[country_code])
+
+        self._fence_latitudes = np.array(latitudes, dtype=np.float64)
+        self._fence_longitudes = np.array(longitudes, dtype=np.float64)
+        self._fence_scales = np.array(scales, dtype=np.float64)
+        self._fence_countries = np.array(countries, dtype=np.int32)
+
+    def _match_destinations(self, columns: FeedColumns) -> "np.ndarray":
+        """Get the tracked country position of every flight by destination."""
+        countries = np.full(columns.size, -1, dtype=np.int32)
+        destination_ids = columns.airport_column("destination_airport_iata")
+        known = destination_ids >= 0
+        countries[known] = self._destination_lookup[destination_ids[known]]
+        return countries
+
+    def _match_geofences(
+        self, columns: FeedColumns
+    ) -> Tuple["np.ndarray", "np.ndarray"]:
+        """Get (flight index, country position) pairs for flights inside fences."""
+        latitudes = columns.float_column("latitude")
+        longitudes = columns.float_column("longitude")
+        valid = np.isfinite(latitudes) & np.isfinite(longitudes)
+        flight_indices = np.nonzero(valid)[0]
+
+        rows = ((latitudes[valid] + 90) // self._cell_degrees).astype(np.int64)
+        grid_columns = (longitudes[valid] + 180) // self._cell_degrees
+        cell_ids = (rows + 1) * self._column_count + (
+            grid_columns.astype(np.int64) % self._column_count
+        )
+        in_grid = (cell_ids >= 0) & (cell_ids < len(self._cell_sizes))
+        flight_indices = flight_indices[in_grid]
+        cell_ids = cell_ids[in_grid]
+
+        # Expand every flight into one candidate pair per fence in its cell
+        sizes = self._cell_sizes[cell_ids]
+        pair_flights = np.repeat(flight_indices, sizes)
+        pair_offsets = np.arange(sizes.sum()) - np.repeat(
+            np.cumsum(sizes) - sizes, sizes
+        )
+        pair_fences = np.repeat(self._cell_starts[cell_ids], sizes) + pair_offsets
+
+        delta_latitudes = latitudes[pair_flights] - self._fence_latitudes[pair_fences]
+        delta_longitudes = (
+            longitudes[pair_flights] - self._fence_longitudes[pair_fences] + 180
+        ) % 360 - 180
+        distances_squared = (
+            delta_latitudes**2
+            + (delta_longitudes * self._fence_scales[pair_fences]) ** 2
+        )
+        inside = distances_squared <= self._radius_squared
+        return pair_flights[inside], self._fence_countries[pair_fences[inside]]
+
+    def match(self, flights: Sequence[Any]) -> Dict[str, List[Any]]:
+        """
+        Assign each flight to every tracked country it matches.
+
+        Flights excluded by a rule are dropped, and flights only included by
+        a rule are reported under their own country, as in the Python path.
+
+        Args:
+            flights: Flights of one feed snapshot
+
+        Returns:
+            Mapping of country code to its matched flights, in feed order,
+            tracked countries first
+        """
+        columns = FeedColumns(flights, self.airport_ids)
+        destination_countries = self._match_destinations(columns)
+        matched = destination_countries >= 0
+        pair_flights = np.nonzero(matched)[0]
+        pair_countries = destination_countries[matched]
+
+        if self.has_geofences:
+            fence_flights, fence_countries = self._match_geofences(columns)
+            pair_flights = np.concatenate([pair_flights, fence_flights])
+            pair_countries = np.concatenate([pair_countries, fence_countries])
+
+        country_codes = self.country_codes
+        if self.rules is not None:
+            excluded, included = self.rules.evaluate(columns)
+            kept = ~excluded[pair_flights]
+            included[pair_flights] = False
+            pair_flights = pair_flights[kept]
+            pair_countries = pair_countries[kept]
+
+            # Few flights are only included by a rule, group them one by one
+            country_codes = list(country_codes)
+            country_positions = {code: i for i, code in enumerate(country_codes)}
+            extra_flights, extra_countries = [], []
+            for flight_index in np.nonzero(included)[0]:
+                group_country = self.rules.filter_rules.group_country(
+                    flights[flight_index]
+                )
+                if group_country:
+                    if group_country not in country_positions:
+                        country_positions[group_country] = len(country_codes)
+                        country_codes.append(group_country)
+                    extra_flights.append(flight_index)
+                    extra_countries.append(country_positions[group_country])
+            pair_flights = np.concatenate(
+                [pair_flights, np.array(extra_flights, dtype=pair_flights.dtype)]
+            )
+            pair_countries = np.concatenate(
+                [pair_countries, np.array(extra_countries, dtype=pair_countries.dtype)]
+            )
+
+        # Unique (country, flight) pairs, sorted by country then feed order
+        stride = max(columns.size, 1)
+        pair_keys = np.unique(pair_countries.astype(np.int64) * stride + pair_flights)
+        key_countries = pair_keys // stride
+        key_flights = pair_keys % stride
+
+        matches: Dict[str, List[Any]] = {code: [] for code in country_codes}
+        boundaries = np.searchsorted(key_countries, np.arange(len(country_codes) + 1))
+        for position, country_code in enumerate(country_codes):
+            start, end = boundaries[position], boundaries[position + 1]
+            matches[country_code] = [flights[i] for i in key_flights[start:end]]
+        return matches
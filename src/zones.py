@@ -0,0 +1,112 @@
+"""Geographic zone planning for bounded flight feed requests."""
+
+import math
+from typing import Dict, List, Optional, Set, Tuple
+from .config import Config
+from .data_loader import DataLoader
+
+
+class ZonePlanner:
+    """Plans the FlightRadar24 bounds covering the tracked countries' airports."""
+
+    def __init__(
+        self,
+        data_loader: DataLoader,
+        tile_degrees: Optional[float] = None,
+        margin_degrees: Optional[float] = None,
+    ):
+        self.data_loader = data_loader
+        self.tile_degrees = tile_degrees or Config.ZONE_TILE_DEGREES
+        self.margin_degrees = (
+            margin_degrees if margin_degrees is not None else Config.ZONE_MARGIN_DEGREES
+        )
+
+    def _collect_tiles(self, country_codes: List[str]) -> Set[Tuple[int, int]]:
+        """Collect grid tiles within the margin of any of the countries' airports."""
+        tile = self.tile_degrees
+        margin = self.margin_degrees
+        row_count = math.ceil(180 / tile)
+        column_count = math.ceil(360 / tile)
+        tiles = set()
+
+        for country_code in country_codes:
+            for airport_code in self.data_loader.get_country_airports(country_code):
+                coordinates = self.data_loader.get_airport_coordinates(airport_code)
+                if coordinates is None:
+                    continue
+                latitude, longitude = coordinates
+
+                first_row = max(0, int((latitude - margin + 90) // tile))
+                last_row = min(row_count - 1, int((latitude + margin + 90) // tile))
+                first_column = int((longitude - margin + 180) // tile)
+                last_column = int((longitude + margin + 180) // tile)
+
+                for row in range(first_row, last_row + 1):
+                    for column in range(first_column, last_column + 1):
+                        # Wrap around the antimeridian
+                        tiles.add((row, column % column_count))
+
+        return tiles
+
+    def _merge_tiles(
+        self, tiles: Set[Tuple[int, int]]
+    ) -> List[Tuple[float, float, float, float]]:
+        """Merge tiles into rectangular (north, south, west, east) boxes."""
+        tile = self.tile_degrees
+
+        # Merge horizontally adjacent tiles into column runs per row
+        runs_by_row: Dict[int, List[Tuple[int, int]]] = {}
+        for row in sorted({row for row, _ in tiles}):
+            columns = sorted(column for tile_row, column in tiles if tile_row == row)
+            runs = []
+            start = previous = columns[0]
+            for column in columns[1:]:
+                if column != previous + 1:
+                    runs.append((start, previous))
+                    start = column
+                previous = column
+            runs.append((start, previous))
+            runs_by_row[row] = runs
+
+        # Stack identical column runs of consecutive rows into one box
+        open_boxes: Dict[Tuple[int, int], int] = {}
+        boxes = []
+        previous_row = None
+        for row in sorted(runs_by_row):
+            runs = set(runs_by_row[row])
+            for run in list(open_boxes):
+                if run not in runs or previous_row != row - 1:
+                    boxes.append((open_boxes.pop(run), previous_row, run))
+            for run in runs:
+                open_boxes.setdefault(run, row)
+            previous_row = row
+        for run, first_row in open_boxes.items():
+            boxes.append((first_row, previous_row, run))
+
+        bounds = []
+        for first_row, last_row, (first_column, last_column) in boxes:
+            north = min(90.0, (last_row + 1) * tile - 90)
+            south = max(-90.0, first_row * tile - 90)
+            west = first_column * tile - 180
+            east = min(180.0, (last_column + 1) * tile - 180)
+            bounds.append((north, south, west, east))
+        return bounds
+
+    def plan(self, country_codes: List[str]) -> List[str]:
+        """
+        Plan the bounds to request for a list of countries.
+
+        Args:
+            country_codes: Country codes whose airports should be covered
+
+        Returns:
+            List of FlightRadar24 bounds strings ("north,south,west,east")
+        """
+        tiles = self._collect_tiles(country_codes)
+        if not tiles:
+            return []
+
+        return [
+            f"{north:g},{south:g},{west:g},{east:g}"
+            for north, south, west, east in self._merge_tiles(tiles)
+        ]
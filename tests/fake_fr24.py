@@ -0,0 +1,133 @@
+"""Local stand-in for the FlightRadar24 feed endpoint."""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+
+def make_flight(
+    flight_id: str,
+    latitude: float,
+    longitude: float,
+    origin: str = "LHR",
+    destination: str = "TLV",
+    callsign: str = "ELY316",
+    altitude: int = 35000,
+) -> List[Any]:
+    """Build a feed entry in the FR24 feed.js array layout."""
+    return [
+        "738065",  # icao_24bit
+        latitude,
+        longitude,
+        90,  # heading
+        altitude,
+        450,  # ground_speed
+        "1234",  # squawk
+        "T-EGLL1",  # radar
+        "B789",  # aircraft_code
+        "4X-EDF",  # registration
+        int(time.time()),
+        origin,
+        destination,
+        "LY316",  # number
+        0,  # on_ground
+        0,  # vertical_speed
+        callsign,
+        0,
+        callsign[:3],  # airline_icao
+    ]
+
+
+class FakeFR24Server:
+    """
+    Serves the real-time feed from a fixed set of flights.
+
+    Requests can be slowed down or made to fail, and the server counts
+    requests and their peak concurrency, so the fetch layer's concurrency,
+    timeouts and retries can be exercised and timed offline.
+    """
+
+    def __init__(
+        self,
+        flights: Dict[str, List[Any]],
+        delay: float = 0.0,
+        failures: int = 0,
+    ):
+        self.flights = flights
+        self.delay = delay
+        # Number of upcoming requests answered with HTTP 500
+        self.failures = failures
+        self.requests = 0
+        self.max_concurrent = 0
+        self._active = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Feed endpoint URL, to patch into Core.real_time_flight_tracker_data_url."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/zones/fcgi/feed.js"
+
+    def _get_feed(self, bounds: Optional[str]) -> Dict[str, Any]:
+        """Get the feed response, limited to "north,south,west,east" bounds."""
+        feed: Dict[str, Any] = {"full_count": len(self.flights), "version": 4}
+        for flight_id, info in self.flights.items():
+            if bounds:
+                north, south, west, east = map(float, bounds.split(","))
+                if not (south <= info[1] <= north and west <= info[2] <= east):
+                    continue
+            feed[flight_id] = info
+        return feed
+
+    def _make_handler(self) -> type:
+        """Create the request handler bound to this server."""
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                with fake._lock:
+                    fake.requests += 1
+                    fake._active += 1
+                    fake.max_concurrent = max(fake.max_concurrent, fake._active)
+                    fail = fake.failures > 0
+                    if fail:
+                        fake.failures -= 1
+                try:
+                    time.sleep(fake.delay)
+                    if fail:
+                        self.send_error(500)
+                        return
+                    query = parse_qs(urlparse(self.path).query)
+                    bounds = query.get("bounds", [None])[0]
+                    body = json.dumps(fake._get_feed(bounds)).encode("utf-8")
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client gave up waiting
+                    pass
+                finally:
+                    with fake._lock:
+                        fake._active -= 1
+
+            def log_message(self, format: str, *args: Any) -> None:
+                """Keep requests out of the test output."""
+
+        return Handler
+
+    def __enter__(self) -> "FakeFR24Server":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,116 @@
+"""Local stand-in for an SMTP server."""
+
+import socket
+import socketserver
+import threading
+from email import message_from_bytes
+from email.message import Message
+from typing import Any, List, Optional, Set
+
+
+class FakeSMTPServer:
+    """
+    Accepts plain SMTP sessions on localhost and keeps the received messages.
+
+    Sessions can be dropped on demand or after a number of messages, so the
+    reconnect handling of a client can be exercised offline.
+    """
+
+    def __init__(self, drop_after: Optional[int] = None):
+        self.messages: List[Message] = []
+        self.connections = 0
+        self.quits = 0
+        # Close the first session abruptly after it received this many messages
+        self.drop_after = drop_after
+        self._sockets: Set[socket.socket] = set()
+        self._lock = threading.Lock()
+        self._server = socketserver.ThreadingTCPServer(
+            ("127.0.0.1", 0), self._make_handler()
+        )
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        """Port the server listens on."""
+        return self._server.server_address[1]
+
+    def disconnect_all(self) -> None:
+        """Drop every open session without a reply, as a server restart would."""
+        with self._lock:
+            sockets = list(self._sockets)
+        for client in sockets:
+            try:
+                client.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def _make_handler(self) -> type:
+        """Create the session handler bound to this server."""
+        fake = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def reply(self, line: str) -> None:
+                self.wfile.write(f"{line}\r\n".encode("ascii"))
+
+            def handle(self) -> None:
+                with fake._lock:
+                    fake.connections += 1
+                    fake._sockets.add(self.connection)
+                    drop_after = fake.drop_after
+                    fake.drop_after = None
+                received = 0
+                try:
+                    self.reply("220 localhost fake SMTP ready")
+                    while True:
+                        line = self.rfile.readline()
+                        if not line:
+                            return
+                        command = line.decode("ascii", "replace").strip().upper()
+                        if command.startswith("EHLO"):
+                            self.reply("250-localhost")
+                            self.reply("250 8BITMIME")
+                        elif command.startswith("HELO"):
+                            self.reply("250 localhost")
+                        elif command.startswith("DATA"):
+                            self.reply("354 End data with <CR><LF>.<CR><LF>")
+                            lines = []
+                            while True:
+                                data_line = self.rfile.readline()
+                                if not data_line or data_line == b".\r\n":
+                                    break
+                                if data_line.startswith(b".."):
+                                    data_line = data_line[1:]
+                                lines.append(data_line)
+                            message = message_from_bytes(b"".join(lines))
+                            with fake._lock:
+                                fake.messages.append(message)
+                            self.reply("250 OK")
+                            received += 1
+                            if drop_after is not None and received >= drop_after:
+                                return
+                        elif command.startswith("QUIT"):
+                            with fake._lock:
+                                fake.quits += 1
+                            self.reply("221 Bye")
+                            return
+                        else:
+                            # MAIL, RCPT, RSET and NOOP need no state here
+                            self.reply("250 OK")
+                except OSError:
+                    pass
+                finally:
+                    with fake._lock:
+                        fake._sockets.discard(self.connection)
+
+        return Handler
+
+    def __enter__(self) -> "FakeSMTPServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.disconnect_all()
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,88 @@
+"""Tests for how the CLI combines tracking profiles with other options."""
+
+import json
+
+import pytest
+
+FlightRadar24 = pytest.importorskip("FlightRadar24")
+from FlightRadar24.core import Core
+
+from src.cli import FlightTrackerCLI
+from tests.fake_fr24 import FakeFR24Server, make_flight
+
+PROFILES = {
+    "profiles": [
+        {"name": "levant", "countries": ["IL", "JO"], "notifiers": ["null"]},
+    ]
+}
+
+
+@pytest.fixture
+def cli(tmp_path, monkeypatch):
+    """CLI running in an empty directory against a local feed."""
+    cli = FlightTrackerCLI()
+    # Airport data is read from the repository before leaving it
+    cli.data_loader.get_airport_codes()
+    monkeypatch.chdir(tmp_path)
+    server = FakeFR24Server({"4001": make_flight("4001", 32.0, 34.9)})
+    with server:
+        monkeypatch.setattr(Core, "real_time_flight_tracker_data_url", server.url)
+        yield cli
+
+
+def _write_profiles(tmp_path, name="profiles.json"):
+    (tmp_path / name).write_text(json.dumps(PROFILES), encoding="utf-8")
+
+
+@pytest.mark.parametrize(
+    "options, rejected",
+    [
+        (["--countries", "IL"], "--countries"),
+        (["--rules", "rules.txt"], "--rules"),
+        (["--countries", "IL", "--rules", "rules.txt"], "--countries and --rules"),
+    ],
+)
+def test_profiles_reject_single_list_options(cli, tmp_path, capsys, options, rejected):
+    _write_profiles(tmp_path, "team.json")
+
+    assert cli.run(["--profiles", "team.json", "--dry-run"] + options) == 1
+
+    output = capsys.readouterr().out
+    assert (
+        f"{rejected} cannot be combined with --profiles - set countries and rules "
+        "in the profile file instead"
+    ) in output
+    assert "Loaded 1 tracking profiles" not in output
+
+
+@pytest.mark.parametrize(
+    "options, reason",
+    [
+        (["--countries", "IL"], "--countries"),
+        (["--rules", "rules.txt"], "--rules"),
+    ],
+)
+def test_single_list_options_override_default_profiles(
+    cli, tmp_path, capsys, options, reason
+):
+    _write_profiles(tmp_path)
+    (tmp_path / "rules.txt").write_text("include destination=IL\n", encoding="utf-8")
+
+    assert cli.run(["--dry-run"] + options) == 0
+
+    output = capsys.readouterr().out
+    assert f"Ignoring profiles.json in favour of {reason}" in output
+    assert "Loaded 1 tracking profiles" not in output
+
+
+def test_default_profiles_report_dropped_filter_rules(cli, tmp_path, capsys):
+    _write_profiles(tmp_path)
+    (tmp_path / "filter_rules.txt").write_text(
+        "exclude airline=ELY\n", encoding="utf-8"
+    )
+
+    assert cli.run(["--dry-run"]) == 0
+
+    output = capsys.readouterr().out
+    assert "Loaded 1 tracking profiles from profiles.json" in output
+    assert "Warning: filter rules are ignored with tracking profiles" in output
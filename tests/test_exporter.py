@@ -0,0 +1,86 @@
+"""Tests for the hourly flight export files."""
+
+import gzip
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from src.data_loader import DataLoader
+from src.exporter import FlightExporter
+from src.flight_detail import FlightDetail
+
+# 2024-01-01 12:00 UTC
+HOUR = 1704110400
+
+
+@pytest.fixture(scope="module")
+def data_loader():
+    return DataLoader()
+
+
+def _details(data_loader, *flight_ids):
+    return [
+        FlightDetail(
+            SimpleNamespace(
+                id=flight_id,
+                callsign="ELY316",
+                origin_airport_iata="LHR",
+                destination_airport_iata="TLV",
+            ),
+            data_loader,
+            "IL",
+            "Israel",
+        )
+        for flight_id in flight_ids
+    ]
+
+
+def _exporter(tmp_path, export_format):
+    # Every batch is flushed on its own
+    return FlightExporter(
+        str(tmp_path), export_format, retention_hours=0, flush_rows=1
+    )
+
+
+def test_parquet_parts_are_compacted_when_the_hour_rolls_over(tmp_path, data_loader):
+    pq = pytest.importorskip("pyarrow.parquet")
+    exporter = _exporter(tmp_path, "parquet")
+    for minute, flight_id in enumerate(["a", "b", "c"]):
+        exporter._handle_batch((HOUR + 60 * minute, _details(data_loader, flight_id)))
+    assert sorted(os.listdir(tmp_path)) == [
+        "flights-20240101-12.1.parquet",
+        "flights-20240101-12.2.parquet",
+        "flights-20240101-12.parquet",
+    ]
+
+    exporter._handle_batch((HOUR + 3600, _details(data_loader, "d", "e")))
+    assert sorted(os.listdir(tmp_path)) == [
+        "flights-20240101-12.parquet",
+        "flights-20240101-13.parquet",
+    ]
+    table = pq.read_table(tmp_path / "flights-20240101-12.parquet")
+    assert table.column("flight_id").to_pylist() == ["a", "b", "c"]
+
+    # A restart within the hour adds parts, which close() compacts again
+    exporter.close()
+    exporter = _exporter(tmp_path, "parquet")
+    exporter._handle_batch((HOUR + 3660, _details(data_loader, "f")))
+    exporter.close()
+    assert sorted(os.listdir(tmp_path)) == [
+        "flights-20240101-12.parquet",
+        "flights-20240101-13.parquet",
+    ]
+    table = pq.read_table(tmp_path / "flights-20240101-13.parquet")
+    assert table.column("flight_id").to_pylist() == ["d", "e", "f"]
+
+
+def test_ndjson_rows_are_appended_to_one_file_per_hour(tmp_path, data_loader):
+    exporter = _exporter(tmp_path, "ndjson")
+    for minute, flight_id in enumerate(["a", "b", "c"]):
+        exporter._handle_batch((HOUR + 60 * minute, _details(data_loader, flight_id)))
+    exporter.close()
+
+    assert os.listdir(tmp_path) == ["flights-20240101-12.ndjson.gz"]
+    with gzip.open(tmp_path / "flights-20240101-12.ndjson.gz", "rt") as file:
+        assert len(file.read().splitlines()) == 3
@@ -0,0 +1,140 @@
+"""Tests for concurrent feed fetching against a local fake FR24 server."""
+
+import time
+
+import pytest
+
+FlightRadar24 = pytest.importorskip("FlightRadar24")
+from FlightRadar24 import FlightRadar24API
+from FlightRadar24.core import Core
+
+from src.feed_fetcher import FeedFetcher
+from tests.fake_fr24 import FakeFR24Server, make_flight
+
+ZONES = ["60,0,-20,0", "60,0,0,20", "0,-60,-20,0", "0,-60,0,20"]
+
+
+def _flights():
+    """Two flights per zone, plus one on the border of two zones."""
+    flights = {}
+    for zone, (latitude, longitude) in enumerate(
+        [(30, -10), (30, 10), (-30, -10), (-30, 10)]
+    ):
+        for offset in range(2):
+            flights[f"3{zone}{offset}"] = make_flight(
+                f"3{zone}{offset}", latitude + offset, longitude
+            )
+    flights["3999"] = make_flight("3999", 30, 0)
+    return flights
+
+
+@pytest.fixture
+def fake_server(monkeypatch):
+    server = FakeFR24Server(_flights())
+    with server:
+        monkeypatch.setattr(Core, "real_time_flight_tracker_data_url", server.url)
+        yield server
+
+
+def test_zones_are_fetched_concurrently_and_merged_by_id(fake_server):
+    fake_server.delay = 0.3
+    fetcher = FeedFetcher(FlightRadar24API(timeout=5), max_workers=4, retries=0)
+    try:
+        start = time.monotonic()
+        flights = fetcher.fetch(ZONES)
+        elapsed = time.monotonic() - start
+    finally:
+        fetcher.close()
+
+    assert sorted(flight.id for flight in flights) == sorted(_flights())
+    assert fake_server.max_concurrent == 4
+    # Sequential fetching would take at least 4 x 0.3 s
+    assert elapsed < 1.0
+
+
+def test_failed_requests_are_retried(fake_server):
+    fake_server.failures = 2
+    fetcher = FeedFetcher(
+        FlightRadar24API(timeout=5), max_workers=1, retries=2, backoff=0.01
+    )
+    try:
+        flights = fetcher.fetch([ZONES[0]])
+    finally:
+        fetcher.close()
+
+    assert sorted(flight.id for flight in flights) == ["300", "301", "3999"]
+    assert fake_server.requests == 3
+
+
+def test_all_zones_failing_raises(fake_server):
+    fake_server.failures = 100
+    fetcher = FeedFetcher(
+        FlightRadar24API(timeout=5), max_workers=2, retries=1, backoff=0.01
+    )
+    try:
+        with pytest.raises(RuntimeError):
+            fetcher.fetch(ZONES[:2])
+    finally:
+        fetcher.close()
+    assert fake_server.requests == 4
+
+
+def test_request_timeout_frees_the_worker(fake_server):
+    fake_server.delay = 3.0
+    fetcher = FeedFetcher(
+        FlightRadar24API(timeout=0.2), max_workers=1, timeout=2.0, retries=0
+    )
+    try:
+        # The client gives up on its own, well before the fetcher's deadline
+        start = time.monotonic()
+        with pytest.raises(RuntimeError):
+            fetcher.fetch([ZONES[0]])
+        assert time.monotonic() - start < 1.0
+
+        # The single worker thread is free again for the next cycle
+        fake_server.delay = 0.0
+        assert len(fetcher.fetch([ZONES[1]])) == 3
+    finally:
+        fetcher.close()
+
+
+def test_deadline_covers_zones_queued_behind_busy_workers(fake_server):
+    # Six zones on two workers take three rounds of 0.3 s, more than the
+    # 0.5 s one zone may take
+    fake_server.delay = 0.3
+    fetcher = FeedFetcher(
+        FlightRadar24API(timeout=5), max_workers=2, timeout=0.5, retries=0
+    )
+    try:
+        flights = fetcher.fetch(ZONES + ZONES[:2])
+    finally:
+        fetcher.close()
+
+    assert sorted(flight.id for flight in flights) == sorted(_flights())
+    assert fake_server.requests == 6
+
+
+def test_no_zones_fetch_nothing(fake_server):
+    fetcher = FeedFetcher(FlightRadar24API(timeout=5))
+    try:
+        assert fetcher.fetch([]) == []
+    finally:
+        fetcher.close()
+    assert fake_server.requests == 0
+
+
+def test_flights_without_id_are_skipped():
+    class Flight:
+        def __init__(self, flight_id):
+            self.id = flight_id
+
+    class StubAPI:
+        def get_flights(self, bounds=None):
+            return [Flight(None), Flight(""), Flight("301"), Flight(None)]
+
+    fetcher = FeedFetcher(StubAPI(), max_workers=1)
+    try:
+        flights = fetcher.fetch([ZONES[0], ZONES[1]])
+    finally:
+        fetcher.close()
+    assert [flight.id for flight in flights] == ["301"]
@@ -0,0 +1,206 @@
+"""Tests for the filter rule operators and their NumPy bitmask evaluation."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from src.data_loader import DataLoader
+from src.filter_rules import (
+    RULE_EXCLUDE,
+    RULE_INCLUDE,
+    RULE_NONE,
+    FilterRule,
+    FilterRules,
+)
+from src.vectorized import NUMPY_AVAILABLE
+
+# (rules, flight attributes, expected outcome); attributes left out are
+# missing from the flight altogether
+CASES = [
+    # origin and destination compare the airports' country codes
+    (["include origin=IR"], {"origin_airport_iata": "IKA"}, RULE_INCLUDE),
+    (["include origin=IR"], {"origin_airport_iata": "TLV"}, RULE_NONE),
+    (["include origin=IR"], {"origin_airport_iata": "ZZZ"}, RULE_NONE),
+    (["include origin=IR"], {"origin_airport_iata": None}, RULE_NONE),
+    (["include origin=IR"], {}, RULE_NONE),
+    (["include destination=GB,JO"], {"destination_airport_iata": "AMM"}, RULE_INCLUDE),
+    (["include destination=GB,JO"], {"destination_airport_iata": "LHR"}, RULE_INCLUDE),
+    (["include destination=GB,JO"], {"destination_airport_iata": "DXB"}, RULE_NONE),
+    (["include destination=gb"], {"destination_airport_iata": "LHR"}, RULE_INCLUDE),
+    # airline is the callsign's ICAO prefix, case-insensitive
+    (["include airline=RYR"], {"callsign": "RYR123"}, RULE_INCLUDE),
+    (["include airline=RYR"], {"callsign": "ryr123"}, RULE_INCLUDE),
+    (["include airline=ryr,EZY"], {"callsign": "EZY8"}, RULE_INCLUDE),
+    (["include airline=RYR"], {"callsign": "RY"}, RULE_NONE),
+    (["include airline=RYR"], {"callsign": ""}, RULE_NONE),
+    (["include airline=RYR"], {"callsign": None}, RULE_NONE),
+    (["include airline=RYR"], {}, RULE_NONE),
+    # aircraft is the full type code, case-insensitive
+    (["include aircraft=A388"], {"aircraft_code": "A388"}, RULE_INCLUDE),
+    (["include aircraft=A388"], {"aircraft_code": "a388"}, RULE_INCLUDE),
+    (["include aircraft=A388"], {"aircraft_code": "A38"}, RULE_NONE),
+    (["include aircraft=A388"], {"aircraft_code": ""}, RULE_NONE),
+    (["include aircraft=A388"], {}, RULE_NONE),
+    # altitude bands include their minimum and exclude their maximum
+    (["include altitude=1000-5000"], {"altitude": 1000}, RULE_INCLUDE),
+    (["include altitude=1000-5000"], {"altitude": 4999.5}, RULE_INCLUDE),
+    (["include altitude=1000-5000"], {"altitude": 5000}, RULE_NONE),
+    (["include altitude=1000-5000"], {"altitude": 999}, RULE_NONE),
+    (["include altitude=1000-5000"], {"altitude": "2000"}, RULE_INCLUDE),
+    (["include altitude=-1000"], {"altitude": -50}, RULE_INCLUDE),
+    (["include altitude=-1000"], {"altitude": 1000}, RULE_NONE),
+    (["include altitude=30000-"], {"altitude": 41000}, RULE_INCLUDE),
+    (["include altitude=30000-"], {"altitude": None}, RULE_NONE),
+    (["include altitude=30000-"], {"altitude": ""}, RULE_NONE),
+    (["include altitude=30000-"], {}, RULE_NONE),
+    # Rules without an altitude condition still match flights without one
+    (["include airline=UAE"], {"callsign": "UAE1", "altitude": None}, RULE_INCLUDE),
+    # Every condition of a rule must hold
+    (
+        ["include origin=IR airline=UAE,QTR"],
+        {"origin_airport_iata": "IKA", "callsign": "QTR7"},
+        RULE_INCLUDE,
+    ),
+    (
+        ["include origin=IR airline=UAE,QTR"],
+        {"origin_airport_iata": "IKA", "callsign": "THY7"},
+        RULE_NONE,
+    ),
+    (
+        ["include origin=IR airline=UAE,QTR"],
+        {"origin_airport_iata": "DXB", "callsign": "QTR7"},
+        RULE_NONE,
+    ),
+    (
+        ["include aircraft=A388 altitude=30000-"],
+        {"aircraft_code": "A388", "altitude": 20000},
+        RULE_NONE,
+    ),
+    # Exclusions win over inclusions, whatever the rule order
+    (
+        ["include airline=RYR", "exclude destination=GB"],
+        {"callsign": "RYR1", "destination_airport_iata": "LHR"},
+        RULE_EXCLUDE,
+    ),
+    (
+        ["exclude destination=GB", "include airline=RYR"],
+        {"callsign": "RYR1", "destination_airport_iata": "LHR"},
+        RULE_EXCLUDE,
+    ),
+    (
+        ["exclude destination=GB", "include airline=RYR"],
+        {"callsign": "RYR1", "destination_airport_iata": "AMM"},
+        RULE_INCLUDE,
+    ),
+    # Overlapping altitude bands of several rules
+    (
+        ["include altitude=0-20000", "exclude altitude=10000-30000"],
+        {"altitude": 5000},
+        RULE_INCLUDE,
+    ),
+    (
+        ["include altitude=0-20000", "exclude altitude=10000-30000"],
+        {"altitude": 15000},
+        RULE_EXCLUDE,
+    ),
+    (
+        ["include altitude=0-20000", "exclude altitude=10000-30000"],
+        {"altitude": 25000},
+        RULE_EXCLUDE,
+    ),
+    (
+        ["include altitude=0-20000", "exclude altitude=10000-30000"],
+        {"altitude": 30000},
+        RULE_NONE,
+    ),
+]
+
+
+@pytest.fixture(scope="module")
+def data_loader():
+    return DataLoader()
+
+
+def _compile(rule_lines, data_loader):
+    return FilterRules(
+        [FilterRule.parse(line, data_loader) for line in rule_lines], data_loader
+    )
+
+
+@pytest.mark.parametrize("rule_lines, attributes, expected", CASES)
+def test_rule_operators(data_loader, rule_lines, attributes, expected):
+    filter_rules = _compile(rule_lines, data_loader)
+    assert filter_rules.evaluate(SimpleNamespace(**attributes)) == expected
+
+
+@pytest.mark.parametrize(
+    "line, message",
+    [
+        ("block airline=RYR", "unknown action"),
+        ("include", "no conditions"),
+        ("include airline", "expected field=value"),
+        ("include airline=", "expected field=value"),
+        ("include callsign=RYR", "unknown field"),
+        ("include origin=XX,IR", "unknown country code"),
+    ],
+)
+def test_malformed_rules_are_rejected(data_loader, line, message):
+    with pytest.raises(ValueError, match=message):
+        FilterRule.parse(line, data_loader)
+
+
+@pytest.mark.skipif(not NUMPY_AVAILABLE, reason="NumPy is not installed")
+class TestVectorizedRules:
+    """The uint64 bitmask path must agree with FilterRules.evaluate."""
+
+    @staticmethod
+    def _evaluate(filter_rules, flights, data_loader):
+        from src.vectorized import FeedColumns, VectorizedRules
+
+        airport_codes = data_loader.get_airport_codes()
+        rules = VectorizedRules(filter_rules, airport_codes, data_loader)
+        columns = FeedColumns(
+            flights, {code: i for i, code in enumerate(airport_codes)}
+        )
+        excluded, included = rules.evaluate(columns)
+        return [
+            RULE_EXCLUDE if is_excluded else RULE_INCLUDE if is_included else RULE_NONE
+            for is_excluded, is_included in zip(excluded, included)
+        ]
+
+    @pytest.mark.parametrize("rule_lines, attributes, expected", CASES)
+    def test_rule_operators(self, data_loader, rule_lines, attributes, expected):
+        filter_rules = _compile(rule_lines, data_loader)
+        flights = [SimpleNamespace(**attributes)]
+        assert self._evaluate(filter_rules, flights, data_loader) == [expected]
+
+    def test_all_cases_in_one_snapshot(self, data_loader):
+        # Every case's rules in one rule set, evaluated over every case's flight
+        rule_lines = [line for rule_lines, _, _ in CASES for line in rule_lines]
+        filter_rules = _compile(rule_lines, data_loader)
+        flights = [SimpleNamespace(**attributes) for _, attributes, _ in CASES]
+        expected = [filter_rules.evaluate(flight) for flight in flights]
+        assert self._evaluate(filter_rules, flights, data_loader) == expected
+
+    def test_highest_rule_bit(self, data_loader):
+        # Rule 63 uses the sign bit of the uint64 masks
+        rule_lines = [f"include aircraft=T{index:03d}" for index in range(63)]
+        rule_lines.append("exclude airline=RYR")
+        filter_rules = _compile(rule_lines, data_loader)
+        flights = [
+            SimpleNamespace(callsign="RYR1", aircraft_code="T000"),
+            SimpleNamespace(callsign="EZY1", aircraft_code="T062"),
+            SimpleNamespace(callsign="EZY1", aircraft_code="A320"),
+        ]
+        assert self._evaluate(filter_rules, flights, data_loader) == [
+            RULE_EXCLUDE,
+            RULE_INCLUDE,
+            RULE_NONE,
+        ]
+
+    def test_more_than_max_rules_are_rejected(self, data_loader):
+        from src.vectorized import VectorizedRules
+
+        filter_rules = _compile(["exclude altitude=-1000"] * 65, data_loader)
+        with pytest.raises(ValueError, match="At most 64"):
+            VectorizedRules(filter_rules, [], data_loader)
@@ -0,0 +1,42 @@
+"""Tests for the metrics registry and the tracker's per-cycle metrics."""
+
+from src.data_loader import DataLoader
+from src.flight_tracker import FlightTracker
+from src.metrics import MetricsRegistry
+from src.notifiers import NullNotifier
+from src.snapshot_diff import FeedDelta
+
+
+def test_replace_drops_series_of_missing_label_values():
+    registry = MetricsRegistry()
+    registry.set("flight_tracker_feed_flights", 10)
+    registry.replace("flight_tracker_matched_flights", "country", {"IL": 3, "GB": 1})
+    registry.replace("flight_tracker_matched_flights", "country", {"IL": 2})
+
+    assert registry.get("flight_tracker_matched_flights", country="IL") == 2
+    assert registry.get("flight_tracker_matched_flights", country="GB") is None
+    assert registry.get("flight_tracker_feed_flights") == 10
+    assert 'country="GB"' not in registry.render_prometheus()
+
+
+def test_matched_flights_gauge_follows_the_latest_cycle():
+    tracker = FlightTracker(["IL", "JO"], DataLoader(), [NullNotifier()], object())
+    tracker.metrics = MetricsRegistry()
+    try:
+        # GB flights come from an include rule, so GB is not tracked
+        tracker._record_cycle_metrics(
+            3, {"IL": ["a", "b"], "JO": [], "GB": ["c"]}, FeedDelta(), 0, {}
+        )
+        tracker._record_cycle_metrics(1, {"JO": ["d"]}, FeedDelta(), 0, {})
+    finally:
+        tracker.close()
+
+    lines = [
+        line
+        for line in tracker.metrics.render_prometheus().splitlines()
+        if line.startswith("flight_tracker_matched_flights{")
+    ]
+    assert lines == [
+        'flight_tracker_matched_flights{country="IL"} 0.0',
+        'flight_tracker_matched_flights{country="JO"} 1.0',
+    ]
@@ -0,0 +1,78 @@
+"""Tests for notification sinks without email credentials."""
+
+import json
+import time
+
+import pytest
+
+from src.config import Config
+from src.dispatch_queue import DispatchQueue, PermanentDispatchError
+from src.notifiers import (
+    EmailNotifier,
+    JsonLinesNotifier,
+    NotificationDispatcher,
+    NullNotifier,
+    configured_notifiers,
+    create_notifiers,
+)
+
+
+@pytest.fixture
+def no_credentials(monkeypatch):
+    monkeypatch.setattr(Config, "GMAIL_EMAIL", None)
+    monkeypatch.setattr(Config, "GMAIL_APP_PASSWORD", None)
+    monkeypatch.setattr(Config, "RECIPIENT_EMAIL", None)
+
+
+def test_email_sink_is_dropped_without_credentials(no_credentials, tmp_path, capsys):
+    notifiers = configured_notifiers(create_notifiers(["email"]))
+    assert [type(notifier) for notifier in notifiers] == [NullNotifier]
+    assert "Gmail credentials missing" in capsys.readouterr().out
+
+    jsonl = JsonLinesNotifier(str(tmp_path / "alerts.jsonl"))
+    notifiers = configured_notifiers(create_notifiers(["email"]) + [jsonl])
+    assert notifiers == [jsonl]
+
+
+def test_unconfigured_email_is_dead_lettered_without_retries(
+    no_credentials, tmp_path
+):
+    dead_letters = tmp_path / "dead_letters.jsonl"
+    dispatcher = NotificationDispatcher([EmailNotifier()])
+    queue = dispatcher._queues[0]
+    queue.backoff = 10
+    queue.dead_letter_path = str(dead_letters)
+
+    start = time.monotonic()
+    dispatcher.dispatch(1, [])
+    dispatcher.close()
+
+    # One attempt and no backoff sleeps before the job is given up
+    assert time.monotonic() - start < 5
+    assert queue.failed == 1
+    record = json.loads(dead_letters.read_text())
+    assert "not configured" in record["reason"]
+
+
+def test_other_errors_are_still_retried(tmp_path):
+    attempts = []
+
+    def handler(job):
+        attempts.append(job)
+        if len(attempts) == 1:
+            raise OSError("connection reset")
+        if len(attempts) == 2:
+            raise PermanentDispatchError("rejected")
+
+    queue = DispatchQueue(
+        "test",
+        handler,
+        retries=3,
+        backoff=0.01,
+        dead_letter_path=str(tmp_path / "dead_letters.jsonl"),
+    )
+    queue.submit("job")
+    queue.close(timeout=5)
+
+    assert attempts == ["job", "job"]
+    assert queue.failed == 1
@@ -0,0 +1,82 @@
+"""Parity of the worker-process profile pool with in-process assignment."""
+
+import multiprocessing
+import random
+
+import pytest
+
+from src.benchmark import generate_feed
+from src.data_loader import DataLoader
+from src.filter_rules import FilterRule
+from src.flight_detail import FlightDetail
+from src.profile_pool import ProfilePool
+from src.profiles import Profile, ProfileSet
+
+COUNTRIES = ["IL", "JO", "AE", "GB", "US"]
+PROFILES = [
+    (["IL", "JO"], []),
+    (["AE"], ["include origin=IR airline=UAE,QTR", "exclude altitude=-1000"]),
+    (["GB", "US"], ["exclude airline=RYR destination=GB"]),
+    ([], ["include aircraft=A388 altitude=30000-"]),
+    (["IL"], ["exclude aircraft=B738", "exclude airline=ELY"]),
+]
+
+
+@pytest.fixture(scope="module")
+def data_loader():
+    return DataLoader()
+
+
+@pytest.fixture(scope="module")
+def profile_set(data_loader):
+    profiles = [
+        Profile(
+            str(index),
+            countries,
+            [FilterRule.parse(line, data_loader) for line in rules],
+            [],
+        )
+        for index, (countries, rules) in enumerate(PROFILES)
+    ]
+    return ProfileSet(profiles, data_loader)
+
+
+@pytest.fixture(scope="module")
+def snapshot(data_loader):
+    """Matched flight details, with some flights matched for two countries."""
+    rng = random.Random(11)
+    flights = generate_feed(data_loader, COUNTRIES, 3000, seed=11)
+    for flight in flights[:30]:
+        flight.altitude = None
+        flight.callsign = None
+    for flight in flights[30:60]:
+        flight.origin_airport_iata = None
+
+    flight_details = []
+    for flight in flights:
+        for country_code in rng.sample(COUNTRIES + ["FR"], rng.choice([1, 1, 2])):
+            flight_details.append(FlightDetail(flight, data_loader, country_code))
+    # Details whose flight is no longer known are only assigned by country
+    flights_by_id = {flight.id: flight for flight in flights[100:]}
+    return flight_details, flights_by_id
+
+
+@pytest.mark.parametrize("start_method", ["fork", "spawn"])
+def test_pool_assigns_like_profile_set(profile_set, snapshot, start_method):
+    if start_method not in multiprocessing.get_all_start_methods():
+        pytest.skip(f"{start_method} is not available on this platform")
+    flight_details, flights_by_id = snapshot
+    expected = profile_set.assign(flight_details, flights_by_id)
+    assert all(expected)
+
+    pool = ProfilePool(profile_set, 2, start_method)
+    try:
+        actual = pool.assign(flight_details, flights_by_id)
+        # Later cycles reuse the shards compiled by the workers
+        again = pool.assign(flight_details[:500], flights_by_id)
+        assert pool.assign([], flights_by_id) == [[] for _ in PROFILES]
+    finally:
+        pool.close()
+
+    assert actual == expected
+    assert again == profile_set.assign(flight_details[:500], flights_by_id)
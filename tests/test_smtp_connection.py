@@ -0,0 +1,90 @@
+"""Tests for the shared SMTP session against a local fake SMTP server."""
+
+import smtplib
+import time
+from email.message import EmailMessage
+
+import pytest
+
+from src.smtp_connection import SMTPConnectionManager
+from tests.fake_smtp import FakeSMTPServer
+
+
+def _message(subject: str) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = "tracker@example.com"
+    message["To"] = "ops@example.com"
+    message["Subject"] = subject
+    message.set_content("Flights detected")
+    return message
+
+
+def _manager(server: FakeSMTPServer, idle_timeout: float = 60) -> SMTPConnectionManager:
+    return SMTPConnectionManager(
+        "127.0.0.1", server.port, use_tls=False, idle_timeout=idle_timeout, timeout=5
+    )
+
+
+def _subjects(server: FakeSMTPServer):
+    return [message["Subject"] for message in server.messages]
+
+
+def test_session_is_reused_between_sends():
+    with FakeSMTPServer() as server:
+        manager = _manager(server)
+        assert manager.send_messages([_message("1"), _message("2")]) == 2
+        assert manager.send_messages([_message("3")]) == 1
+        manager.close()
+
+    assert _subjects(server) == ["1", "2", "3"]
+    assert server.connections == 1
+    assert server.quits == 1
+
+
+def test_reconnects_after_server_disconnect():
+    with FakeSMTPServer() as server:
+        manager = _manager(server)
+        manager.send_messages([_message("1")])
+        server.disconnect_all()
+
+        assert manager.send_messages([_message("2")]) == 1
+        manager.close()
+
+    assert _subjects(server) == ["1", "2"]
+    assert server.connections == 2
+
+
+def test_disconnect_mid_batch_resends_only_the_rest():
+    with FakeSMTPServer(drop_after=1) as server:
+        manager = _manager(server)
+        assert manager.send_messages([_message("1"), _message("2"), _message("3")]) == 3
+        manager.close()
+
+    assert _subjects(server) == ["1", "2", "3"]
+    assert server.connections == 2
+
+
+def test_idle_session_is_closed_and_reopened():
+    with FakeSMTPServer() as server:
+        manager = _manager(server, idle_timeout=0.2)
+        manager.send_messages([_message("1")])
+        time.sleep(0.3)
+
+        manager.send_messages([_message("2")])
+        manager.close()
+
+    assert _subjects(server) == ["1", "2"]
+    assert server.connections == 2
+    # The idle session was ended with QUIT rather than left to time out
+    assert server.quits == 2
+
+
+def test_second_disconnect_is_raised():
+    with FakeSMTPServer() as server:
+        manager = _manager(server)
+        manager.send_messages([_message("1")])
+        server.disconnect_all()
+
+    # Nothing listens any more, so the reconnect fails as well
+    with pytest.raises((smtplib.SMTPServerDisconnected, ConnectionError)):
+        manager.send_messages([_message("2")])
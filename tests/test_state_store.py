@@ -0,0 +1,69 @@
+"""Tests for the de-duplication state store."""
+
+from src.state_store import SeenFlightStore
+
+
+class _Detail:
+    """The parts of a FlightDetail the store reads."""
+
+    def __init__(self, flight_id: str, destination: str = "TLV"):
+        self.flight_id = flight_id
+        self.destination = destination
+
+
+def _stored(store: SeenFlightStore):
+    return {
+        flight_id: last_seen
+        for flight_id, last_seen in store._connect().execute(
+            "SELECT flight_id, last_seen FROM seen_flights"
+        )
+    }
+
+
+def test_touch_keeps_unchanged_flights_from_expiring():
+    store = SeenFlightStore(":memory:", ttl_seconds=100)
+    assert len(store.filter_new([_Detail("1"), _Detail("2")], now=0)) == 2
+
+    store.touch(["1"], now=90)
+
+    # Flight 1 is still known, flight 2 expired and is new again
+    new_details = store.filter_new([_Detail("1"), _Detail("2")], now=150)
+    assert [detail.flight_id for detail in new_details] == ["2"]
+
+
+def test_touch_refreshes_only_the_namespaces_that_stored_a_flight():
+    store = SeenFlightStore(":memory:", ttl_seconds=100)
+    store.filter_new([_Detail("1")], now=0, namespace="levant")
+    store.filter_new([_Detail("1")], now=0, namespace="gulf/east")
+    store.filter_new([_Detail("2")], now=0, namespace="gulf/east")
+
+    store.touch(["1", "3"], now=50)
+
+    assert _stored(store) == {"levant/1": 50, "gulf/east/1": 50, "gulf/east/2": 0}
+
+
+def test_touch_index_survives_reload_and_eviction(tmp_path):
+    path = str(tmp_path / "state.sqlite3")
+    store = SeenFlightStore(path, ttl_seconds=100)
+    store.filter_new([_Detail("1"), _Detail("2")], now=0, namespace="levant")
+    store.close()
+
+    store = SeenFlightStore(path, ttl_seconds=100)
+    store.touch(["1"], now=90)
+    # Evicts flight 2, which was never touched
+    store.filter_new([], now=150)
+    store.touch(["1", "2"], now=160)
+
+    assert _stored(store) == {"levant/1": 160}
+    store.close()
+
+
+def test_touch_skips_recently_refreshed_flights():
+    store = SeenFlightStore(":memory:", ttl_seconds=2400)
+    store.filter_new([_Detail("1")], now=0)
+
+    # Within a 24th of the TTL the stored time is left alone
+    store.touch(["1"], now=60)
+    assert _stored(store) == {"1": 0}
+    store.touch(["1"], now=120)
+    assert _stored(store) == {"1": 120}
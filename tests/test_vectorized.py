@@ -0,0 +1,103 @@
+"""Parity of the NumPy matcher with the pure-Python matching loop."""
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from src.benchmark import generate_feed
+from src.data_loader import DataLoader
+from src.filter_rules import FilterRule, FilterRules
+from src.flight_tracker import FlightTracker
+from src.notifiers import NullNotifier
+
+COUNTRIES = ["IL", "JO", "AE", "GB", "US"]
+RULES = [
+    "include origin=IR airline=UAE,QTR",
+    "include aircraft=A388 altitude=30000-",
+    "exclude altitude=-1000",
+    "exclude airline=RYR destination=GB",
+]
+
+
+@pytest.fixture(scope="module")
+def data_loader():
+    return DataLoader()
+
+
+@pytest.fixture(scope="module")
+def feed(data_loader):
+    flights = generate_feed(data_loader, COUNTRIES, 4000, seed=7)
+    # Missing and unknown values must be handled like the Python path does
+    for flight in flights[:40]:
+        flight.altitude = None
+        flight.callsign = None
+    for flight in flights[40:80]:
+        flight.origin_airport_iata = None
+        flight.destination_airport_iata = "ZZZ"
+    for flight in flights[80:100]:
+        flight.latitude = None
+    return flights
+
+
+@pytest.fixture
+def tracker(data_loader):
+    tracker = FlightTracker(COUNTRIES, data_loader, [NullNotifier()], object())
+    tracker.filter_rules = None
+    tracker.seen_store = None
+    tracker.history = None
+    yield tracker
+    tracker.close()
+
+
+def _ids(matches):
+    return {
+        country: [flight.id for flight in flights]
+        for country, flights in matches.items()
+    }
+
+
+@pytest.mark.parametrize("geofences", [False, True])
+@pytest.mark.parametrize("with_rules", [False, True])
+def test_vectorized_matches_equal_python(
+    tracker, data_loader, feed, geofences, with_rules
+):
+    tracker.use_geofences = geofences
+    if with_rules:
+        tracker.filter_rules = FilterRules(
+            [FilterRule.parse(line, data_loader) for line in RULES], data_loader
+        )
+
+    tracker.use_vectorized = False
+    expected = tracker._match_flights(feed)
+    actual = tracker._get_vectorized_matcher().match(feed)
+
+    # Same countries in the same order, each with the same flights in feed order
+    assert list(actual) == list(expected)
+    assert _ids(actual) == _ids(expected)
+    if with_rules:
+        # Rules include flights under countries that are not tracked
+        assert set(expected) - set(COUNTRIES)
+
+
+def test_numpy_is_only_used_where_it_pays_off(tracker, data_loader):
+    tracker.use_vectorized = True
+    assert not tracker._can_vectorize()
+
+    tracker.use_geofences = True
+    assert tracker._can_vectorize()
+
+    tracker.use_geofences = False
+    tracker.filter_rules = FilterRules(
+        [FilterRule.parse("exclude altitude=-1000", data_loader)], data_loader
+    )
+    assert tracker._can_vectorize()
+
+    too_many = ["exclude altitude=-1000"] * 65
+    tracker.filter_rules = FilterRules(
+        [FilterRule.parse(line, data_loader) for line in too_many], data_loader
+    )
+    assert not tracker._can_vectorize()
+
+    tracker.use_vectorized = False
+    tracker.use_geofences = True
+    assert not tracker._can_vectorize()